@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.auth_service import get_current_user_from_token
-from app.domain.models import User
+from app.core.database import get_async_db, get_db
+from app.services.auth_service import get_current_user_from_token, get_current_user_from_token_async
+from app.core.principal import Principal
+from app.core.routing_session import set_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
@@ -11,10 +13,30 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     user = get_current_user_from_token(db, token)
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario inactivo")
+    # Read-your-writes: las lecturas del usuario tras escribir van al primario
+    set_principal(db, user.id)
     return user
 
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """get_current_user para routers asíncronos: no ocupa un hilo del threadpool ni una conexión síncrona."""
+    user = await get_current_user_from_token_async(db, token)
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario inactivo")
+    # Read-your-writes también en la sesión asíncrona (es la misma que recibe el endpoint)
+    set_principal(db.sync_session, user.id)
+    return user
+
+def has_permission(user: Principal, permission_name: str) -> bool:
+    """Comprueba un permiso contra el conjunto de permisos cargado con el usuario."""
+    if not user.role:
+        return False
+    # El superadmin tiene todos los permisos
+    if user.role.name == 'superadmin':
+        return True
+    return permission_name in user.permissions
+
 def has_role(required_role_name: str):
-    def role_checker(current_user: User = Depends(get_current_user)):
+    def role_checker(current_user: Principal = Depends(get_current_user)):
         if not current_user.role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -33,47 +55,47 @@ def has_role(required_role_name: str):
         return current_user
     return role_checker
 
+def _check_permission(current_user: Principal, permission_name: str) -> Principal:
+    if not current_user.role:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Usuario sin rol asignado"
+        )
+
+    # Verificar si el rol tiene el permiso requerido
+    if not has_permission(current_user, permission_name):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permisos insuficientes"
+        )
+    return current_user
+
 def require_permission(permission_name: str):
-    async def _require_permission(
-        current_user: User = Depends(get_current_user),
+    def _require_permission(
+        current_user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db)
     ):
-        if not current_user.role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Usuario sin rol asignado"
-            )
-        
-        # El superadmin tiene todos los permisos
-        if current_user.role.name == 'superadmin':
-            return current_user
-            
-        # Verificar si el rol tiene el permiso requerido
-        has_permission = any(
-            perm.name == permission_name 
-            for perm in current_user.role.permissions
-        )
-        
-        if not has_permission:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Permisos insuficientes"
-            )
-        return current_user
+        return _check_permission(current_user, permission_name)
+    return _require_permission
+
+def require_permission_async(permission_name: str):
+    """require_permission para routers que usan get_async_db."""
+    async def _require_permission(current_user: Principal = Depends(get_current_user_async)):
+        return _check_permission(current_user, permission_name)
     return _require_permission
 
 # Decoradores específicos para roles comunes
-def is_admin(current_user: User = Depends(get_current_user)):
+def is_admin(current_user: Principal = Depends(get_current_user)):
     return has_role("admin")(current_user)
 
-def is_doctor(current_user: User = Depends(get_current_user)):
+def is_doctor(current_user: Principal = Depends(get_current_user)):
     return has_role("doctor")(current_user)
 
-def is_receptionist(current_user: User = Depends(get_current_user)):
+def is_receptionist(current_user: Principal = Depends(get_current_user)):
     return has_role("receptionist")(current_user)
 
-def is_assistant(current_user: User = Depends(get_current_user)):
+def is_assistant(current_user: Principal = Depends(get_current_user)):
     return has_role("assistant")(current_user)
 
-def is_patient(current_user: User = Depends(get_current_user)):
+def is_patient(current_user: Principal = Depends(get_current_user)):
     return has_role("patient")(current_user)
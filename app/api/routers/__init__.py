@@ -26,6 +26,7 @@ from .payment import router as payment_router
 from .patient_education_tracking import router as patient_education_tracking_router
 from .performance_metrics import router as performance_metrics_router
 from .leads import router as leads_router
+from .admin import router as admin_router
 
 # Exportar los routers para que main.py pueda importarlos fácilmente
 __all__ = [
@@ -56,4 +57,5 @@ __all__ = [
     "patient_education_tracking_router",
     "performance_metrics_router",
     "leads_router",
+    "admin_router",
 ]
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Query, status
+from typing import List
+from app.domain import schemas
+from app.core.pool_metrics import pool_status
+from app.core.sql_metrics import sql_stats
+from app.data.audit_sink import audit_sink
+from app.data.read_access import read_access
+from app.api.dependencies import require_permission
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=List[schemas.DatabasePoolStatus])
+def get_db_pool_status(
+    current_user = Depends(require_permission("admin.system_metrics"))
+):
+    """
+    Estado y telemetría de los pools de conexiones de este worker.
+    Requiere el permiso 'admin.system_metrics'.
+    """
+    return pool_status()
+
+@router.get("/sql-stats", response_model=List[schemas.SQLStatementStats])
+def get_sql_stats(
+    limit: int = Query(50, ge=1, le=500),
+    current_user = Depends(require_permission("admin.system_metrics"))
+):
+    """
+    Estadísticas por consulta (huella) de este worker, ordenadas por tiempo total.
+    Requiere el permiso 'admin.system_metrics'.
+    """
+    return sql_stats.snapshot(limit)
+
+@router.delete("/sql-stats", status_code=status.HTTP_204_NO_CONTENT)
+def reset_sql_stats(
+    current_user = Depends(require_permission("admin.system_metrics"))
+):
+    """Reinicia las estadísticas por consulta de este worker."""
+    sql_stats.reset()
+
+@router.get("/audit-sink", response_model=schemas.AuditSinkStatus)
+def get_audit_sink_status(
+    current_user = Depends(require_permission("admin.system_metrics"))
+):
+    """
+    Estado del escritor asíncrono de auditoría de este worker: cola, lotes
+    escritos, descartes y desbordamientos a disco.
+    Requiere el permiso 'admin.system_metrics'.
+    """
+    return audit_sink.status()
+
+@router.get("/read-access", response_model=schemas.ReadAccessStatus)
+def get_read_access_status(
+    current_user = Depends(require_permission("admin.system_metrics"))
+):
+    """
+    Estado del registro de accesos de lectura de este worker: grupos pendientes
+    de volcar, lecturas anotadas y descartadas por el muestreo.
+    Requiere el permiso 'admin.system_metrics'.
+    """
+    return read_access.status()
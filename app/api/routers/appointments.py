@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.appointment_service import AppointmentService
+from app.services.availability_service import AvailabilityService
+from app.data.export import export_response
 from app.api.dependencies import get_current_user, require_permission
 from app.domain.models import User as DBUser # Alias to avoid conflict with schemas.UserInDB
 from datetime import datetime
@@ -28,10 +30,25 @@ def create_appointment(
     db_appointment = service.create_appointment(schemas.AppointmentCreate(**appointment_data))
     return db_appointment
 
-@router.get("/", response_model=List[schemas.AppointmentResponse])
+@router.post("/bulk", response_model=schemas.BulkCreateResult)
+def create_appointments_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Citas con el formato de AppointmentCreate"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("appointments.create"))
+):
+    """
+    Creates many appointments in one request, inserted in chunked transactions.
+    Returns a per-item result; invalid items do not block the rest.
+    Requires 'appointments.create' permission.
+    """
+    service = AppointmentService(db)
+    return service.create_appointments(items, current_user.id)
+
+@router.get("/", response_model=Union[List[schemas.AppointmentResponse], schemas.CursorPage[schemas.AppointmentResponse]])
 def get_appointments(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor de paginación; vacío para la primera página"),
     clinic_id: Optional[int] = Query(None),
     patient_id: Optional[int] = Query(None),
     doctor_id: Optional[int] = Query(None),
@@ -43,7 +60,7 @@ def get_appointments(
 ):
     """
     Retrieves a list of appointments.
-    Allows filtering by patient_id, clinic_id, or doctor_id.
+    All supplied filters (clinic, patient, doctor, status, date range) are combined.
     Requires 'appointments.read' permission.
     """
     service = AppointmentService(db)
@@ -55,7 +72,67 @@ def get_appointments(
         doctor_id=doctor_id,
         status=status,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        cursor=cursor
+    )
+
+@router.get("/export")
+def export_appointments(
+    file_format: str = Query("ndjson", alias="format", description="ndjson o csv"),
+    clinic_id: Optional[int] = Query(None),
+    patient_id: Optional[int] = Query(None),
+    doctor_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("appointments.read"))
+):
+    """
+    Streams every appointment matching the filters as NDJSON or CSV.
+    Requires 'appointments.read' permission.
+    """
+    service = AppointmentService(db)
+    columns, rows = service.export_appointments(
+        clinic_id=clinic_id,
+        patient_id=patient_id,
+        doctor_id=doctor_id,
+        status=status,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return export_response(columns, rows, file_format, "appointments")
+
+@router.get("/availability", response_model=schemas.AvailabilityResult)
+def get_availability(
+    clinic_id: int = Query(...),
+    service_id: int = Query(..., description="Servicio a reservar; fija la duración de los huecos"),
+    start_date: datetime = Query(..., description="Sin zona: hora local de la clínica"),
+    end_date: datetime = Query(...),
+    doctor_id: Optional[int] = Query(None, description="Un médico; por defecto, todos los de la clínica"),
+    resource_id: Optional[int] = Query(None, description="Además, este recurso libre"),
+    resource_type: Optional[str] = Query(None, pattern="^(Room|Equipment)$", description="Además, algún recurso libre de este tipo"),
+    with_doctor: bool = Query(True, description="false: solo huecos de recursos"),
+    limit: int = Query(100, ge=1),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("appointments.read"))
+):
+    """
+    Returns bookable slots for a service within the clinic's opening hours,
+    per doctor and/or schedulable resource, in start order.
+    Requires 'appointments.read' permission.
+    """
+    service = AvailabilityService(db)
+    return service.find_slots(
+        clinic_id=clinic_id,
+        service_id=service_id,
+        start_date=start_date,
+        end_date=end_date,
+        doctor_id=doctor_id,
+        resource_id=resource_id,
+        resource_type=resource_type,
+        with_doctor=with_doctor,
+        limit=limit,
     )
 
 @router.get("/{appointment_id}", response_model=schemas.AppointmentResponse)
@@ -88,7 +165,7 @@ def update_appointment(
     """
     service = AppointmentService(db)
     # Set updated_by_user_id from the current user
-    appointment_data = appointment.dict()
+    appointment_data = appointment.dict(exclude_unset=True)
     appointment_data["updated_by_user_id"] = current_user.id
 
     db_appointment = service.update_appointment(appointment_id, schemas.AppointmentUpdate(**appointment_data))
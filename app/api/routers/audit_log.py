@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.audit_log_service import AuditLogService
+from app.data.export import export_response
 from app.api.dependencies import get_current_user, require_permission
 
 router = APIRouter(
@@ -25,13 +26,17 @@ def create_audit_log(
     service = AuditLogService(db)
     return service.create_audit_log(audit_log)
 
-@router.get("/", response_model=List[schemas.AuditLogInDB])
+@router.get("/", response_model=Union[List[schemas.AuditLogInDB], schemas.CursorPage[schemas.AuditLogInDB]])
 def read_audit_logs(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor de paginación; vacío para la primera página"),
     clinic_id: Optional[int] = None,
     user_id: Optional[int] = None,
     severity: Optional[str] = None,
+    action_type: Optional[str] = Query(None, description="CREATE, UPDATE, DELETE, READ..."),
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = Query(None, description="En los registros READ, el id del paciente leído"),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     is_reviewed: Optional[bool] = None,
@@ -40,20 +45,60 @@ def read_audit_logs(
 ):
     """
     Obtiene registros de auditoría con diversos filtros.
+    Los accesos de lectura a un paciente: action_type=READ&entity_id=<paciente>
+    (un registro por usuario, tipo de dato y minuto, con el número de lecturas
+    en related_records).
     Solo administradores pueden ver registros.
     """
     service = AuditLogService(db)
-    
-    if clinic_id:
-        return service.get_clinic_audit_logs(clinic_id, skip, limit)
-    elif user_id:
-        return service.get_user_audit_logs(user_id, skip, limit)
-    elif severity:
-        return service.get_by_severity(severity, skip, limit)
-    elif is_reviewed is not None:
-        return service.get_unreviewed_audit_logs(skip, limit)
-    else:
-        return service.get_audit_logs(skip, limit)
+    return service.search_audit_logs(
+        skip=skip,
+        limit=limit,
+        clinic_id=clinic_id,
+        user_id=user_id,
+        severity=severity,
+        action_type=action_type,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        start_date=start_date,
+        end_date=end_date,
+        is_reviewed=is_reviewed,
+        cursor=cursor
+    )
+
+@router.get("/export")
+def export_audit_logs(
+    file_format: str = Query("ndjson", alias="format", description="ndjson o csv"),
+    clinic_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    severity: Optional[str] = None,
+    action_type: Optional[str] = Query(None, description="CREATE, UPDATE, DELETE, READ..."),
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = Query(None, description="En los registros READ, el id del paciente leído"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    is_reviewed: Optional[bool] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("admin.audit_logs"))
+):
+    """
+    Exporta en streaming (NDJSON o CSV) todos los registros que cumplen los
+    filtros, sin paginar y con memoria constante.
+    Solo administradores pueden exportar registros.
+    """
+    service = AuditLogService(db)
+    columns, rows = service.export_audit_logs(
+        clinic_id=clinic_id,
+        user_id=user_id,
+        severity=severity,
+        action_type=action_type,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        start_date=start_date,
+        end_date=end_date,
+        is_reviewed=is_reviewed,
+    )
+    return export_response(columns, rows, file_format, "audit_logs")
 
 @router.get("/{audit_log_id}", response_model=schemas.AuditLogInDB)
 def read_audit_log(
@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.consultation_service import ConsultationService
+from app.data.read_access import record_reads
 from app.api.dependencies import get_current_user, require_permission
 from datetime import datetime
 
@@ -32,7 +33,7 @@ def get_consultations(
     current_user = Depends(require_permission("consultations.read"))
 ):
     service = ConsultationService(db)
-    return service.get_consultations(
+    consultations = service.get_consultations(
         skip=skip,
         limit=limit,
         clinic_id=clinic_id,
@@ -42,6 +43,8 @@ def get_consultations(
         date_from=date_from,
         date_to=date_to
     )
+    record_reads(current_user, "consultations.list", "Consultation", consultations)
+    return consultations
 
 @router.get("/{consultation_id}", response_model=schemas.ConsultationResponse)
 def get_consultation(
@@ -50,7 +53,9 @@ def get_consultation(
     current_user = Depends(require_permission("consultations.read"))
 ):
     service = ConsultationService(db)
-    return service.get_consultation(consultation_id)
+    consultation = service.get_consultation(consultation_id)
+    record_reads(current_user, "consultations.get", "Consultation", [consultation])
+    return consultation
 
 @router.put("/{consultation_id}", response_model=schemas.ConsultationResponse)
 def update_consultation(
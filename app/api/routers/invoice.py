@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Union
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.invoice_service import InvoiceService
+from app.data.export import export_response
 from app.api.dependencies import get_current_user, require_permission
 
 router = APIRouter()
@@ -17,10 +19,11 @@ def create_invoice(
     service = InvoiceService(db)
     return service.create_invoice(invoice)
 
-@router.get("/", response_model=List[schemas.InvoiceResponse])
+@router.get("/", response_model=Union[List[schemas.InvoiceResponse], schemas.CursorPage[schemas.InvoiceResponse]])
 def get_invoices(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor de paginación; vacío para la primera página"),
     clinic_id: Optional[int] = Query(None),
     patient_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
@@ -33,7 +36,64 @@ def get_invoices(
         limit=limit,
         clinic_id=clinic_id,
         patient_id=patient_id,
-        status=status
+        status=status,
+        cursor=cursor
+    )
+
+@router.get("/export")
+def export_invoices(
+    file_format: str = Query("ndjson", alias="format", description="ndjson o csv"),
+    clinic_id: Optional[int] = Query(None),
+    patient_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None, description="Fecha de emisión desde"),
+    end_date: Optional[datetime] = Query(None, description="Fecha de emisión hasta"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("billing.read_invoice"))
+):
+    """Exporta en streaming (NDJSON o CSV) el libro de facturas filtrado."""
+    service = InvoiceService(db)
+    columns, rows = service.export_invoices(
+        clinic_id=clinic_id,
+        patient_id=patient_id,
+        status=status,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return export_response(columns, rows, file_format, "invoices")
+
+@router.get("/search", response_model=schemas.CursorPage[schemas.InvoiceResponse])
+def search_invoices(
+    limit: int = Query(50, ge=1, description="Facturas por página (como mucho INVOICE_SEARCH_MAX_LIMIT)"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente; vacío para la primera"),
+    clinic_id: Optional[int] = Query(None),
+    patient_id: Optional[int] = Query(None),
+    invoice_number: Optional[str] = Query(None, description="Número de factura exacto o su comienzo"),
+    status: Optional[schemas.InvoicePaymentStatusEnum] = Query(None),
+    payment_method: Optional[str] = Query(None),
+    notes: Optional[str] = Query(None, description="Palabras que deben aparecer en las notas"),
+    issue_date_from: Optional[datetime] = Query(None),
+    issue_date_to: Optional[datetime] = Query(None),
+    due_date_from: Optional[datetime] = Query(None),
+    due_date_to: Optional[datetime] = Query(None),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("billing.read_invoice"))
+):
+    """Búsqueda estructurada de facturas, de la más reciente a la más antigua."""
+    service = InvoiceService(db)
+    return service.search_invoices(
+        limit=limit,
+        cursor=cursor,
+        clinic_id=clinic_id,
+        patient_id=patient_id,
+        invoice_number=invoice_number,
+        status=status,
+        payment_method=payment_method,
+        notes=notes,
+        issue_date_from=issue_date_from,
+        issue_date_to=issue_date_to,
+        due_date_from=due_date_from,
+        due_date_to=due_date_to,
     )
 
 @router.get("/{invoice_id}", response_model=schemas.InvoiceResponse)
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.lead_service import LeadService
@@ -20,22 +20,6 @@ def create_lead(
     """
     service = LeadService(db)
     
-    # Verificar si ya existe un lead con el mismo teléfono
-    existing_lead = service.get_lead_by_mobile_phone(lead.mobile_phone)
-    if existing_lead:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Ya existe un lead con el teléfono {lead.mobile_phone}"
-        )
-      # Verificar si ya existe un lead con el mismo email (si se proporciona)
-    if lead.email:
-        existing_email = service.get_lead_by_email(lead.email)
-        if existing_email:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Ya existe un lead con el email {lead.email}"
-            )
-    
     # Verificar si el service_id es válido cuando se proporciona
     if lead.service_id is not None:
         from app.services.service_service import ServiceService
@@ -50,10 +34,26 @@ def create_lead(
     
     return service.create_lead(lead)
 
-@router.get("/", response_model=List[schemas.LeadResponse])
+@router.post("/bulk", response_model=schemas.BulkCreateResult)
+def create_leads_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Leads con el formato de LeadCreate"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("leads.create"))
+):
+    """
+    Crea varios leads en una sola petición, insertados por bloques.
+    Devuelve el resultado de cada elemento; los inválidos o duplicados no
+    impiden el alta del resto.
+    Requiere el permiso 'leads.create'.
+    """
+    service = LeadService(db)
+    return service.create_leads(items)
+
+@router.get("/", response_model=Union[List[schemas.LeadResponse], schemas.CursorPage[schemas.LeadResponse]])
 def get_leads(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor de paginación; vacío para la primera página"),
     status: Optional[str] = Query(None, description="Filtrar por estado del lead"),
     service_id: Optional[int] = Query(None, description="Filtrar por ID de servicio"),
     channel: Optional[str] = Query(None, description="Filtrar por canal"),
@@ -66,17 +66,15 @@ def get_leads(
     Requiere el permiso 'leads.read'.
     """
     service = LeadService(db)
-    
-    if search:
-        return service.search_leads(search, skip, limit)
-    elif status:
-        return service.get_leads_by_status(status, skip, limit)
-    elif service_id:
-        return service.get_leads_by_service(service_id, skip, limit)
-    elif channel:
-        return service.get_leads_by_channel(channel, skip, limit)
-    else:
-        return service.get_leads(skip, limit)
+    return service.find_leads(
+        skip=skip,
+        limit=limit,
+        status=status,
+        service_id=service_id,
+        channel=channel,
+        search=search,
+        cursor=cursor
+    )
 
 @router.get("/{lead_id}", response_model=schemas.LeadResponse)
 def get_lead(
@@ -130,23 +128,6 @@ def update_lead(
     if not existing_lead:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead no encontrado")
     
-    # Verificar si se está actualizando el teléfono y si ya existe otro lead con ese teléfono
-    if lead.mobile_phone and lead.mobile_phone != existing_lead.mobile_phone:
-        mobile_lead = service.get_lead_by_mobile_phone(lead.mobile_phone)
-        if mobile_lead and mobile_lead.lead_id != lead_id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Ya existe otro lead con el teléfono {lead.mobile_phone}"
-            )
-      # Verificar si se está actualizando el email y si ya existe otro lead con ese email
-    if lead.email and lead.email != existing_lead.email:
-        email_lead = service.get_lead_by_email(lead.email)
-        if email_lead and email_lead.lead_id != lead_id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Ya existe otro lead con el email {lead.email}"
-            )
-    
     # Verificar si el service_id es válido cuando se proporciona
     if lead.service_id is not None and lead.service_id != 0:
         from app.services.service_service import ServiceService
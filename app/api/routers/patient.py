@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Query
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Query
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.domain.schemas import PatientCreate, PatientUpdate, PatientInDB, PatientResponse
+from app.domain.schemas import PatientCreate, PatientUpdate, PatientInDB, PatientResponse, CursorPage, BulkCreateResult
 from app.services.patient_service import PatientService
+from app.data.export import export_response
+from app.data.read_access import patient_owner, patient_row_owner, record_reads, record_streamed_reads
 from app.api.dependencies import get_current_user, require_permission
 from app.domain.schemas import UserInDB
 from fastapi import status, HTTPException
@@ -17,24 +19,63 @@ def create_patient(
     current_user = Depends(require_permission("patients.create"))
 ):
     service = PatientService(db)
-    return service.create_patient(patient)
+    return service.create_patient(patient, current_user.id)
 
-@router.get("/", response_model=List[PatientResponse])
+@router.post("/bulk", response_model=BulkCreateResult)
+def create_patients_bulk(
+    items: List[Dict[str, Any]] = Body(..., description="Pacientes con el formato de PatientCreate"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("patients.create"))
+):
+    service = PatientService(db)
+    return service.create_patients(items, current_user.id)
+
+@router.get("/", response_model=Union[List[PatientResponse], CursorPage[PatientResponse]])
 def get_patients(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor de paginación; vacío para la primera página"),
     clinic_id: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user = Depends(require_permission("patients.read"))
 ):
     service = PatientService(db)
-    return service.get_patients(
+    patients = service.get_patients(
         skip=skip,
         limit=limit,
         clinic_id=clinic_id,
-        search=search
+        search=search,
+        cursor=cursor
     )
+    record_reads(current_user, "patients.list", "Patient", patients.items if cursor is not None else patients, owner=patient_owner)
+    return patients
+
+@router.get("/export")
+def export_patients(
+    file_format: str = Query("ndjson", alias="format", description="ndjson o csv"),
+    clinic_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("patients.read"))
+):
+    service = PatientService(db)
+    columns, rows = service.export_patients(clinic_id)
+    rows = record_streamed_reads(current_user, "patients.export", "Patient", rows, owner=patient_row_owner)
+    return export_response(columns, rows, file_format, "patients")
+
+@router.get("/search", response_model=List[PatientResponse])
+def search_patients(
+    clinic_id: int = Query(...),
+    q: str = Query(..., min_length=1, description="Nombre, apellidos, email, identificador o teléfono; admite prefijos y errores de escritura"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("patients.read"))
+):
+    service = PatientService(db)
+    patients = service.search_patients(clinic_id, q, skip, limit)
+    record_reads(current_user, "patients.search", "Patient", patients, owner=patient_owner)
+    return patients
 
 @router.get("/{patient_id}", response_model=PatientResponse)
 def get_patient(
@@ -43,7 +84,9 @@ def get_patient(
     current_user = Depends(require_permission("patients.read"))
 ):
     service = PatientService(db)
-    return service.get_patient(patient_id)
+    patient = service.get_patient(patient_id)
+    record_reads(current_user, "patients.get", "Patient", [patient], owner=patient_owner)
+    return patient
 
 @router.put("/{patient_id}", response_model=PatientResponse)
 def update_patient(
@@ -53,7 +96,7 @@ def update_patient(
     current_user = Depends(require_permission("patients.update"))
 ):
     service = PatientService(db)
-    return service.update_patient(patient_id, patient)
+    return service.update_patient(patient_id, patient, current_user.id)
 
 @router.delete("/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_patient(
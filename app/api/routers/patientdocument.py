@@ -1,53 +1,62 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Query
 from typing import List
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.domain.schemas import PatientDocumentCreate, PatientDocumentUpdate, PatientDocumentInDB, PatientDocumentResponse
-from app.services.patientdocument_service import PatientDocumentService
-from app.api.dependencies import get_current_user, require_permission
+from app.services.patientdocument_service import AsyncPatientDocumentService
+from app.data.read_access import record_reads
+from app.api.dependencies import require_permission_async
 from app.domain.schemas import UserInDB
 
+# Este router usa la capa de datos asíncrona (AsyncSession), también para
+# autenticar: ninguna dependencia pasa por el threadpool ni por el pool síncrono
 router = APIRouter()
 
 @router.post("/", response_model=PatientDocumentResponse)
 async def create_patient_document(
     document: PatientDocumentCreate,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.crear"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.crear"))
 ):
-    service = PatientDocumentService(db)
-    return service.create_document(document, current_user.id)
+    service = AsyncPatientDocumentService(db)
+    return await service.create_document(document, current_user.id)
 
 @router.get("/{document_id}", response_model=PatientDocumentResponse)
 async def get_patient_document(
     document_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.ver"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.ver"))
 ):
-    service = PatientDocumentService(db)
-    return service.get_document(document_id)
+    service = AsyncPatientDocumentService(db)
+    document = await service.get_document(document_id)
+    record_reads(current_user, "patient_documents.get", "PatientDocument", [document])
+    return document
 
 @router.get("/patient/{patient_id}", response_model=List[PatientDocumentResponse])
 async def get_patient_documents(
     patient_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.ver"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.ver"))
 ):
-    service = PatientDocumentService(db)
-    return service.get_patient_documents(patient_id, skip, limit)
+    service = AsyncPatientDocumentService(db)
+    documents = await service.get_patient_documents(patient_id, skip, limit)
+    record_reads(current_user, "patient_documents.by_patient", "PatientDocument", documents)
+    return documents
 
 @router.get("/clinic/{clinic_id}", response_model=List[PatientDocumentResponse])
 async def get_clinic_documents(
     clinic_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.ver"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.ver"))
 ):
-    service = PatientDocumentService(db)
-    return service.get_clinic_documents(clinic_id, skip, limit)
+    service = AsyncPatientDocumentService(db)
+    documents = await service.get_clinic_documents(clinic_id, skip, limit)
+    record_reads(current_user, "patient_documents.by_clinic", "PatientDocument", documents)
+    return documents
 
 @router.get("/search/{clinic_id}", response_model=List[PatientDocumentResponse])
 async def search_documents(
@@ -55,27 +64,29 @@ async def search_documents(
     search_term: str = Query(..., min_length=2),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.ver"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.ver"))
 ):
-    service = PatientDocumentService(db)
-    return service.search_documents(search_term, clinic_id, skip, limit)
+    service = AsyncPatientDocumentService(db)
+    documents = await service.search_documents(search_term, clinic_id, skip, limit)
+    record_reads(current_user, "patient_documents.search", "PatientDocument", documents)
+    return documents
 
 @router.put("/{document_id}", response_model=PatientDocumentResponse)
 async def update_patient_document(
     document_id: int,
     document: PatientDocumentUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.editar"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.editar"))
 ):
-    service = PatientDocumentService(db)
-    return service.update_document(document_id, document, current_user.id)
+    service = AsyncPatientDocumentService(db)
+    return await service.update_document(document_id, document, current_user.id)
 
 @router.delete("/{document_id}")
 async def delete_patient_document(
     document_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserInDB = Depends(require_permission("documento.eliminar"))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(require_permission_async("documento.eliminar"))
 ):
-    service = PatientDocumentService(db)
-    return service.delete_document(document_id)
+    service = AsyncPatientDocumentService(db)
+    return await service.delete_document(document_id)
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.payment_service import PaymentService
+from app.data.export import export_response
 from app.api.dependencies import get_current_user, require_permission
 
 router = APIRouter()
@@ -37,6 +39,28 @@ def get_payments(
         return service.get_clinic_payments(clinic_id, skip, limit)
     return service.get_payments(skip, limit)
 
+@router.get("/export")
+def export_payments(
+    file_format: str = Query("ndjson", alias="format", description="ndjson o csv"),
+    invoice_id: Optional[int] = None,
+    patient_id: Optional[int] = None,
+    clinic_id: Optional[int] = None,
+    start_date: Optional[datetime] = Query(None, description="Fecha de pago desde"),
+    end_date: Optional[datetime] = Query(None, description="Fecha de pago hasta"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("pago.ver"))
+):
+    """Exporta en streaming (NDJSON o CSV) los pagos filtrados."""
+    service = PaymentService(db)
+    columns, rows = service.export_payments(
+        invoice_id=invoice_id,
+        patient_id=patient_id,
+        clinic_id=clinic_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return export_response(columns, rows, file_format, "payments")
+
 @router.get("/{payment_id}", response_model=schemas.PaymentResponse)
 def get_payment(
     payment_id: int,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date
 
 from app.core.database import get_db
 from app.domain.schemas import (
@@ -44,20 +45,24 @@ def get_performance_metrics(
     limit: int = 100,
     clinic_id: Optional[int] = Query(None),
     category: Optional[MetricCategoryEnum] = Query(None),
+    start_date: Optional[date] = Query(None, description="Fecha de medición desde"),
+    end_date: Optional[date] = Query(None, description="Fecha de medición hasta"),
     db: Session = Depends(get_db),
     current_user = Depends(require_permission("performance_metrics.ver"))
 ):
     """
     Obtener lista de métricas de rendimiento.
-    Se puede filtrar por clínica y/o categoría.
+    Se puede filtrar por clínica, categoría y rango de fechas de medición, combinados.
     """
     service = PerformanceMetricsService(db)
-    
-    if clinic_id:
-        return service.get_clinic_metrics(clinic_id, skip, limit)
-    elif category:
-        return service.get_metrics_by_category(category, skip, limit)
-    return service.get_metrics(skip, limit)
+    return service.find_metrics(
+        skip=skip,
+        limit=limit,
+        clinic_id=clinic_id,
+        category=category,
+        start_date=start_date,
+        end_date=end_date
+    )
 
 @router.put("/{metric_id}", response_model=PerformanceMetricResponse)
 def update_performance_metric(
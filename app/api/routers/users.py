@@ -4,7 +4,7 @@ from typing import List
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.user_service import UserService
-from app.api.dependencies import get_current_user, require_permission
+from app.api.dependencies import get_current_user, require_permission, has_permission
 from app.domain.models import User as DBUser # Alias para evitar conflicto de nombres
 
 users_router = APIRouter()
@@ -46,10 +46,7 @@ def update_user(
 ):
     user_service = UserService(db)
     # Permite al usuario actualizar su propio perfil o a alguien con permisos actualizar cualquier perfil
-    if current_user.id == user_id or (current_user.role and any(
-        perm.name == "users.manage" 
-        for perm in current_user.role.permissions
-    )):
+    if current_user.id == user_id or has_permission(current_user, "users.manage"):
         return user_service.update_user(user_id, user_update)
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
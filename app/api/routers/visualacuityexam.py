@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, Query, UploadFile, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
 from app.domain import schemas
 from app.services.visualacuityexam_service import VisualAcuityExamService
+from app.services.exam_import_service import ExamImportService, detect_format
+from app.data.read_access import consultation_owner, record_reads
 from app.api.dependencies import get_current_user, require_permission
 
 router = APIRouter()
@@ -17,6 +19,21 @@ def create_visualacuityexam(
     service = VisualAcuityExamService(db)
     return service.create_visualacuityexam(visualacuityexam, current_user.id)
 
+@router.post("/import", response_model=schemas.ExamImportResult)
+def import_visual_acuity_exams(
+    file: UploadFile = File(..., description="Exportación del equipo en CSV (con cabecera) o NDJSON"),
+    file_format: Optional[str] = Query(None, description="csv o ndjson; por defecto según la extensión"),
+    clinic_id: Optional[int] = Query(None, description="Solo acepta consultas de esta clínica"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission("agudeza_visual.crear"))
+):
+    """
+    Importa exámenes de agudeza visual desde la exportación de un equipo, fila a fila
+    y por lotes. Devuelve un informe con los errores por línea.
+    """
+    service = ExamImportService(db)
+    return service.import_file("visual_acuity", file.file, detect_format(file.filename, file_format), current_user.id, clinic_id)
+
 @router.get("/", response_model=List[schemas.VisualAcuityExamResponse])
 def get_visualacuityexams(
     consultation_id: Optional[int] = None,
@@ -27,8 +44,11 @@ def get_visualacuityexams(
 ):
     service = VisualAcuityExamService(db)
     if consultation_id:
-        return service.get_consultation_visualacuityexams(consultation_id, skip, limit)
-    return service.get_visualacuityexams(skip, limit)
+        exams = service.get_consultation_visualacuityexams(consultation_id, skip, limit)
+    else:
+        exams = service.get_visualacuityexams(skip, limit)
+    record_reads(current_user, "visual_acuity_exams.list", "VisualAcuityExam", exams, owner=consultation_owner)
+    return exams
 
 @router.get("/{visualacuityexam_id}", response_model=schemas.VisualAcuityExamResponse)
 def get_visualacuityexam(
@@ -37,7 +57,9 @@ def get_visualacuityexam(
     current_user = Depends(require_permission("agudeza_visual.ver"))
 ):
     service = VisualAcuityExamService(db)
-    return service.get_visualacuityexam(visualacuityexam_id)
+    exam = service.get_visualacuityexam(visualacuityexam_id)
+    record_reads(current_user, "visual_acuity_exams.get", "VisualAcuityExam", [exam], owner=consultation_owner)
+    return exam
 
 @router.put("/{visualacuityexam_id}", response_model=schemas.VisualAcuityExamResponse)
 def update_visualacuityexam(
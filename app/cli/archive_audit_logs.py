@@ -0,0 +1,49 @@
+"""
+Archiva los meses antiguos del registro de auditoría (app.data.audit_archive).
+
+    python -m app.cli.archive_audit_logs
+    python -m app.cli.archive_audit_logs --before 2026-01
+
+Sin --before archiva los meses anteriores a los AUDIT_HOT_MONTHS más
+recientes. Pensado para ejecutarse una vez al mes (cron); repetirlo no
+duplica registros. Los registros archivados se siguen consultando desde
+/audit-logs pero ya no se pueden marcar como revisados.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.domain.models import load_all_models
+from app.data.audit_archive import audit_archive, hot_horizon
+
+# Fuera de la API hay que cargar todos los modelos para que se configuren las relaciones
+load_all_models()
+
+
+def _month(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError("formato AAAA-MM")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archiva los meses antiguos del registro de auditoría.")
+    parser.add_argument("--before", type=_month, help="Archiva los meses anteriores a este (AAAA-MM)")
+    args = parser.parse_args(argv)
+
+    horizon = args.before or hot_horizon()
+    db = SessionLocal()
+    try:
+        results = audit_archive.archive_before(db, horizon)
+    finally:
+        db.close()
+    for month, count in results:
+        print(f"{month:%Y-%m}: {count} registros archivados")
+    print(f"Meses anteriores a {horizon:%Y-%m} archivados en {audit_archive.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Importa desde la línea de comandos la exportación de un equipo de exámenes.
+
+    python -m app.cli.import_exams refraction exportacion.csv --user-id 3
+    python -m app.cli.import_exams iop tonometro.ndjson --clinic-id 1
+
+Usa la misma lógica que POST /api/v1/<examenes>/import e imprime el informe en JSON.
+"""
+import argparse
+import json
+import sys
+
+from fastapi import HTTPException
+
+from app.core.database import SessionLocal
+from app.domain.models import load_all_models
+from app.services.exam_import_service import EXAM_TYPES, FILE_FORMATS, ExamImportService, detect_format
+
+# Fuera de la API hay que cargar todos los modelos para que se configuren las relaciones
+load_all_models()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importa exámenes (CSV o NDJSON) exportados por los equipos.")
+    parser.add_argument("exam_type", choices=sorted(EXAM_TYPES))
+    parser.add_argument("path", help="Archivo a importar")
+    parser.add_argument("--format", dest="file_format", choices=FILE_FORMATS, help="Por defecto según la extensión")
+    parser.add_argument("--clinic-id", type=int, help="Solo acepta consultas de esta clínica")
+    parser.add_argument("--user-id", type=int, help="Usuario que figura como creador de los exámenes")
+    args = parser.parse_args(argv)
+
+    try:
+        file_format = detect_format(args.path, args.file_format)
+    except HTTPException as error:
+        parser.error(error.detail)
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            report = ExamImportService(db).import_file(
+                args.exam_type, stream, file_format, args.user_id, args.clinic_id
+            )
+    finally:
+        db.close()
+
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
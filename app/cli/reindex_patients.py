@@ -0,0 +1,62 @@
+"""
+Reconstruye el índice de búsqueda de pacientes (app.data.patient_search).
+
+    python -m app.cli.reindex_patients
+    python -m app.cli.reindex_patients --clinic-id 1
+
+Borra los tokens del alcance indicado y vuelve a indexar los pacientes
+activos por lotes, con una transacción por lote. Mientras se ejecuta, la
+búsqueda de ese alcance devuelve resultados incompletos.
+"""
+import argparse
+import sys
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.models import load_all_models
+from app.data.patient_search import PatientSearchIndex
+from app.domain.models.patient import Patient
+
+# Fuera de la API hay que cargar todos los modelos para que se configuren las relaciones
+load_all_models()
+
+
+def reindex(db, clinic_id=None, batch_size: int = 1000) -> int:
+    index = PatientSearchIndex(db)
+    index.clear(clinic_id)
+    statement = select(Patient).order_by(Patient.id).limit(batch_size)
+    if clinic_id is not None:
+        statement = statement.where(Patient.clinic_id == clinic_id)
+    total = 0
+    last = None
+    while True:
+        page = statement if last is None else statement.where(Patient.id > last)
+        patients = db.scalars(page).all()
+        index.index(patients)
+        total += len(patients)
+        if len(patients) < batch_size:
+            return total
+        last = patients[-1].id
+        # Los pacientes ya indexados no hacen falta en memoria
+        db.expunge_all()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reconstruye el índice de búsqueda de pacientes.")
+    parser.add_argument("--clinic-id", type=int, help="Solo los pacientes de esta clínica")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        total = reindex(db, args.clinic_id, args.batch_size)
+    finally:
+        db.close()
+    print(f"{total} pacientes indexados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
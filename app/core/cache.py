@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Caché en memoria del proceso, acotada (LRU) y con expiración por TTL.
+    Segura para usarse desde los hilos del threadpool de FastAPI.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Elimina las entradas cuyo valor cumple `predicate`. Devuelve cuántas se eliminaron."""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Usuarios autenticados (copias inmutables `Principal`, con rol y permisos) indexados por el `sub` del token
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user_principal(user_id: int) -> None:
+    principal_cache.invalidate_where(lambda user: user.id == user_id)
+
+
+def invalidate_role_principals(role_id: int) -> None:
+    principal_cache.invalidate_where(lambda user: user.role_id == role_id)
@@ -0,0 +1,52 @@
+"""
+Columna JSON comprimida.
+
+Guarda el JSON como binario: tal cual si ocupa menos de
+AUDIT_PAYLOAD_COMPRESS_MIN_BYTES y comprimido con zlib si no (y si así
+ocupa menos). Se distinguen sin marca adicional: un flujo zlib empieza por
+0x78 ("x"), que no puede ser el primer carácter de un JSON.
+
+Lee también los valores anteriores a la conversión de la columna (texto JSON
+sin comprimir). El contenido no se puede consultar desde SQL.
+"""
+import json
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy.dialects.mysql import LONGBLOB
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings
+
+_ZLIB_HEADER = b"x"
+
+
+class CompressedJSON(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        # BLOB en MySQL tiene un máximo de 64 KB
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(data) >= settings.AUDIT_PAYLOAD_COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return compressed
+        return data
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return json.loads(value)
+        value = bytes(value)
+        if value[:1] == _ZLIB_HEADER:
+            value = zlib.decompress(value)
+        return json.loads(value)
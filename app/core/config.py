@@ -1,4 +1,6 @@
 import os
+from datetime import time
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,9 +8,84 @@ class Settings(BaseSettings):
     PROJECT_VERSION: str = "1.0.0"
     PROJECT_DESCRIPTION: str = "API for managing an Ophthalmological Clinic"
     DATABASE_URL: str
+    # URL para el motor asíncrono; si no se define se deriva de DATABASE_URL
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Pool de conexiones (por proceso/worker y por motor)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800  # segundos; menor que wait_timeout de MySQL
+    DB_POOL_PRE_PING: bool = True
+    # Réplicas de lectura separadas por comas (vacío: todo va al primario)
+    DATABASE_REPLICA_URLS: str = ""
+    # Tras escribir, las lecturas del mismo usuario van al primario durante esta ventana
+    READ_YOUR_WRITES_SECONDS: int = 5
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Caché de usuarios autenticados por proceso (0 desactiva la caché)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+    # Hilos del threadpool donde FastAPI ejecuta los endpoints y dependencias síncronos
+    THREADPOOL_SIZE: int = 40
+    # Instrumentación de SQL por petición (Server-Timing, log y /admin/sql-stats)
+    SQL_METRICS_ENABLED: bool = True
+    # Detector de N+1: "off", "warn" (log) o "raise" (NPlusOneError, para las pruebas)
+    SQL_N_PLUS_ONE_MODE: Literal["off", "warn", "raise"] = "warn"
+    # Repeticiones de una misma SELECT en una petición a partir de las que se considera N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    # Altas masivas: elementos por petición y filas por transacción
+    BULK_MAX_ITEMS: int = 1000
+    BULK_CHUNK_SIZE: int = 200
+    # Importación de exámenes: filas por lote/transacción y máximo de errores detallados
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    # Exportaciones en streaming: filas leídas y escritas por lote
+    EXPORT_BATCH_SIZE: int = 1000
+    # Búsqueda de pacientes: resultados alcanzables paginando (los más relevantes)
+    PATIENT_SEARCH_MAX_RESULTS: int = 500
+    # Teléfonos sin prefijo internacional: código de país y dígitos del número nacional
+    PHONE_DEFAULT_COUNTRY_CODE: str = "52"
+    PHONE_NATIONAL_NUMBER_LENGTH: int = 10
+    # Búsqueda de facturas: máximo de facturas por página
+    INVOICE_SEARCH_MAX_LIMIT: int = 100
+    # Auditoría asíncrona: cola acotada, registros por INSERT y espera máxima antes de escribir un lote
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # Cola llena: "block" (espera hasta AUDIT_BLOCK_TIMEOUT_SECONDS), "drop" o "spill" (a AUDIT_SPILL_PATH)
+    AUDIT_OVERFLOW_POLICY: Literal["block", "drop", "spill"] = "spill"
+    AUDIT_BLOCK_TIMEOUT_SECONDS: float = 0.5
+    # Archivo NDJSON para lo desbordado y los lotes fallidos; se reinserta al arrancar (vacío lo desactiva)
+    AUDIT_SPILL_PATH: str = "audit_spill.ndjson"
+    # Auditoría automática de altas, cambios y borrados de los modelos con datos de pacientes
+    AUDIT_CHANGE_CAPTURE_ENABLED: bool = True
+    # Accesos de lectura a datos de pacientes, agregados por (usuario, paciente, tipo, minuto)
+    READ_ACCESS_LOG_ENABLED: bool = True
+    READ_ACCESS_FLUSH_SECONDS: float = 60.0
+    # Grupos en memoria a partir de los que se vuelca sin esperar al intervalo
+    READ_ACCESS_MAX_KEYS: int = 50000
+    # Fracción de lecturas anotadas (1.0 = todas); por endpoint, p. ej. {"consultations.list": 0.1}
+    READ_ACCESS_DEFAULT_SAMPLE_RATE: float = 1.0
+    READ_ACCESS_SAMPLE_RATES: Dict[str, float] = {}
+    # old_values, new_values y related_records de auditoría se comprimen desde este tamaño
+    AUDIT_PAYLOAD_COMPRESS_MIN_BYTES: int = 256
+    # Meses (incluido el actual) que se conservan en la tabla auditlogs; los anteriores
+    # se archivan en segmentos comprimidos (python -m app.cli.archive_audit_logs)
+    AUDIT_HOT_MONTHS: int = 6
+    AUDIT_ARCHIVE_DIR: str = "audit_archive"
+    # Filas por bloque comprimido de los segmentos (unidad mínima de lectura)
+    AUDIT_ARCHIVE_BLOCK_ROWS: int = 1000
+    # Disponibilidad de citas: horario de atención (hora local de la clínica) y días laborables (0 = lunes)
+    AVAILABILITY_OPENING_TIME: time = time(9, 0)
+    AVAILABILITY_CLOSING_TIME: time = time(18, 0)
+    AVAILABILITY_WORKDAYS: List[int] = [0, 1, 2, 3, 4]
+    # Separación entre los inicios de huecos posibles
+    AVAILABILITY_SLOT_STEP_MINUTES: int = 15
+    AVAILABILITY_MAX_DAYS: int = 62
+    AVAILABILITY_MAX_SLOTS: int = 2000
+    # Roles de los usuarios que atienden citas
+    AVAILABILITY_DOCTOR_ROLES: List[str] = ["doctor"]
 
     model_config = SettingsConfigDict(env_file=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env'))
 
@@ -0,0 +1,66 @@
+"""
+Normalización de teléfonos y emails para deduplicar y buscar contactos.
+
+Los teléfonos llegan en cualquier formato ("55 1234 5678", "(55) 1234-5678",
+"+52 55 1234 5678", "0052...") y se guardan también en E.164 ("+525512345678").
+Los números sin prefijo internacional se consideran del país por defecto
+(PHONE_DEFAULT_COUNTRY_CODE).
+
+    normalize_phone("(55) 1234-5678")   -> "+525512345678"
+    phone_suffix("+525512345678")       -> "2345678"
+    normalize_email(" Ana@Mail.COM ")   -> "ana@mail.com"
+"""
+import re
+from typing import Optional
+
+from app.core.config import settings
+
+# Dígitos finales que se indexan para buscar por "los últimos dígitos"
+PHONE_SUFFIX_LENGTH = 7
+# E.164: código de país + número nacional, como mucho 15 dígitos
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+_NOT_DIGIT = re.compile(r"\D")
+
+
+def digits(value: Optional[str]) -> str:
+    return _NOT_DIGIT.sub("", value or "")
+
+
+def normalize_phone(value: Optional[str]) -> Optional[str]:
+    """Teléfono en E.164, o None si no puede serlo."""
+    if not value:
+        return None
+    text = value.strip()
+    number = digits(text)
+    country_code = settings.PHONE_DEFAULT_COUNTRY_CODE
+    national_length = settings.PHONE_NATIONAL_NUMBER_LENGTH
+    if text.startswith("+"):
+        international = number
+    elif number.startswith("00"):
+        international = number[2:]
+    elif len(number) == national_length:
+        international = country_code + number
+    elif len(number) > national_length and number.startswith(country_code):
+        international = number
+    elif len(number) > national_length:
+        # Prefijos nacionales de marcación (p. ej. 01, 044): el número son los últimos dígitos
+        international = country_code + number[-national_length:]
+    else:
+        return None
+    if not E164_MIN_DIGITS <= len(international) <= E164_MAX_DIGITS:
+        return None
+    return "+" + international
+
+
+def phone_suffix(e164: Optional[str]) -> Optional[str]:
+    return e164[-PHONE_SUFFIX_LENGTH:] if e164 else None
+
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    """Email sin espacios y en minúsculas, o None si no parece un email."""
+    if not value:
+        return None
+    email = value.strip().lower()
+    return email if "@" in email else None
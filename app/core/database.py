@@ -1,14 +1,96 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    register_engine,
+)
+from app.core.routing_session import RoutingSession
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Drivers asíncronos equivalentes a los síncronos configurados en DATABASE_URL
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+}
 
-Base = declarative_base()
+def get_async_database_url(url: str, use_override: bool = True) -> str:
+    if use_override and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No hay driver asíncrono para '{parsed.drivername}'; defina ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def get_engine_options(url: str, is_async: bool = False) -> dict:
+    parsed = make_url(url)
+    # SQLite en memoria usa su propio pool de una sola conexión
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def get_replica_urls() -> list:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
+register_engine("primary", engine)
+
+# Réplicas de lectura: las lecturas se reparten entre ellas, las escrituras van a `engine`
+replica_engines = []
+for index, replica_url in enumerate(get_replica_urls()):
+    replica_engine = create_engine(replica_url, **get_engine_options(replica_url))
+    register_engine(f"replica_{index}", replica_engine)
+    replica_engines.append(replica_engine)
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    # Los repositorios devuelven los objetos tras el commit sin recargarlos (ver app/data/write_path.py)
+    expire_on_commit=False,
+    bind=engine,
+    replicas=replica_engines,
+)
+
+ASYNC_DATABASE_URL = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL, is_async=True))
+register_engine("primary_async", async_engine.sync_engine)
+
+async_replica_engines = []
+for index, replica_url in enumerate(get_replica_urls()):
+    async_replica_url = get_async_database_url(replica_url, use_override=False)
+    async_replica_engine = create_async_engine(async_replica_url, **get_engine_options(async_replica_url, is_async=True))
+    register_engine(f"replica_{index}_async", async_replica_engine.sync_engine)
+    async_replica_engines.append(async_replica_engine)
+
+# expire_on_commit=False: en modo asíncrono no puede haber recargas implícitas de atributos
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    replicas=[replica.sync_engine for replica in async_replica_engines],
+)
+
+class _ModelBase:
+    # INSERT/UPDATE devuelven en la misma sentencia los valores generados por la BD (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
+
+Base = declarative_base(cls=_ModelBase)
 
 # Dependency para obtener la sesión de la base de datos
 def get_db():
@@ -16,4 +98,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency para routers que usan la capa de datos asíncrona
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
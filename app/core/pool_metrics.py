@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Telemetría de un pool: tiempos de espera en checkout, uso y overflow."""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_wait = 0.0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_usage(self, in_use: int, overflow: int) -> None:
+        with self._lock:
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts = self.checkouts
+            timeouts = self.timeouts
+            max_wait = self.max_wait
+            peak_in_use = self.peak_in_use
+            peak_overflow = self.peak_overflow
+
+        def percentile(pct: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(round(pct / 100 * (len(waits) - 1))))] * 1000
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_p50": percentile(50),
+            "wait_ms_p95": percentile(95),
+            "wait_ms_p99": percentile(99),
+            "wait_ms_max": max_wait * 1000,
+            "peak_in_use": peak_in_use,
+            "peak_overflow": peak_overflow,
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Mide el tiempo que cada checkout espera por una conexión libre."""
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        metrics = getattr(self, "_metrics", None)
+        if metrics is None:
+            metrics = self._metrics = PoolMetrics()
+        return metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_engines: Dict[str, Engine] = {}
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    """Registra un motor para exponer su pool y muestrear el uso en cada checkout."""
+    _engines[name] = engine
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = engine.pool
+        if isinstance(pool, _InstrumentedPoolMixin):
+            pool.metrics.record_usage(pool.checkedout(), max(pool.overflow(), 0))
+
+
+def pool_status() -> List[dict]:
+    status = []
+    for name, engine in _engines.items():
+        pool = engine.pool
+        entry = {"name": name, "pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "timeout_seconds": pool.timeout(),
+            })
+        if isinstance(pool, _InstrumentedPoolMixin):
+            entry.update(pool.metrics.snapshot())
+        status.append(entry)
+    return status
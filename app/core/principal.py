@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+
+@dataclass(frozen=True)
+class PrincipalRole:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Usuario autenticado tal como se guarda en principal_cache: una copia
+    inmutable de las columnas que usan las dependencias y los routers, sin
+    instancias del ORM, para poder compartirla entre peticiones e hilos.
+    """
+    id: int
+    username: str
+    is_active: bool
+    role_id: Optional[int]
+    associated_clinic_id: Optional[int]
+    role: Optional[PrincipalRole]
+    # Nombres de permiso del rol al cargar el usuario
+    permissions: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """Copia de un `User` con su rol y los permisos del rol ya cargados."""
+        role = user.role
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_active=bool(user.is_active),
+            role_id=user.role_id,
+            associated_clinic_id=user.associated_clinic_id,
+            role=PrincipalRole(id=role.id, name=role.name) if role is not None else None,
+            permissions=frozenset(
+                role_permission.permission.name
+                for role_permission in (role.role_permissions if role is not None else ())
+                if role_permission.permission is not None
+            ),
+        )
@@ -0,0 +1,84 @@
+import itertools
+import threading
+from typing import Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Usuarios que escribieron recientemente: sus lecturas van al primario durante
+# READ_YOUR_WRITES_SECONDS para no ver datos atrasados de una réplica
+recent_writers = TTLCache(maxsize=10000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las escrituras al primario y las lecturas a las réplicas.
+
+    Las lecturas vuelven al primario cuando la sesión ya escribió (misma
+    petición), cuando el usuario autenticado escribió hace menos de
+    READ_YOUR_WRITES_SECONDS o cuando se pide explícitamente con `use_primary`.
+    Sin réplicas configuradas todo va al primario.
+    """
+
+    def __init__(self, *args, replicas: Sequence[Engine] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+        self._replica_cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._cycle_lock = threading.Lock()
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if not self.replicas or self._must_use_primary(clause):
+            return primary
+        with self._cycle_lock:
+            return self.replicas[next(self._replica_cycle)]
+
+    def _must_use_primary(self, clause) -> bool:
+        if self._flushing or self.info.get("use_primary") or self.info.get("wrote"):
+            return True
+        if clause is not None and _is_write(clause):
+            self.info["wrote"] = True
+            return True
+        principal_id = self.info.get("principal_id")
+        return principal_id is not None and recent_writers.get(principal_id) is not None
+
+
+def _is_write(clause) -> bool:
+    # SQL textual: no se puede saber si escribe, va al primario
+    if isinstance(clause, TextClause):
+        return True
+    if getattr(clause, "is_dml", False):
+        return True
+    # SELECT ... FOR UPDATE bloquea filas del primario
+    return getattr(clause, "_for_update_arg", None) is not None
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    if not session.info.get("wrote"):
+        return
+    principal_id = session.info.get("principal_id")
+    if principal_id is not None:
+        recent_writers.set(principal_id, True)
+
+
+def set_principal(session, principal_id: Optional[int]) -> None:
+    """Asocia la sesión al usuario autenticado para aplicar read-your-writes."""
+    info = getattr(session, "info", None)
+    if info is not None:
+        info["principal_id"] = principal_id
+
+
+def use_primary(session) -> None:
+    """Fuerza que el resto de la sesión lea del primario."""
+    session.info["use_primary"] = True
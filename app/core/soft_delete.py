@@ -0,0 +1,50 @@
+"""
+Borrado lógico aplicado a nivel de sesión.
+
+Los modelos con columna `deleted_at` heredan de `SoftDeleteMixin`. Cada SELECT
+del ORM (consultas, `session.get`, cargas anticipadas y lazy de relaciones)
+recibe el criterio `deleted_at IS NULL` para esas entidades, así que los
+repositorios ya no lo escriben a mano.
+
+Para ver también las filas borradas se pide explícitamente:
+
+    db.query(User).execution_options(include_deleted=True)
+    db.execute(select(User), execution_options={"include_deleted": True})
+"""
+from sqlalchemy import Column, DateTime, event
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+INCLUDE_DELETED = "include_deleted"
+# Marca de las sentencias que ya llevan el criterio (p. ej. las cacheadas de BaseRepository)
+_CRITERIA_APPLIED = "soft_delete_applied"
+
+
+class SoftDeleteMixin:
+    """Modelos con borrado lógico. Los modelos pueden redefinir `deleted_at` (p. ej. con zona horaria)."""
+
+    deleted_at = Column(DateTime, nullable=True)
+
+
+# include_aliases: también cubre los joinedload, que consultan la tabla con un alias
+_NOT_DELETED = with_loader_criteria(
+    SoftDeleteMixin,
+    lambda cls: cls.deleted_at.is_(None),
+    include_aliases=True,
+)
+
+
+def exclude_deleted(statement):
+    """Aplica el criterio al construir la sentencia, para reutilizarla sin volver a añadirlo en cada ejecución."""
+    return statement.options(_NOT_DELETED).execution_options(**{_CRITERIA_APPLIED: True})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_soft_deleted(execute_state: ORMExecuteState):
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.execution_options.get(INCLUDE_DELETED, False)
+        or execute_state.execution_options.get(_CRITERIA_APPLIED, False)
+    ):
+        return
+    execute_state.statement = execute_state.statement.options(_NOT_DELETED)
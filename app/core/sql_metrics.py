@@ -0,0 +1,279 @@
+"""
+Instrumentación de SQL por petición.
+
+Los eventos `before/after_cursor_execute` de SQLAlchemy miden cada sentencia
+enviada a la base de datos. Dentro de una petición HTTP (ver
+`SQLMetricsMiddleware`) se acumulan en un colector guardado en un ContextVar:
+número de consultas, tiempo total en BD y repeticiones por huella
+(`fingerprint`: el SQL con literales y listas IN normalizados). Al terminar la
+petición se envía la cabecera `Server-Timing` y una línea de log.
+
+Si una misma SELECT se repite más de `SQL_N_PLUS_ONE_THRESHOLD` veces en una
+petición se trata como un N+1: según `SQL_N_PLUS_ONE_MODE` se ignora ("off"),
+se registra un aviso ("warn") o se lanza `NPlusOneError` ("raise", pensado
+para las pruebas).
+
+Además se agregan estadísticas por huella en el proceso (llamadas, p50/p95,
+filas) que se consultan en /api/v1/admin/sql-stats.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_MODES = ("off", "warn", "raise")
+
+
+class NPlusOneError(RuntimeError):
+    """Una misma consulta se repitió demasiadas veces en una petición."""
+
+
+# --- huellas de sentencias ---
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# IN (%s, %s, ...) / IN (?, ?, ...) / IN (__[POSTCOMPILE_x]) con cualquier número de elementos
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """SQL sin literales ni longitudes de listas: dos ejecuciones de la misma consulta dan el mismo texto."""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    return _PLACEHOLDER_LIST.sub("(?+)", normalized)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:12]
+
+
+# --- colector por petición ---
+
+class RequestQueries:
+    """Consultas ejecutadas durante una petición."""
+
+    __slots__ = ("count", "duration", "by_fingerprint", "reported", "batched")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_fingerprint: Counter = Counter()
+        # Huellas ya señaladas como N+1 (se avisa una vez por petición)
+        self.reported = set()
+        # Dentro de `batched_queries()` las repeticiones son lotes, no N+1
+        self.batched = 0
+
+    def repeated(self, minimum: int = 2) -> Dict[str, int]:
+        return {key: calls for key, calls in self.by_fingerprint.items() if calls >= minimum}
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("sql_request_queries", default=None)
+
+
+def start_request() -> RequestQueries:
+    queries = RequestQueries()
+    _current.set(queries)
+    return queries
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+@contextmanager
+def batched_queries():
+    """
+    Marca un bloque que repite a propósito las mismas consultas por lotes
+    (importaciones, exportaciones) para que el detector de N+1 no lo señale.
+    """
+    queries = _current.get()
+    if queries is None:
+        yield
+        return
+    queries.batched += 1
+    try:
+        yield
+    finally:
+        queries.batched -= 1
+
+
+# --- estadísticas agregadas por huella ---
+
+class StatementStats:
+    def __init__(self, sql: str, window: int):
+        self.sql = sql
+        self.calls = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._durations = deque(maxlen=window)
+
+    def record(self, seconds: float, rows: int) -> None:
+        self.calls += 1
+        self.rows += max(rows, 0)
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._durations.append(seconds)
+
+    def snapshot(self, key: str) -> dict:
+        durations = sorted(self._durations)
+
+        def percentile(pct: float) -> float:
+            if not durations:
+                return 0.0
+            return durations[min(len(durations) - 1, int(round(pct / 100 * (len(durations) - 1))))] * 1000
+
+        return {
+            "fingerprint": key,
+            "sql": self.sql,
+            "calls": self.calls,
+            "rows": self.rows,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.calls * 1000 if self.calls else 0.0,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": self.max * 1000,
+        }
+
+
+class SQLStats:
+    """Estadísticas por huella del proceso; acotadas a `max_statements` huellas distintas."""
+
+    def __init__(self, max_statements: int = 500, window: int = 1024):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StatementStats] = {}
+        self.max_statements = max_statements
+        self.window = window
+        self.dropped = 0
+
+    def record(self, key: str, statement: str, seconds: float, rows: int) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_statements:
+                    self.dropped += 1
+                    return
+                stats = self._stats[key] = StatementStats(normalize_statement(statement), self.window)
+            stats.record(seconds, rows)
+
+    def snapshot(self, limit: int = 50) -> List[dict]:
+        with self._lock:
+            entries = [stats.snapshot(key) for key, stats in self._stats.items()]
+        entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return entries[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.dropped = 0
+
+
+sql_stats = SQLStats()
+
+
+# --- eventos del motor ---
+
+def _is_select(statement: str) -> bool:
+    return statement.lstrip()[:6].upper() == "SELECT"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_metrics_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("sql_metrics_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if not settings.SQL_METRICS_ENABLED:
+        return
+
+    key = fingerprint(statement)
+    # rowcount: filas afectadas en escrituras; en lecturas depende del driver (-1 si no lo sabe)
+    sql_stats.record(key, statement, elapsed, getattr(cursor, "rowcount", -1))
+
+    queries = _current.get()
+    if queries is None:
+        return
+    queries.count += 1
+    queries.duration += elapsed
+    queries.by_fingerprint[key] += 1
+    if (
+        settings.SQL_N_PLUS_ONE_MODE != "off"
+        and not queries.batched
+        and queries.by_fingerprint[key] > settings.SQL_N_PLUS_ONE_THRESHOLD
+        and key not in queries.reported
+        and _is_select(statement)
+    ):
+        queries.reported.add(key)
+        message = (
+            f"Posible N+1: la consulta {key} se ejecutó más de {settings.SQL_N_PLUS_ONE_THRESHOLD} "
+            f"veces en la misma petición: {normalize_statement(statement)[:300]}"
+        )
+        if settings.SQL_N_PLUS_ONE_MODE == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+# --- middleware ---
+
+class SQLMetricsMiddleware:
+    """
+    Middleware ASGI: abre un colector por petición y añade `Server-Timing`
+    (`db;dur=...;desc="N queries"` y `app;dur=...`) a la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        queries = start_request()
+        start = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timing = (
+                    f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries", '
+                    f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            repeated = queries.repeated()
+            logger.info(
+                "%s %s %s queries=%d db_ms=%.1f total_ms=%.1f repeated=%s",
+                scope["method"], scope["path"], status_code, queries.count, queries.duration * 1000,
+                (time.perf_counter() - start) * 1000,
+                ",".join(f"{key}x{calls}" for key, calls in sorted(repeated.items(), key=lambda item: -item[1])) or "-",
+            )
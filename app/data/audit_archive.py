@@ -0,0 +1,403 @@
+"""
+Archivo frío del registro de auditoría.
+
+La tabla `auditlogs` conserva los AUDIT_HOT_MONTHS meses más recientes. Los
+anteriores se archivan por meses completos (python -m app.cli.archive_audit_logs)
+en AUDIT_ARCHIVE_DIR, cada mes en dos archivos:
+
+- auditlogs-2026-01.<generación>.ndjson.gz: los registros en NDJSON,
+  ordenados por (created_at, id), en bloques de AUDIT_ARCHIVE_BLOCK_ROWS
+  filas. Cada bloque es un miembro gzip independiente: el segmento completo
+  se lee con zcat y un bloque se descomprime sin leer los anteriores.
+- auditlogs-2026-01.index.json: el índice del segmento. Por bloque, su
+  posición, fechas primera y última y rango de ids; por cada valor de
+  INDEXED_FIELDS (entidad, usuario, clínica...), los bloques que lo contienen.
+
+Una búsqueda descarta los meses y bloques que quedan fuera de su rango de
+fechas o que el índice excluye, y solo descomprime el resto.
+
+El índice es lo último que se escribe (archivo temporal + rename): un mes sin
+índice no está archivado. Después se borran de la tabla, por lotes, las filas
+archivadas. Si el mes ya tenía segmento (filas tardías, o un archivado que no
+llegó a borrar) se fusiona con él en una generación nueva.
+"""
+import gzip
+import heapq
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.data.export import ndjson_lines
+from app.data.pagination import Keyset
+from app.domain.models.auditlog import AuditLog
+
+INDEXED_FIELDS = ("entity_type", "entity_id", "action_type", "user_id", "clinic_id", "severity")
+
+_TABLE = AuditLog.__table__
+# Orden de los segmentos; las búsquedas los recorren al revés (más recientes primero)
+_KEYSET = Keyset(_TABLE.c.created_at, _TABLE.c.id)
+_DATETIME_COLUMNS = ("created_at", "reviewed_at")
+_PREFIX = "auditlogs-"
+_INDEX_SUFFIX = ".index.json"
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def hot_horizon(now: Optional[datetime] = None) -> datetime:
+    """Comienzo del mes más antiguo que se conserva en la tabla."""
+    return add_months(month_start(now or datetime.now()), 1 - settings.AUDIT_HOT_MONTHS)
+
+
+def _key(row: Dict[str, Any]) -> Tuple[datetime, int]:
+    return row["created_at"], row["id"]
+
+
+def _naive(value: Any) -> Any:
+    # Las fechas de la tabla no tienen zona; las de la petición pueden tenerla
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def _decode(line: bytes) -> Dict[str, Any]:
+    row = json.loads(line)
+    for column in _DATETIME_COLUMNS:
+        if row.get(column) is not None:
+            row[column] = datetime.fromisoformat(row[column])
+    return row
+
+
+def _matches(row: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Mismos filtros que AUDIT_LOG_FILTERS: igualdad salvo start_date/end_date."""
+    for name, value in filters.items():
+        if name == "start_date":
+            if row["created_at"] < value:
+                return False
+        elif name == "end_date":
+            if row["created_at"] > value:
+                return False
+        elif row.get(name) != value:
+            return False
+    return True
+
+
+def _unique(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    # Filas ordenadas; de las repetidas queda la última (la de la tabla al fusionar)
+    previous = None
+    for row in rows:
+        if previous is not None and _key(previous) != _key(row):
+            yield previous
+        previous = row
+    if previous is not None:
+        yield previous
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _sync(file) -> None:
+    file.flush()
+    os.fsync(file.fileno())
+
+
+@lru_cache(maxsize=32)
+def _load_index(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # `mtime_ns` forma parte de la clave: un índice reescrito se vuelve a leer
+    with open(path, encoding="utf-8") as file:
+        index = json.load(file)
+    for block in index["blocks"]:
+        block["first"] = datetime.fromisoformat(block["first"])
+        block["last"] = datetime.fromisoformat(block["last"])
+    return index
+
+
+class _IndexBuilder:
+    def __init__(self):
+        self.blocks: List[Dict[str, Any]] = []
+        self.values: Dict[str, Dict[str, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self.rows = 0
+
+    def add(self, offset: int, length: int, rows: List[Dict[str, Any]]) -> None:
+        number = len(self.blocks)
+        ids = [row["id"] for row in rows]
+        self.blocks.append({
+            "offset": offset,
+            "length": length,
+            "rows": len(rows),
+            "first": rows[0]["created_at"].isoformat(),
+            "last": rows[-1]["created_at"].isoformat(),
+            "min_id": min(ids),
+            "max_id": max(ids),
+        })
+        for field in INDEXED_FIELDS:
+            values = self.values[field]
+            for row in rows:
+                if row.get(field) is None:
+                    continue
+                blocks = values.setdefault(str(row[field]), [])
+                if not blocks or blocks[-1] != number:
+                    blocks.append(number)
+        self.rows += len(rows)
+
+    def build(self, month: datetime, segment: str, generation: int) -> Dict[str, Any]:
+        return {
+            "month": f"{month:%Y-%m}",
+            "segment": segment,
+            "generation": generation,
+            "rows": self.rows,
+            "blocks": self.blocks,
+            "values": self.values,
+        }
+
+
+class _TableRows:
+    """Filas de un mes de la tabla, por lotes y en el orden de los segmentos."""
+
+    def __init__(self, db: Session, start: datetime, end: datetime, batch_size: int):
+        self.db = db
+        self.statement = (
+            select(_TABLE)
+            .where(_TABLE.c.created_at >= start, _TABLE.c.created_at < end)
+            .order_by(*_KEYSET.order_by())
+            .limit(batch_size)
+        )
+        self.batch_size = batch_size
+        self.count = 0
+        self.max_id = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        last = None
+        while True:
+            page = self.statement if last is None else self.statement.where(_KEYSET.after(last))
+            rows = [dict(row) for row in self.db.execute(page).mappings()]
+            # Sin transacción abierta entre lotes: no se retienen snapshots en la BD
+            self.db.rollback()
+            for row in rows:
+                self.count += 1
+                self.max_id = max(self.max_id, row["id"])
+                yield row
+            if len(rows) < self.batch_size:
+                return
+            last = list(_key(rows[-1]))
+
+
+class AuditArchive:
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> str:
+        return self._directory if self._directory is not None else settings.AUDIT_ARCHIVE_DIR
+
+    def months(self) -> List[datetime]:
+        """Meses archivados, del más antiguo al más reciente."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        months = []
+        for name in names:
+            if name.startswith(_PREFIX) and name.endswith(_INDEX_SUFFIX):
+                try:
+                    months.append(datetime.strptime(name[len(_PREFIX):-len(_INDEX_SUFFIX)], "%Y-%m"))
+                except ValueError:
+                    continue
+        return sorted(months)
+
+    def index(self, month: datetime) -> Optional[Dict[str, Any]]:
+        path = self._index_path(month)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        return _load_index(path, mtime_ns)
+
+    # --- lectura ---
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        before: Optional[Tuple[datetime, int]] = None,
+        descending: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Registros archivados que cumplen `filters` (los de AUDIT_LOG_FILTERS),
+        del más reciente al más antiguo o, con descending=False, al revés. Con
+        `before` (created_at, id), solo los anteriores a esa posición.
+        """
+        # Como FilterSpec.apply: None y "" no filtran
+        filters = {name: _naive(value) for name, value in filters.items() if value is not None and value != ""}
+        if before is not None:
+            before = (_naive(before[0]), before[1])
+        start, end = filters.get("start_date"), filters.get("end_date")
+        months = self.months()
+        for month in (reversed(months) if descending else months):
+            if end is not None and month > end:
+                continue
+            if start is not None and add_months(month, 1) <= start:
+                continue
+            if before is not None and month > before[0]:
+                continue
+            index = self.index(month)
+            if index is None:
+                continue
+            blocks = self._blocks(index, filters, before)
+            yield from self._scan(index, blocks, filters, before, descending)
+
+    def get(self, audit_log_id: int) -> Optional[Dict[str, Any]]:
+        for month in reversed(self.months()):
+            index = self.index(month)
+            if index is None:
+                continue
+            blocks = [
+                number for number, block in enumerate(index["blocks"])
+                if block["min_id"] <= audit_log_id <= block["max_id"]
+            ]
+            for row in self._scan(index, blocks, {"id": audit_log_id}, None, True):
+                return row
+        return None
+
+    def _blocks(self, index: Dict[str, Any], filters: Dict[str, Any], before: Optional[Tuple[datetime, int]]) -> List[int]:
+        candidates = None
+        for field in INDEXED_FIELDS:
+            if field in filters:
+                blocks = set(index["values"][field].get(str(filters[field]), ()))
+                candidates = blocks if candidates is None else candidates & blocks
+        numbers = range(len(index["blocks"])) if candidates is None else sorted(candidates)
+        start, end = filters.get("start_date"), filters.get("end_date")
+        selected = []
+        for number in numbers:
+            block = index["blocks"][number]
+            if start is not None and block["last"] < start:
+                continue
+            if end is not None and block["first"] > end:
+                continue
+            if before is not None and block["first"] > before[0]:
+                continue
+            selected.append(number)
+        return selected
+
+    def _scan(
+        self,
+        index: Dict[str, Any],
+        blocks: List[int],
+        filters: Dict[str, Any],
+        before: Optional[Tuple[datetime, int]],
+        descending: bool,
+    ) -> Iterator[Dict[str, Any]]:
+        if not blocks:
+            return
+        with open(os.path.join(self.directory, index["segment"]), "rb") as segment:
+            for number in (reversed(blocks) if descending else blocks):
+                block = index["blocks"][number]
+                segment.seek(block["offset"])
+                rows = [_decode(line) for line in gzip.decompress(segment.read(block["length"])).splitlines()]
+                for row in (reversed(rows) if descending else rows):
+                    if before is not None and _key(row) >= before:
+                        continue
+                    if _matches(row, filters):
+                        yield row
+
+    # --- archivado ---
+
+    def archive_before(self, db: Session, horizon: Optional[datetime] = None) -> List[Tuple[datetime, int]]:
+        """Archiva los meses anteriores a `horizon` (por defecto, hot_horizon()): [(mes, registros)]."""
+        horizon = month_start(horizon or hot_horizon())
+        oldest = db.scalar(select(_TABLE.c.created_at).where(_TABLE.c.created_at < horizon).order_by(_TABLE.c.created_at).limit(1))
+        db.rollback()
+        results = []
+        month = month_start(oldest) if oldest is not None else horizon
+        while month < horizon:
+            results.append((month, self.archive_month(db, month)))
+            month = add_months(month, 1)
+        return results
+
+    def archive_month(self, db: Session, month: datetime) -> int:
+        """
+        Lleva al segmento del mes sus registros de la tabla (fusionados con los
+        ya archivados) y los borra de la tabla. Devuelve cuántos salieron de ella.
+        """
+        start = month_start(month)
+        end = add_months(start, 1)
+        batch_size = settings.AUDIT_ARCHIVE_BLOCK_ROWS
+        # Lo que se borra tiene que haberse leído del primario, no de una réplica atrasada
+        db.info["use_primary"] = True
+        pending = db.scalar(select(_TABLE.c.id).where(_TABLE.c.created_at >= start, _TABLE.c.created_at < end).limit(1))
+        db.rollback()
+        if pending is None:
+            return 0
+
+        previous = self.index(start)
+        table_rows = _TableRows(db, start, end, batch_size)
+        archived = self._scan(previous, list(range(len(previous["blocks"]))), {}, None, False) if previous else iter(())
+        generation = previous["generation"] + 1 if previous else 1
+        self._write(start, _unique(heapq.merge(archived, table_rows, key=_key)), generation)
+        if previous and previous["segment"] != self._segment_name(start, generation):
+            os.remove(os.path.join(self.directory, previous["segment"]))
+
+        self._delete(db, start, end, table_rows.max_id, batch_size)
+        return table_rows.count
+
+    def _write(self, month: datetime, rows: Iterable[Dict[str, Any]], generation: int) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        name = self._segment_name(month, generation)
+        path = os.path.join(self.directory, name)
+        builder = _IndexBuilder()
+        with open(f"{path}.tmp", "wb") as segment:
+            for block in _chunks(rows, settings.AUDIT_ARCHIVE_BLOCK_ROWS):
+                data = gzip.compress("".join(ndjson_lines(block)).encode("utf-8"))
+                builder.add(segment.tell(), len(data), block)
+                segment.write(data)
+            _sync(segment)
+        os.replace(f"{path}.tmp", path)
+
+        index_path = self._index_path(month)
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as index:
+            json.dump(builder.build(month, name, generation), index, separators=(",", ":"))
+            _sync(index)
+        os.replace(f"{index_path}.tmp", index_path)
+
+    def _delete(self, db: Session, start: datetime, end: datetime, max_id: int, batch_size: int) -> None:
+        # Solo lo archivado: las filas que lleguen al mes mientras tanto se quedan para la próxima vez
+        ids = (
+            select(_TABLE.c.id)
+            .where(_TABLE.c.created_at >= start, _TABLE.c.created_at < end, _TABLE.c.id <= max_id)
+            .order_by(_TABLE.c.id)
+            .limit(batch_size)
+        )
+        while True:
+            batch = db.scalars(ids).all()
+            if not batch:
+                db.rollback()
+                return
+            db.execute(delete(_TABLE).where(_TABLE.c.id.in_(batch)))
+            db.commit()
+
+    def _segment_name(self, month: datetime, generation: int) -> str:
+        return f"{_PREFIX}{month:%Y-%m}.{generation}.ndjson.gz"
+
+    def _index_path(self, month: datetime) -> str:
+        return os.path.join(self.directory, f"{_PREFIX}{month:%Y-%m}{_INDEX_SUFFIX}")
+
+
+audit_archive = AuditArchive()
@@ -0,0 +1,386 @@
+"""
+Escritura asíncrona y por lotes de registros de auditoría.
+
+`audit_sink.submit({...})` encola el registro y vuelve de inmediato: la
+petición no abre transacción ni espera a la base de datos. Un hilo escritor
+vacía la cola en lotes de hasta AUDIT_BATCH_SIZE registros, o lo que haya
+acumulado en AUDIT_FLUSH_INTERVAL_SECONDS, y escribe cada lote con un único
+INSERT de varias filas y un commit.
+
+La cola está acotada (AUDIT_QUEUE_SIZE). Cuando se llena, según
+AUDIT_OVERFLOW_POLICY:
+
+- "block": la petición espera hueco hasta AUDIT_BLOCK_TIMEOUT_SECONDS
+  (contrapresión); pasado ese tiempo el registro se descarta
+- "drop": el registro se descarta y se cuenta
+- "spill": el registro se añade al archivo de desbordamiento
+
+El archivo de desbordamiento (AUDIT_SPILL_PATH, NDJSON, vacío para
+desactivarlo) recibe también los lotes que no se pudieron escribir en la base
+de datos (caída, sin conexión); las filas que la base de datos rechaza por
+sí mismas se descartan una a una sin perder el resto del lote. El escritor
+reinserta el archivo al arrancar y cada vez que se queda sin trabajo. La
+reinserción es "al menos una vez": si el proceso muere a mitad de
+un archivo, los lotes ya insertados de ese archivo se repiten.
+
+    audit_sink.submit({"action_type": "UPDATE", "entity_type": "Patient", "entity_id": "7", "user_id": 3})
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import JSON, DateTime
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.compressed_json import CompressedJSON
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.data.write_path import insert_chunked, insert_many
+from app.domain.models.auditlog import AuditLog
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+# Espera entre reintentos de reinserción mientras la base de datos no responde
+REPLAY_RETRY_SECONDS = 30
+
+# Todas las filas de un INSERT de varias filas llevan las mismas columnas. Se
+# leen de la tabla y no del mapper para no configurar los mappers al importar
+_COLUMNS = [column.key for column in AuditLog.__table__.columns if column.key != "id"]
+_DATETIME_COLUMNS = {column.key for column in AuditLog.__table__.columns if isinstance(column.type, DateTime)}
+_JSON_COLUMNS = [column.key for column in AuditLog.__table__.columns if isinstance(column.type, (JSON, CompressedJSON))]
+
+_STOP = object()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    # Un valor no serializable no debe perder el registro ni detener el escritor
+    return str(value)
+
+
+def audit_row(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Fila completa de `auditlogs`: columnas desconocidas fuera y la fecha del evento, no la de escritura."""
+    row = {column: values.get(column) for column in _COLUMNS}
+    if row["created_at"] is None:
+        row["created_at"] = datetime.now()
+    if row["is_reviewed"] is None:
+        row["is_reviewed"] = False
+    return row
+
+
+def _json_safe(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Las columnas JSON solo admiten tipos JSON; fechas y decimales van como texto
+    for column in _JSON_COLUMNS:
+        if row[column] is not None:
+            row = {**row, column: json.loads(json.dumps(row[column], default=_plain))}
+    return row
+
+
+def _dump(row: Dict[str, Any]) -> str:
+    return json.dumps(row, default=_plain, ensure_ascii=False)
+
+
+def _load(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    for column in _DATETIME_COLUMNS:
+        if isinstance(row.get(column), str):
+            row[column] = datetime.fromisoformat(row[column])
+    return audit_row(row)
+
+
+class AuditSink:
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        overflow_policy: Optional[str] = None,
+        block_timeout: Optional[float] = None,
+        spill_path: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        self.overflow_policy = overflow_policy or settings.AUDIT_OVERFLOW_POLICY
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de desbordamiento desconocida: {self.overflow_policy}")
+        self.block_timeout = block_timeout if block_timeout is not None else settings.AUDIT_BLOCK_TIMEOUT_SECONDS
+        self.spill_path = spill_path if spill_path is not None else settings.AUDIT_SPILL_PATH
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or settings.AUDIT_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._spill_pending = False
+        self._retry_at = 0.0
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.failures = 0
+
+    # --- productores ---
+
+    def submit(self, values: Dict[str, Any]) -> bool:
+        """Encola un registro; False si se descartó por estar la cola llena."""
+        self.start()
+        row = audit_row(values)
+        with self._lock:
+            self.submitted += 1
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            pass
+        if self.overflow_policy == "spill" and self._spill([row]):
+            return True
+        with self._lock:
+            self.dropped += 1
+        logger.warning("Cola de auditoría llena: registro %s %s descartado", row["action_type"], row["entity_type"])
+        return False
+
+    # --- ciclo de vida ---
+
+    def start(self) -> None:
+        """Arranca el hilo escritor si no está en marcha; antes de la cola reinserta lo desbordado."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._spill_pending = bool(self.spill_path) and (
+                os.path.exists(self.spill_path) or os.path.exists(self._replay_path)
+            )
+            self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Escribe lo pendiente y detiene el escritor; lo que no quepa en `timeout` se desborda a disco."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            self._spill(self._drain())
+
+    def flush(self) -> None:
+        """Espera a que todo lo encolado hasta ahora esté escrito (o desbordado)."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "queued": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "overflow_policy": self.overflow_policy,
+                "submitted": self.submitted,
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "rejected": self.rejected,
+                "spilled": self.spilled,
+                "replayed": self.replayed,
+                "failures": self.failures,
+            }
+
+    # --- escritor ---
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            if self._spill_pending and self._queue.empty():
+                self._replay()
+            batch, stopping = self._next_batch()
+            if batch:
+                self._write_or_spill(batch)
+            for _ in range(len(batch) + stopping):
+                self._queue.task_done()
+
+    def _next_batch(self):
+        """Hasta batch_size filas: espera la primera y, desde ella, como mucho flush_interval."""
+        batch: List[Dict[str, Any]] = []
+        try:
+            # Sin trabajo se despierta de vez en cuando para reinsertar lo desbordado
+            first = self._queue.get(timeout=max(self.flush_interval, 1.0))
+        except queue.Empty:
+            return batch, False
+        if first is _STOP:
+            return batch, True
+        batch.append(first)
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Inserta el lote y devuelve las filas escritas. Las filas que la base de
+        datos rechaza por sí mismas (clave ajena inexistente, dato demasiado
+        largo...) se descartan sin perder el resto; cualquier otro error (base
+        de datos caída) se propaga y el lote se desborda entero.
+        """
+        rows = [_json_safe(row) for row in rows]
+        db = self.session_factory()
+        try:
+            try:
+                insert_many(db, AuditLog, rows, returning=False)
+                db.commit()
+                return len(rows)
+            except (IntegrityError, DataError):
+                db.rollback()
+            outcomes = insert_chunked(db, AuditLog, rows, len(rows), returning=False)
+        finally:
+            db.close()
+        rejected = [outcome for outcome in outcomes if isinstance(outcome, str)]
+        if rejected:
+            with self._lock:
+                self.rejected += len(rejected)
+            logger.error("%d registros de auditoría rechazados por la base de datos: %s", len(rejected), rejected[0])
+        return len(rows) - len(rejected)
+
+    def _write_or_spill(self, rows: List[Dict[str, Any]]) -> bool:
+        try:
+            written = self._write(rows)
+        except Exception as error:
+            # Sin los parámetros de la sentencia: contienen datos de pacientes
+            logger.error("No se pudo escribir un lote de %d registros de auditoría: %s", len(rows), type(error).__name__)
+            with self._lock:
+                self.failures += 1
+            if not self._spill(rows):
+                with self._lock:
+                    self.dropped += len(rows)
+            return False
+        with self._lock:
+            self.written += written
+            self.batches += 1
+        return True
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows
+            self._queue.task_done()
+            if item is not _STOP:
+                rows.append(item)
+
+    # --- desbordamiento a disco ---
+
+    @property
+    def _replay_path(self) -> str:
+        return f"{self.spill_path}.replay"
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> bool:
+        if not self.spill_path or not rows:
+            return False
+        data = "".join(_dump(row) + "\n" for row in rows)
+        try:
+            with self._spill_lock:
+                with open(self.spill_path, "a", encoding="utf-8") as spill:
+                    spill.write(data)
+                    spill.flush()
+                    os.fsync(spill.fileno())
+        except OSError:
+            logger.exception("No se pudo desbordar a %s", self.spill_path)
+            return False
+        with self._lock:
+            self.spilled += len(rows)
+            self._spill_pending = True
+        return True
+
+    def _replay(self) -> None:
+        """Reinserta el archivo de desbordamiento por lotes; si la base de datos falla se reintenta más tarde."""
+        if time.monotonic() < self._retry_at:
+            return
+        with self._spill_lock:
+            self._spill_pending = False
+            # Un archivo a medio reinsertar (caída anterior) va primero
+            if not os.path.exists(self._replay_path):
+                try:
+                    os.replace(self.spill_path, self._replay_path)
+                except FileNotFoundError:
+                    return
+        with open(self._replay_path, encoding="utf-8") as spill:
+            rows = self._spilled_rows(spill)
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                if not self._replay_batch(batch):
+                    # Se conserva solo lo que falta por insertar
+                    self._rewrite_replay(batch, rows)
+                    return
+        os.remove(self._replay_path)
+        # Lo desbordado mientras tanto va en la siguiente vuelta
+        with self._spill_lock:
+            self._spill_pending = os.path.exists(self.spill_path)
+
+    def _replay_batch(self, rows: List[Dict[str, Any]]) -> bool:
+        try:
+            written = self._write(rows)
+        except Exception as error:
+            logger.error("No se pudo reinsertar %s (%s); se reintentará", self._replay_path, type(error).__name__)
+            with self._lock:
+                self.failures += 1
+                self._spill_pending = True
+            self._retry_at = time.monotonic() + REPLAY_RETRY_SECONDS
+            return False
+        with self._lock:
+            self.written += written
+            self.batches += 1
+            self.replayed += written
+        return True
+
+    def _rewrite_replay(self, batch: List[Dict[str, Any]], rest: Iterator[Dict[str, Any]]) -> None:
+        pending = f"{self._replay_path}.tmp"
+        with open(pending, "w", encoding="utf-8") as spill:
+            for row in chain(batch, rest):
+                spill.write(_dump(row) + "\n")
+            spill.flush()
+            os.fsync(spill.fileno())
+        os.replace(pending, self._replay_path)
+
+    def _spilled_rows(self, spill) -> Iterator[Dict[str, Any]]:
+        for number, line in enumerate(spill, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield _load(line)
+            except ValueError:
+                # Normalmente la última línea de una escritura interrumpida
+                logger.warning("Línea %d ilegible en %s; se omite", number, self._replay_path)
+
+
+audit_sink = AuditSink()
@@ -0,0 +1,256 @@
+"""
+Auditoría automática de cambios en los modelos con datos de pacientes.
+
+Las altas, modificaciones y borrados de los modelos de AUDITED_MODELS generan
+un registro de auditoría con solo las columnas que cambiaron (`old_values` /
+`new_values`). Los cambios se toman de dos sitios, sin consultas adicionales:
+
+- `before_flush`: el historial de atributos que el ORM ya mantiene para los
+  objetos nuevos, modificados y borrados de la sesión
+- la ruta de escritura (app/data/write_path.py): los UPDATE por id, los
+  borrados lógicos y los INSERT de varias filas no pasan por el flush y
+  registran el cambio con `statement_change` / `record_change`. El valor
+  anterior sale del mapa de identidad si el objeto ya estaba cargado; si no,
+  solo se conoce el nuevo (no se lee la fila para no alargar la escritura ni
+  los bloqueos).
+
+Los cambios se acumulan en la sesión y se entregan a `audit_sink` (cola en
+memoria, sin esperar a la base de datos) cuando la transacción se confirma.
+Un rollback descarta los de la transacción o del SAVEPOINT deshecho.
+
+El usuario es el de la petición: `set_principal`, que aplican get_current_user
+en la sesión síncrona y get_current_user_async en la asíncrona (sin él los
+registros quedan con user_id NULL); la clínica, la del objeto.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+from app.core.config import settings
+from app.domain.models.appointment import Appointment
+from app.domain.models.consentform import ConsentForm
+from app.domain.models.consultation import Consultation
+from app.domain.models.invoice import Invoice
+from app.domain.models.invoiceitem import InvoiceItem
+from app.domain.models.iopexam import IOPExam
+from app.domain.models.lead import Lead
+from app.domain.models.patient import Patient
+from app.domain.models.patient_education_tracking import PatientEducationTracking
+from app.domain.models.patientdocument import PatientDocument
+from app.domain.models.payment import Payment
+from app.domain.models.prescription import Prescription
+from app.domain.models.refractionexam import RefractionExam
+from app.domain.models.visualacuityexam import VisualAcuityExam
+
+AUDITED_MODELS = frozenset({
+    Patient,
+    Appointment,
+    Consultation,
+    Prescription,
+    Invoice,
+    InvoiceItem,
+    Payment,
+    PatientDocument,
+    ConsentForm,
+    RefractionExam,
+    IOPExam,
+    VisualAcuityExam,
+    PatientEducationTracking,
+    Lead,
+})
+
+# Columnas que cambian en cada escritura sin ser parte del cambio
+IGNORED_COLUMNS = frozenset({"created_at", "updated_at"})
+
+_PENDING = "audit_changes"
+_SYSTEM_COMPONENT = "ChangeCapture"
+
+
+class Change:
+    __slots__ = ("action", "obj", "model", "entity_id", "clinic_id", "old", "new", "transaction")
+
+    def __init__(self, action: str, model, entity_id=None, clinic_id=None, old=None, new=None, obj=None):
+        self.action = action
+        self.model = model
+        self.obj = obj
+        self.entity_id = entity_id
+        self.clinic_id = clinic_id
+        self.old = old
+        self.new = new
+        self.transaction = None
+
+    def row(self, user_id: Optional[int]) -> Dict[str, Any]:
+        entity_id = self.entity_id
+        if entity_id is None and self.obj is not None:
+            # Altas por flush: el id se conoce después del INSERT
+            identity = inspect(self.obj).identity
+            entity_id = identity[0] if identity else None
+        return {
+            "user_id": user_id,
+            "clinic_id": self.clinic_id,
+            "action_type": self.action,
+            "entity_type": self.model.__name__,
+            "entity_id": str(entity_id) if entity_id is not None else None,
+            "old_values": self.old or None,
+            "new_values": self.new or None,
+            "system_component": _SYSTEM_COMPONENT,
+        }
+
+
+def _is_audited(model) -> bool:
+    return settings.AUDIT_CHANGE_CAPTURE_ENABLED and model in AUDITED_MODELS
+
+
+def _literal(value: Any) -> bool:
+    # func.now() y similares no tienen valor hasta ejecutarse
+    return not isinstance(value, ClauseElement)
+
+
+_audited_columns: Dict[Any, frozenset] = {}
+
+
+def _columns(mapper) -> frozenset:
+    """Columnas auditables del modelo (sin IGNORED_COLUMNS), calculadas una vez por mapper."""
+    columns = _audited_columns.get(mapper)
+    if columns is None:
+        columns = _audited_columns[mapper] = frozenset(mapper.column_attrs.keys()) - IGNORED_COLUMNS
+    return columns
+
+
+def _loaded_values(state) -> Dict[str, Any]:
+    """Columnas cargadas del objeto, sin provocar cargas."""
+    columns = _columns(state.mapper)
+    return {
+        key: value for key, value in state.dict.items()
+        if key in columns and value is not None and _literal(value)
+    }
+
+
+def _diff(state):
+    old, new = {}, {}
+    columns = _columns(state.mapper)
+    # committed_state: los atributos modificados desde la carga, con su valor original
+    for key in state.committed_state:
+        if key not in columns:
+            continue
+        history = state.attrs[key].history
+        if not history.has_changes():
+            continue
+        added = history.added[0] if history.added else None
+        if not _literal(added):
+            continue
+        old[key] = history.deleted[0] if history.deleted else None
+        new[key] = added
+    return old, new
+
+
+def _pending(session: Session) -> List[Change]:
+    return session.info.setdefault(_PENDING, [])
+
+
+def record_change(session: Session, change: Optional[Change]) -> None:
+    """Anota el cambio en la transacción (o SAVEPOINT) actual; se entrega al confirmar."""
+    if change is None:
+        return
+    change.transaction = session.get_nested_transaction()
+    _pending(session).append(change)
+
+
+def statement_change(session: Session, model, action: str, obj_id: Any, values: Dict[str, Any]) -> Optional[Change]:
+    """
+    Cambio de un UPDATE por id, antes de ejecutarlo: tras la sentencia el mapa
+    de identidad puede tener ya los valores nuevos. None si el modelo no se
+    audita o no cambia nada.
+    """
+    if not _is_audited(model):
+        return None
+    mapper = inspect(model)
+    columns = _columns(mapper)
+    new = {key: value for key, value in values.items() if key in columns and _literal(value)}
+    loaded = session.identity_map.get(mapper.identity_key_from_primary_key([obj_id]))
+    old = {}
+    clinic_id = values.get("clinic_id")
+    if loaded is not None:
+        current = inspect(loaded).dict
+        # Solo lo que cambia de verdad
+        new = {key: value for key, value in new.items() if key not in current or current[key] != value}
+        old = {key: current[key] for key in new if key in current}
+        clinic_id = clinic_id if clinic_id is not None else current.get("clinic_id")
+    if action == "UPDATE" and not new:
+        return None
+    return Change(action, model, entity_id=obj_id, clinic_id=clinic_id, old=old, new=new)
+
+
+def created_change(model, obj=None, values: Optional[Dict[str, Any]] = None) -> Optional[Change]:
+    """Alta hecha con un INSERT fuera del flush: el objeto devuelto por RETURNING o, sin él, la fila insertada."""
+    if not _is_audited(model):
+        return None
+    if obj is not None:
+        state = inspect(obj)
+        return Change("CREATE", model, entity_id=state.identity[0] if state.identity else None,
+                      clinic_id=state.dict.get("clinic_id"), new=_loaded_values(state))
+    columns = _columns(inspect(model))
+    new = {key: value for key, value in values.items() if key in columns and value is not None and _literal(value)}
+    return Change("CREATE", model, clinic_id=values.get("clinic_id"), new=new)
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_flush(session: Session, flush_context, instances) -> None:
+    if not settings.AUDIT_CHANGE_CAPTURE_ENABLED:
+        return
+    for obj in session.new:
+        if type(obj) in AUDITED_MODELS:
+            state = inspect(obj)
+            record_change(session, Change("CREATE", type(obj), clinic_id=state.dict.get("clinic_id"),
+                                          new=_loaded_values(state), obj=obj))
+    for obj in session.dirty:
+        if type(obj) not in AUDITED_MODELS:
+            continue
+        state = inspect(obj)
+        old, new = _diff(state)
+        if not new:
+            continue
+        # Borrado lógico: deleted_at pasa de vacío a una fecha
+        action = "DELETE" if "deleted_at" in new and old.get("deleted_at") is None and new["deleted_at"] else "UPDATE"
+        record_change(session, Change(action, type(obj), entity_id=state.identity[0] if state.identity else None,
+                                      clinic_id=state.dict.get("clinic_id"), old=old, new=new))
+    for obj in session.deleted:
+        if type(obj) in AUDITED_MODELS:
+            state = inspect(obj)
+            record_change(session, Change("DELETE", type(obj), entity_id=state.identity[0] if state.identity else None,
+                                          clinic_id=state.dict.get("clinic_id"), old=_loaded_values(state)))
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING, None)
+    if not changes:
+        return
+    # Importación diferida: audit_sink usa la ruta de escritura, que usa este módulo
+    from app.data.audit_sink import audit_sink
+
+    user_id = session.info.get("principal_id")
+    for change in changes:
+        audit_sink.submit(change.row(user_id))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction) -> None:
+    changes = session.info.get(_PENDING)
+    if not changes:
+        return
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING, None)
+        return
+
+    def undone(transaction) -> bool:
+        # Cambios del SAVEPOINT deshecho o de otros anidados dentro de él
+        while transaction is not None:
+            if transaction is previous_transaction:
+                return True
+            transaction = transaction.parent
+        return False
+
+    session.info[_PENDING] = [change for change in changes if not undone(change.transaction)]
@@ -0,0 +1,143 @@
+"""
+Filtros opcionales componibles para los listados.
+
+Un FilterSpec declara, por nombre de parámetro, cómo se traduce cada filtro a
+un predicado SQL. `apply` combina en una sola consulta todos los filtros que
+llegan con valor (los None se ignoran):
+
+    APPOINTMENT_FILTERS = FilterSpec(
+        clinic_id=Eq(Appointment.clinic_id),
+        start_date=Gte(Appointment.start_time),
+    )
+    query = APPOINTMENT_FILTERS.apply(query, clinic_id=3, start_date=None)
+"""
+import re
+from enum import Enum
+from typing import Any, Dict
+
+from sqlalchemy import and_, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.types import MatchType
+
+
+def _plain(value: Any) -> Any:
+    # Los Enum de los schemas se comparan por su valor
+    return value.value if isinstance(value, Enum) else value
+
+
+class Eq:
+    def __init__(self, column):
+        self.column = column
+
+    def clause(self, value):
+        return self.column == _plain(value)
+
+
+class Gte:
+    def __init__(self, column):
+        self.column = column
+
+    def clause(self, value):
+        return self.column >= value
+
+
+class Lte:
+    def __init__(self, column):
+        self.column = column
+
+    def clause(self, value):
+        return self.column <= value
+
+
+class Search:
+    """Coincidencia parcial (ILIKE) en cualquiera de las columnas."""
+
+    def __init__(self, *columns):
+        self.columns = columns
+
+    def clause(self, value):
+        pattern = f"%{value}%"
+        return or_(*(column.ilike(pattern) for column in self.columns))
+
+
+class Prefix:
+    """Empieza por el valor: `LIKE 'valor%'`, que se resuelve con un índice sobre la columna."""
+
+    def __init__(self, column):
+        self.column = column
+
+    def clause(self, value):
+        # Patrón literal (no CONCAT) para que el optimizador lo convierta en un rango del índice
+        return self.column.like(escape_like(str(value)) + "%", escape="\\")
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+_FULLTEXT_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class _FullTextMatch(ColumnElement):
+    # El SQL depende de las palabras: sin caché de compilación
+    inherit_cache = False
+    type = MatchType()
+    # Es una condición por sí misma: en MySQL no se compara con 1 en el WHERE
+    _is_implicitly_boolean = True
+
+    def __init__(self, column, words):
+        self.column = column
+        self.words = tuple(words)
+
+
+# innodb_ft_min_token_size: las palabras más cortas no están en el índice
+FULLTEXT_MIN_WORD_LENGTH = 3
+
+
+@compiles(_FullTextMatch, "mysql")
+def _fulltext_mysql(element, compiler, **kw):
+    words = [word for word in element.words if len(word) >= FULLTEXT_MIN_WORD_LENGTH]
+    if not words:
+        return _fulltext_default(element, compiler, **kw)
+    # Modo booleano: todas las palabras obligatorias y como prefijo ("+palabra*")
+    terms = literal(" ".join(f"+{word}*" for word in words))
+    column = compiler.process(element.column, **kw)
+    return f"MATCH ({column}) AGAINST ({compiler.process(terms, **kw)} IN BOOLEAN MODE)"
+
+
+@compiles(_FullTextMatch)
+def _fulltext_default(element, compiler, **kw):
+    # Sin índice FULLTEXT (p. ej. SQLite): coincidencia parcial de cada palabra
+    return compiler.process(and_(*(element.column.ilike(f"%{word}%") for word in element.words)), **kw)
+
+
+class FullText:
+    """
+    Búsqueda por palabras sobre una columna con índice FULLTEXT (MySQL):
+    cada palabra del valor debe aparecer, también como prefijo. En otros
+    motores se traduce a ILIKE.
+    """
+
+    def __init__(self, column):
+        self.column = column
+
+    def clause(self, value):
+        words = _FULLTEXT_WORD.findall(str(value))
+        if not words:
+            return self.column.is_not(None)
+        return _FullTextMatch(self.column, words)
+
+
+class FilterSpec:
+    def __init__(self, **filters):
+        self.filters: Dict[str, Any] = filters
+
+    def apply(self, query, **values):
+        for name, value in values.items():
+            if name not in self.filters:
+                raise ValueError(f"Filtro desconocido: {name}")
+            if value is None or value == "":
+                continue
+            query = query.filter(self.filters[name].clause(value))
+        return query
@@ -0,0 +1,109 @@
+"""
+Paginación por cursor (keyset) compartida por los repositorios.
+
+En lugar de `OFFSET n`, que obliga a la base de datos a recorrer y descartar
+n filas, cada página continúa desde la última fila de la anterior:
+
+    WHERE (created_at, id) > (:ultimo_created_at, :ultimo_id)
+    ORDER BY created_at, id LIMIT :limit
+
+El cursor es opaco para el cliente (base64 de los valores de la última fila).
+Si no se envía `cursor` se mantiene la paginación por `skip`/`limit`.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+class Page:
+    """Una página de resultados y el cursor de la siguiente (None en la última)."""
+
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+class Keyset:
+    """
+    Orden estable para paginar por cursor: una o más columnas de orden y una
+    columna única de desempate al final (normalmente `id`).
+
+        APPOINTMENT_KEYSET = Keyset(Appointment.start_time, Appointment.id)
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def order_by(self):
+        return [column.desc() if self.descending else column.asc() for column in self.columns]
+
+    def after(self, values: List[Any]):
+        """Predicado `(c1, c2, ...) > (v1, v2, ...)` (o `<` si el orden es descendente)."""
+        clauses = []
+        for index, column in enumerate(self.columns):
+            equal = [self.columns[i] == values[i] for i in range(index)]
+            beyond = column < values[index] if self.descending else column > values[index]
+            clauses.append(and_(*equal, beyond))
+        return or_(*clauses)
+
+    def encode(self, row) -> str:
+        """Cursor que continúa tras `row` (objeto ORM o diccionario de columnas)."""
+        values = [_to_json(value) for value in self.values(row)]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def values(self, row) -> tuple:
+        """Valores de orden de `row`, comparables entre sí."""
+        if isinstance(row, dict):
+            return tuple(row[column.key] for column in self.columns)
+        return tuple(getattr(row, column.key) for column in self.columns)
+
+    def decode(self, cursor: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError
+            return [_from_json(column, value) for column, value in zip(self.columns, values)]
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def paginate(query, keyset: Keyset, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """
+    Sin `cursor` devuelve la lista de siempre (`offset`/`limit`). Con `cursor`
+    (vacío para la primera página) devuelve un `Page` ordenado por `keyset`.
+    """
+    if cursor is None:
+        return query.offset(skip).limit(limit).all()
+
+    query = query.order_by(None).order_by(*keyset.order_by())
+    if cursor:
+        query = query.filter(keyset.after(keyset.decode(cursor)))
+    # Se pide una fila de más para saber si existe una página siguiente
+    rows = query.limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = keyset.encode(items[-1]) if len(rows) > limit and items else None
+    return Page(items, next_cursor)
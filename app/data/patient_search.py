@@ -0,0 +1,236 @@
+"""
+Búsqueda de pacientes con un índice invertido propio.
+
+Cada paciente se descompone en tokens que se guardan en
+`patient_search_tokens` con clave primaria (clinic_id, token, patient_id):
+
+- palabras de nombre, apellidos, email e identificador, en minúsculas y sin
+  acentos ("José Núñez" -> "jose", "nunez"); lo que va entre espacios
+  también se guarda sin separadores ("PAC-000123" -> "pac000123",
+  "ana.ruiz@mail.com" -> "anaruizmailcom"), igual que el teléfono
+- prefijos de esas palabras desde 2 caracteres ("nu", "nun", "nune"), con
+  menos peso que la palabra completa
+- para nombre y apellidos, la palabra y sus variantes con una letra menos
+  ("~nunez", "~unez", "~nnez", "~nuez"...): dos palabras a distancia de
+  edición 1 (una letra de más, de menos, cambiada o dos letras traspuestas)
+  comparten alguna variante, así que los errores de escritura se resuelven
+  buscando tokens exactos, igual que las palabras
+
+El término se parte solo por espacios y cada trozo se compacta del mismo
+modo, así que "PAC-000123" busca un único token y no "pac" y "000123".
+Una búsqueda exige que cada palabra del término coincida con el paciente
+(completa, como prefijo o con un error) y ordena por la suma del mejor peso
+de cada palabra. Cada palabra es un rango sobre la clave primaria
+(clinic_id, token) y las palabras se cruzan por patient_id, sin tocar la
+tabla de pacientes.
+
+El índice se actualiza desde PatientRepository en cada alta, modificación y
+borrado, en la misma transacción que la fila del paciente; para
+reconstruirlo: `python -m app.cli.reindex_patients`.
+"""
+import re
+import unicodedata
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, false, func, insert, select, true
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.domain.models.patient_search_token import PatientSearchToken
+
+TOKEN_MAX_LENGTH = 32
+PREFIX_MIN_LENGTH = 2
+WORD_WEIGHT = 4
+PREFIX_WEIGHT = 2
+TYPO_WEIGHT = 1
+TYPO_MARK = "~"
+# Las palabras más cortas no admiten errores: casi cualquier otra estaría a distancia 1
+TYPO_MIN_LENGTH = 4
+# Las palabras con al menos estas coincidencias exactas no se buscan con errores
+COMMON_WORD_MATCHES = 1000
+
+_WORD = re.compile(r"[a-z0-9]+")
+_NOT_ALPHANUMERIC = re.compile(r"[^a-z0-9]")
+
+
+def fold(text: Optional[str]) -> str:
+    """Minúsculas y sin acentos: "Núñez" -> "nunez"."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def words(text: Optional[str]) -> List[str]:
+    return [word[:TOKEN_MAX_LENGTH - 1] for word in _WORD.findall(fold(text))]
+
+
+def compact_chunks(text: Optional[str]) -> List[str]:
+    """Lo que va entre espacios, sin separadores: "García-López ana" -> "garcialopez", "ana"."""
+    chunks = (_NOT_ALPHANUMERIC.sub("", chunk)[:TOKEN_MAX_LENGTH - 1] for chunk in fold(text).split())
+    return [chunk for chunk in chunks if chunk]
+
+
+def typo_variants(word: str) -> List[str]:
+    """La palabra y cada una de sus variantes sin una letra, marcadas para no mezclarse con las palabras."""
+    if len(word) < TYPO_MIN_LENGTH:
+        return []
+    variants = [word] + [word[:i] + word[i + 1:] for i in range(len(word))]
+    return [TYPO_MARK + variant for variant in dict.fromkeys(variants)]
+
+
+def document_tokens(patient: Any) -> Dict[str, int]:
+    """{token: peso} de un paciente; si un token sale de varios campos se queda el mayor peso."""
+    tokens: Dict[str, int] = {}
+
+    def add(token: str, weight: int) -> None:
+        if token and tokens.get(token, 0) < weight:
+            tokens[token] = weight
+
+    def add_word(word: str) -> None:
+        add(word, WORD_WEIGHT)
+        for length in range(PREFIX_MIN_LENGTH, len(word)):
+            add(word[:length], PREFIX_WEIGHT)
+
+    for field in (patient.first_name, patient.last_name, patient.email, patient.patient_identifier):
+        for word in words(field) + compact_chunks(field):
+            add_word(word)
+    for field in (patient.first_name, patient.last_name):
+        for word in words(field):
+            for variant in typo_variants(word):
+                add(variant, TYPO_WEIGHT)
+    phone = "".join(compact_chunks(patient.phone_number))[:TOKEN_MAX_LENGTH]
+    if phone:
+        add(phone, WORD_WEIGHT)
+    return tokens
+
+
+def query_words(term: Optional[str]) -> List[str]:
+    """Trozos distintos del término; los de un carácter no se indexan como prefijo y se descartan."""
+    return list(dict.fromkeys(word for word in compact_chunks(term) if len(word) >= PREFIX_MIN_LENGTH))
+
+
+class PatientSearchIndex:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # --- mantenimiento ---
+
+    def index(self, patients: Sequence[Any], commit: bool = True) -> None:
+        """
+        Reemplaza los tokens de `patients` y confirma (con commit=False, en la
+        transacción en curso); los borrados lógicamente quedan fuera del índice.
+        """
+        if not patients:
+            return
+        self._delete([patient.id for patient in patients])
+        rows = [
+            {"clinic_id": patient.clinic_id, "token": token, "patient_id": patient.id, "weight": weight}
+            for patient in patients
+            if getattr(patient, "deleted_at", None) is None
+            for token, weight in document_tokens(patient).items()
+        ]
+        if rows:
+            # executemany sin RETURNING: un INSERT de varias filas
+            self.db.execute(insert(PatientSearchToken), rows)
+        if commit:
+            self.db.commit()
+
+    def remove(self, patient_ids: Iterable[int], commit: bool = True) -> None:
+        self._delete(list(patient_ids))
+        if commit:
+            self.db.commit()
+
+    def clear(self, clinic_id: Optional[int] = None) -> None:
+        statement = delete(PatientSearchToken)
+        if clinic_id is not None:
+            statement = statement.where(PatientSearchToken.clinic_id == clinic_id)
+        self.db.execute(statement)
+        self.db.commit()
+
+    def _delete(self, patient_ids: List[int]) -> None:
+        for start in range(0, len(patient_ids), 1000):
+            self.db.execute(
+                delete(PatientSearchToken).where(PatientSearchToken.patient_id.in_(patient_ids[start:start + 1000]))
+            )
+
+    # --- consultas ---
+
+    def _matches(self, clinic_id: int, query: List[str], fuzzy: Collection[str] = ()):
+        """SELECT (patient_id, score) de los pacientes que coinciden con todas las palabras de `query`."""
+        froms, columns, conditions = [], [], []
+        for word in query:
+            if word in fuzzy:
+                # Palabra y variantes: el mejor peso de cada paciente
+                match = (
+                    select(PatientSearchToken.patient_id, func.max(PatientSearchToken.weight).label("weight"))
+                    .where(
+                        PatientSearchToken.clinic_id == clinic_id,
+                        PatientSearchToken.token.in_([word] + typo_variants(word)),
+                    )
+                    .group_by(PatientSearchToken.patient_id)
+                    .subquery()
+                )
+                froms.append(match)
+                columns.append(match.c)
+                conditions.append(true())
+            else:
+                # Un solo token, como mucho una fila por paciente: búsquedas por clave primaria
+                match = aliased(PatientSearchToken)
+                froms.append(match)
+                columns.append(match)
+                conditions.append((match.clinic_id == clinic_id) & (match.token == word))
+
+        first = columns[0]
+        score = sum((column.weight for column in columns[1:]), first.weight).label("score")
+        statement = select(first.patient_id, score).select_from(froms[0]).where(conditions[0])
+        for match, column, condition in zip(froms[1:], columns[1:], conditions[1:]):
+            statement = statement.join(match, (column.patient_id == first.patient_id) & condition)
+        return statement
+
+    def _ranked(self, clinic_id: int, query: List[str], fuzzy: Collection[str], skip: int, limit: int) -> List[Tuple[int, int]]:
+        statement = self._matches(clinic_id, query, fuzzy)
+        columns = statement.selected_columns
+        statement = statement.order_by(columns.score.desc(), columns.patient_id).offset(skip).limit(limit)
+        return [(row.patient_id, int(row.score)) for row in self.db.execute(statement)]
+
+    def _frequencies(self, clinic_id: int, query: List[str]) -> Dict[str, int]:
+        statement = (
+            select(PatientSearchToken.token, func.count())
+            .where(PatientSearchToken.clinic_id == clinic_id, PatientSearchToken.token.in_(query))
+            .group_by(PatientSearchToken.token)
+        )
+        return dict(self.db.execute(statement).all())
+
+    def matching_ids(self, clinic_id: int, term: str):
+        """Subconsulta con los pacientes de la clínica que contienen todas las palabras del término (sin errores)."""
+        query = query_words(term)
+        if not query:
+            return select(PatientSearchToken.patient_id).where(false())
+        return select(self._matches(clinic_id, query).subquery().c.patient_id)
+
+    def search(self, clinic_id: int, term: str, skip: int = 0, limit: int = 20) -> List[Tuple[int, int]]:
+        """
+        (patient_id, puntuación) ordenados por relevancia. Solo se alcanzan los
+        primeros PATIENT_SEARCH_MAX_RESULTS resultados.
+
+        Primero sin errores de escritura, que es lo barato. Si no se llena la
+        página se repite admitiéndolos, pero solo en las palabras con pocas
+        coincidencias exactas: una palabra frecuente en la clínica está bien
+        escrita y expandirla solo multiplicaría las filas a agrupar.
+        """
+        query = query_words(term)
+        window = min(skip + limit, settings.PATIENT_SEARCH_MAX_RESULTS)
+        if not query or window <= skip:
+            return []
+        ranked = self._ranked(clinic_id, query, (), skip, window - skip)
+        if len(ranked) == window - skip:
+            return ranked
+        frequencies = self._frequencies(clinic_id, query)
+        fuzzy = {
+            word for word in query
+            if len(word) >= TYPO_MIN_LENGTH and frequencies.get(word, 0) < COMMON_WORD_MATCHES
+        }
+        if not fuzzy:
+            return ranked
+        return self._ranked(clinic_id, query, fuzzy, skip, window - skip)
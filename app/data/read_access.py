@@ -0,0 +1,243 @@
+"""
+Registro de accesos de lectura a datos de pacientes.
+
+Los endpoints de lectura (ficha del paciente, documentos, consultas y
+exámenes) anotan quién leyó qué paciente. Un registro de auditoría por
+lectura saturaría la base de datos, así que las lecturas se agregan en
+memoria por (usuario, paciente, tipo de entidad, minuto) y cada
+READ_ACCESS_FLUSH_SECONDS los minutos ya cerrados se entregan a `audit_sink`
+como un registro por grupo:
+
+- action_type "READ", entity_type el tipo leído ("Consultation", ...)
+- entity_id: el id del paciente cuyos datos se leyeron
+- created_at: el comienzo del minuto
+- related_records: {"reads": lecturas anotadas, "estimated_reads": lecturas
+  estimadas con el muestreo, "endpoints": {endpoint: lecturas}}
+
+Cada endpoint puede muestrearse (READ_ACCESS_SAMPLE_RATES, p. ej.
+{"consultations.list": 0.1}); una lectura anotada con tasa 0.1 cuenta como
+10 lecturas estimadas. Por defecto se anotan todas.
+
+    record_reads(current_user, "consultations.get", "Consultation", [consultation])
+    record_reads(current_user, "iop_exams.get", "IOPExam", [exam], owner=consultation_owner)
+
+Las exportaciones en streaming anotan cada fila al entregarla:
+
+    rows = record_streamed_reads(current_user, "patients.export", "Patient", rows, owner=patient_row_owner)
+"""
+import logging
+import random
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+READ_ACTION = "READ"
+
+# (usuario, clínica, paciente, tipo de entidad, minuto)
+_Key = Tuple[Optional[int], Optional[int], int, str, datetime]
+
+
+class _Reads:
+    __slots__ = ("reads", "estimated", "endpoints")
+
+    def __init__(self):
+        self.reads = 0
+        self.estimated = 0.0
+        self.endpoints: Dict[str, int] = {}
+
+
+class ReadAccessRecorder:
+    def __init__(self, flush_interval: Optional[float] = None, max_keys: Optional[int] = None):
+        self.flush_interval = flush_interval if flush_interval is not None else settings.READ_ACCESS_FLUSH_SECONDS
+        self.max_keys = max_keys or settings.READ_ACCESS_MAX_KEYS
+        self._lock = threading.Lock()
+        self._groups: Dict[_Key, _Reads] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.skipped = 0
+        self.flushed_rows = 0
+
+    def sample_rate(self, endpoint: str) -> float:
+        return settings.READ_ACCESS_SAMPLE_RATES.get(endpoint, settings.READ_ACCESS_DEFAULT_SAMPLE_RATE)
+
+    def record(self, user_id: Optional[int], clinic_id: Optional[int], patient_id: int, entity_type: str, endpoint: str) -> bool:
+        """Anota una lectura si sale en el muestreo del endpoint; no toca la base de datos."""
+        rate = self.sample_rate(endpoint)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            with self._lock:
+                self.skipped += 1
+            return False
+        self.start()
+        key = (user_id, clinic_id, patient_id, entity_type, _minute(datetime.now()))
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Reads()
+            group.reads += 1
+            group.estimated += 1 / rate
+            group.endpoints[endpoint] = group.endpoints.get(endpoint, 0) + 1
+            self.recorded += 1
+            crowded = len(self._groups) >= self.max_keys
+        if crowded:
+            # Demasiados grupos en memoria: el hilo vacía ya, sin esperar al intervalo
+            self._wake.set()
+        return True
+
+    # --- volcado ---
+
+    def flush(self, everything: bool = False) -> int:
+        """
+        Entrega a audit_sink los grupos de minutos ya cerrados (todos con
+        `everything` o si hay demasiados) y devuelve cuántos registros generó.
+        """
+        current = _minute(datetime.now())
+        with self._lock:
+            if everything or len(self._groups) >= self.max_keys:
+                groups, self._groups = self._groups, {}
+            else:
+                closed = [key for key in self._groups if key[4] < current]
+                groups = {key: self._groups.pop(key) for key in closed}
+        if not groups:
+            return 0
+        # Importación diferida: audit_sink carga la ruta de escritura y los modelos
+        from app.data.audit_sink import audit_sink
+
+        for (user_id, clinic_id, patient_id, entity_type, minute), group in groups.items():
+            audit_sink.submit({
+                "user_id": user_id,
+                "clinic_id": clinic_id,
+                "action_type": READ_ACTION,
+                "entity_type": entity_type,
+                "entity_id": str(patient_id),
+                "created_at": minute,
+                "details": f"{group.reads} lecturas",
+                "severity": "Low",
+                "related_records": {
+                    "reads": group.reads,
+                    "estimated_reads": round(group.estimated),
+                    "endpoints": group.endpoints,
+                },
+                "system_component": "ReadAccess",
+            })
+        with self._lock:
+            self.flushed_rows += len(groups)
+        return len(groups)
+
+    # --- ciclo de vida ---
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="read-access", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo y entrega todo lo pendiente, también el minuto en curso."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._stopping.set()
+            self._wake.set()
+            thread.join()
+        self.flush(everything=True)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "pending_groups": len(self._groups),
+                "recorded": self.recorded,
+                "skipped": self.skipped,
+                "flushed_rows": self.flushed_rows,
+            }
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("No se pudieron volcar los accesos de lectura")
+
+
+def _minute(moment: datetime) -> datetime:
+    return moment.replace(second=0, microsecond=0)
+
+
+read_access = ReadAccessRecorder()
+
+
+def _own_patient(obj: Any) -> Tuple[Optional[int], Optional[int]]:
+    return getattr(obj, "patient_id", None), getattr(obj, "clinic_id", None)
+
+
+def record_reads(
+    user: Any,
+    endpoint: str,
+    entity_type: str,
+    objects: Iterable[Any],
+    owner: Callable[[Any], Tuple[Optional[int], Optional[int]]] = _own_patient,
+) -> None:
+    """
+    Anota la lectura de `objects` por `user`, una por paciente distinto.
+    `owner` da (patient_id, clinic_id) de cada objeto a partir de datos ya
+    cargados (p. ej. la consulta de un examen): anotar no hace consultas.
+    """
+    if not settings.READ_ACCESS_LOG_ENABLED:
+        return
+    seen = set()
+    for obj in objects:
+        if obj is None:
+            continue
+        patient_id, clinic_id = owner(obj)
+        if patient_id is None or patient_id in seen:
+            continue
+        seen.add(patient_id)
+        read_access.record(getattr(user, "id", None), clinic_id, patient_id, entity_type, endpoint)
+
+
+def record_streamed_reads(
+    user: Any,
+    endpoint: str,
+    entity_type: str,
+    rows: Iterable[Any],
+    owner: Callable[[Any], Tuple[Optional[int], Optional[int]]] = _own_patient,
+) -> Iterator[Any]:
+    """Como `record_reads`, pero perezoso: anota cada fila cuando se entrega, sin cargar el resultado."""
+    if not settings.READ_ACCESS_LOG_ENABLED:
+        yield from rows
+        return
+    user_id = getattr(user, "id", None)
+    seen = set()
+    for row in rows:
+        patient_id, clinic_id = owner(row)
+        if patient_id is not None and patient_id not in seen:
+            seen.add(patient_id)
+            read_access.record(user_id, clinic_id, patient_id, entity_type, endpoint)
+        yield row
+
+
+def patient_owner(patient: Any) -> Tuple[Optional[int], Optional[int]]:
+    return patient.id, patient.clinic_id
+
+
+def patient_row_owner(row: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    """Paciente y clínica de una fila exportada (diccionario de columnas)."""
+    return row["id"], row["clinic_id"]
+
+
+def consultation_owner(exam: Any) -> Tuple[Optional[int], Optional[int]]:
+    """Paciente y clínica de un examen, desde su consulta (cargada con el plan de lectura)."""
+    consultation = exam.consultation
+    return (consultation.patient_id, consultation.clinic_id) if consultation is not None else (None, None)
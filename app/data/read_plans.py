@@ -0,0 +1,74 @@
+"""
+Planes de lectura (read plans) para los repositorios.
+
+Cada schema de respuesta declara, a través de sus campos anidados, el grafo de
+relaciones que se serializa. Un ReadPlan traduce ese grafo a opciones de carga
+anticipada de SQLAlchemy para que un listado ejecute un número constante de
+consultas sin importar el tamaño de la página.
+"""
+import typing
+from typing import List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def _nested_schema(annotation) -> Optional[Type[BaseModel]]:
+    """Devuelve el schema anidado de un campo (Optional[X], List[X], X) o None."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _build_options(model, schema: Type[BaseModel], parent=None) -> List:
+    relationships = inspect(model).relationships
+    options = []
+    for field_name, field in schema.model_fields.items():
+        if field_name not in relationships:
+            continue
+        nested = _nested_schema(field.annotation)
+        if nested is None:
+            continue
+        relationship = relationships[field_name]
+        attribute = getattr(model, field_name)
+        # Colecciones: selectinload evita multiplicar filas; muchos-a-uno: joinedload
+        if relationship.uselist:
+            loader = parent.selectinload(attribute) if parent is not None else selectinload(attribute)
+        else:
+            loader = parent.joinedload(attribute) if parent is not None else joinedload(attribute)
+        nested_options = _build_options(relationship.mapper.class_, nested, loader)
+        options.extend(nested_options or [loader])
+    return options
+
+
+class ReadPlan:
+    """
+    Opciones de carga para serializar `model` con `schema`.
+
+    Las opciones se calculan la primera vez que se usan (cuando todos los
+    mappers ya están configurados) y se reutilizan en cada consulta:
+
+        query.options(*APPOINTMENT_READ_PLAN)
+    """
+
+    def __init__(self, model, schema: Type[BaseModel]):
+        self.model = model
+        self.schema = schema
+        self._options = None
+
+    @property
+    def options(self) -> List:
+        if self._options is None:
+            self._options = _build_options(self.model, self.schema)
+        return self._options
+
+    def __iter__(self):
+        return iter(self.options)
+
+    def __repr__(self):
+        return f"<ReadPlan({self.model.__name__} -> {self.schema.__name__})>"
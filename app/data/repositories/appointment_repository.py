@@ -1,76 +1,118 @@
-from sqlalchemy.orm import Session
 from app.domain import schemas
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
 
 from app.domain.models import Appointment
+from app.data.read_plans import ReadPlan
+from app.data.pagination import Keyset, paginate
+from app.data.filters import Eq, FilterSpec, Gte, Lte
+from app.data.repositories.base_repository import BaseRepository
+
+APPOINTMENT_READ_PLAN = ReadPlan(Appointment, schemas.AppointmentResponse)
+APPOINTMENT_KEYSET = Keyset(Appointment.start_time, Appointment.id)
+APPOINTMENT_FILTERS = FilterSpec(
+    clinic_id=Eq(Appointment.clinic_id),
+    patient_id=Eq(Appointment.patient_id),
+    doctor_id=Eq(Appointment.primary_doctor_id),
+    status=Eq(Appointment.status),
+    start_date=Gte(Appointment.start_time),
+    end_date=Lte(Appointment.start_time),
+)
+# Estados que no ocupan la agenda
+NON_BLOCKING_STATUSES = ("Cancelled", "NoShow")
+# Cota de duración de una cita: acota por abajo el rango de start_time para usar los índices
+LONGEST_APPOINTMENT = timedelta(days=1)
+
+class AppointmentRepository(BaseRepository[Appointment]):
+    model = Appointment
+    read_plan = APPOINTMENT_READ_PLAN
 
-class AppointmentRepository:
-    def __init__(self, db: Session):
-        self.db = db
+    def _query(self):
+        return self.db.query(Appointment).options(*APPOINTMENT_READ_PLAN)
     
     def create(self, appointment: schemas.AppointmentCreate) -> Appointment:
         db_appointment = Appointment(**appointment.dict())
-        self.db.add(db_appointment)
-        self.db.commit()
-        self.db.refresh(db_appointment)
-        return db_appointment
+        return self._insert(db_appointment)
 
-    def get_by_id(self, appointment_id: int) -> Optional[Appointment]:
-        return self.db.query(Appointment).filter(Appointment.id == appointment_id, Appointment.deleted_at == None).first()
+    def create_many(self, rows: List[dict], chunk_size: int) -> List:
+        return self._insert_many(rows, chunk_size)
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Appointment]:
-        return self.db.query(Appointment).filter(Appointment.deleted_at == None).offset(skip).limit(limit).all()
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Appointment]:
+        return paginate(self._query(), APPOINTMENT_KEYSET, skip, limit, cursor)
+
+    def find(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters) -> List[Appointment]:
+        """Listado con todos los filtros de APPOINTMENT_FILTERS que lleguen con valor, en orden estable."""
+        query = APPOINTMENT_FILTERS.apply(self._query(), **filters)
+        return paginate(query.order_by(*APPOINTMENT_KEYSET.order_by()), APPOINTMENT_KEYSET, skip, limit, cursor)
 
     def update(self, appointment_id: int, appointment: schemas.AppointmentUpdate) -> Optional[Appointment]:
-        db_appointment = self.get_by_id(appointment_id)
-        if db_appointment:
-            for key, value in appointment.dict(exclude_unset=True).items():
-                setattr(db_appointment, key, value)
-            self.db.commit()
-            self.db.refresh(db_appointment)
-        return db_appointment
+        return self._update(appointment_id, appointment.dict(exclude_unset=True))
 
     def delete(self, appointment_id: int) -> bool:
-        db_appointment = self.get_by_id(appointment_id)
-        if db_appointment:
-            db_appointment.deleted_at = datetime.now()
-            self.db.commit()
-            self.db.refresh(db_appointment)
-            return True
-        return False
-
-    def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[Appointment]:
-        return self.db.query(Appointment).filter(
-            Appointment.patient_id == patient_id,
-            Appointment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-
-    def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[Appointment]:
-        return self.db.query(Appointment).filter(
-            Appointment.clinic_id == clinic_id,
-            Appointment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-
-    def get_by_doctor_id(self, doctor_id: int, skip: int = 0, limit: int = 100) -> List[Appointment]:
-        return self.db.query(Appointment).filter(
-            Appointment.primary_doctor_id == doctor_id,
-            Appointment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-
-    def get_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Appointment]:
-        return self.db.query(Appointment).filter(
-            Appointment.status == status,
-            Appointment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-
-    def get_by_date_range(self, start_date: datetime, end_date: datetime, skip: int = 0, limit: int = 100) -> List[Appointment]:
-        query = self.db.query(Appointment).filter(Appointment.deleted_at == None)
+        return self._soft_delete(appointment_id, deleted_at=datetime.now())
+
+    def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Appointment]:
+        return paginate(
+            self._query().filter(
+                Appointment.patient_id == patient_id
+            ),
+            APPOINTMENT_KEYSET, skip, limit, cursor
+        )
+
+    def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Appointment]:
+        return paginate(
+            self._query().filter(
+                Appointment.clinic_id == clinic_id
+            ),
+            APPOINTMENT_KEYSET, skip, limit, cursor
+        )
+
+    def get_by_doctor_id(self, doctor_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Appointment]:
+        return paginate(
+            self._query().filter(
+                Appointment.primary_doctor_id == doctor_id
+            ),
+            APPOINTMENT_KEYSET, skip, limit, cursor
+        )
+
+    def get_by_status(self, status: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Appointment]:
+        return paginate(
+            self._query().filter(
+                Appointment.status == status
+            ),
+            APPOINTMENT_KEYSET, skip, limit, cursor
+        )
+
+    def get_by_date_range(self, start_date: datetime, end_date: datetime, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Appointment]:
+        query = self._query()
         
         if start_date:
-            query = query.filter(Appointment.appointment_date >= start_date)
+            query = query.filter(Appointment.start_time >= start_date)
         
         if end_date:
-            query = query.filter(Appointment.appointment_date <= end_date)
+            query = query.filter(Appointment.start_time <= end_date)
             
-        return query.offset(skip).limit(limit).all()
+        return paginate(query, APPOINTMENT_KEYSET, skip, limit, cursor)
+
+    def get_busy_intervals(self, start: datetime, end: datetime, doctor_ids: Optional[List[int]] = None,
+                           clinic_id: Optional[int] = None) -> List[Tuple[Optional[int], Optional[int], datetime, datetime]]:
+        """
+        (primary_doctor_id, resource_id, start_time, end_time) de las citas que
+        ocupan algún momento de [start, end): las de `doctor_ids` (en cualquier
+        clínica) o las de `clinic_id` con recurso asignado.
+        """
+        statement = select(
+            Appointment.primary_doctor_id, Appointment.resource_id, Appointment.start_time, Appointment.end_time
+        ).where(
+            Appointment.start_time > start - LONGEST_APPOINTMENT,
+            Appointment.start_time < end,
+            Appointment.end_time > start,
+            Appointment.status.not_in(NON_BLOCKING_STATUSES),
+        )
+        if doctor_ids is not None:
+            statement = statement.where(Appointment.primary_doctor_id.in_(doctor_ids))
+        else:
+            statement = statement.where(Appointment.clinic_id == clinic_id, Appointment.resource_id.is_not(None))
+        return [tuple(row) for row in self.db.execute(statement)]
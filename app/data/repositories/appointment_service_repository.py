@@ -1,39 +1,31 @@
-from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.domain import schemas
 from typing import List, Optional
 
 from app.domain.models import AppointmentService
+from app.data.repositories.base_repository import BaseRepository
+
+class AppointmentServiceRepository(BaseRepository[AppointmentService]):
+    model = AppointmentService
 
-class AppointmentServiceRepository:
-    def __init__(self, db: Session):
-        self.db = db    
-    
     def create(self, appointment_service: schemas.AppointmentServiceCreate) -> AppointmentService:
         data = appointment_service.model_dump(exclude_unset=True)
         db_appointment_service = AppointmentService(**data)
         db_appointment_service.created_at = func.now()
         db_appointment_service.updated_at = func.now()
-        self.db.add(db_appointment_service)
-        self.db.commit()
-        self.db.refresh(db_appointment_service)
-        return db_appointment_service
+        return self._insert(db_appointment_service)
 
     def get_by_ids(self, appointment_id: int, service_id: int) -> Optional[AppointmentService]:
-        return self.db.query(AppointmentService).filter(
-            AppointmentService.appointment_id == appointment_id,
-            AppointmentService.service_id == service_id
-        ).first()
+        return self._get_one_by(
+            (AppointmentService.appointment_id, appointment_id),
+            (AppointmentService.service_id, service_id)
+        )
 
     def get_by_appointment_id(self, appointment_id: int) -> List[AppointmentService]:
-        return self.db.query(AppointmentService).filter(
-            AppointmentService.appointment_id == appointment_id
-        ).all()
+        return self._get_many_by(AppointmentService.appointment_id, appointment_id)
 
     def get_by_service_id(self, service_id: int) -> List[AppointmentService]:
-        return self.db.query(AppointmentService).filter(
-            AppointmentService.service_id == service_id
-        ).all()
+        return self._get_many_by(AppointmentService.service_id, service_id)
 
     def delete(self, appointment_id: int, service_id: int) -> bool:
         db_appointment_service = self.get_by_ids(appointment_id, service_id)
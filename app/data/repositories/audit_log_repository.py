@@ -5,6 +5,23 @@ from datetime import datetime
 
 from app.domain.models.auditlog import AuditLog
 from app.domain import schemas
+from app.data.write_path import insert_one, update_by_id
+from app.data.pagination import Keyset, paginate
+from app.data.filters import Eq, FilterSpec, Gte, Lte
+
+# Más recientes primero; `id` desempata registros del mismo instante
+AUDIT_LOG_KEYSET = Keyset(AuditLog.created_at, AuditLog.id, descending=True)
+AUDIT_LOG_FILTERS = FilterSpec(
+    clinic_id=Eq(AuditLog.clinic_id),
+    user_id=Eq(AuditLog.user_id),
+    severity=Eq(AuditLog.severity),
+    action_type=Eq(AuditLog.action_type),
+    entity_type=Eq(AuditLog.entity_type),
+    entity_id=Eq(AuditLog.entity_id),
+    is_reviewed=Eq(AuditLog.is_reviewed),
+    start_date=Gte(AuditLog.created_at),
+    end_date=Lte(AuditLog.created_at),
+)
 
 class AuditLogRepository:
     def __init__(self, db: Session):
@@ -12,28 +29,37 @@ class AuditLogRepository:
 
     def create(self, audit_log: schemas.AuditLogCreate) -> AuditLog:
         db_audit_log = AuditLog(**audit_log.model_dump())
-        self.db.add(db_audit_log)
-        self.db.commit()
-        self.db.refresh(db_audit_log)
-        return db_audit_log
+        return insert_one(self.db, db_audit_log)
 
     def get_by_id(self, audit_log_id: int) -> Optional[AuditLog]:
         return self.db.query(AuditLog).filter(AuditLog.id == audit_log_id).first()
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[AuditLog]:
-        return self.db.query(AuditLog).order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[AuditLog]:
+        # Orden completo (created_at, id): lo resuelve ix_auditlogs_created_at sin ordenar la tabla
+        return self.find(skip, limit, cursor)
 
-    def get_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[AuditLog]:
-        return self.db.query(AuditLog)\
-            .filter(AuditLog.clinic_id == clinic_id)\
-            .order_by(AuditLog.created_at.desc())\
-            .offset(skip).limit(limit).all()
+    def find(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters) -> List[AuditLog]:
+        query = AUDIT_LOG_FILTERS.apply(self.db.query(AuditLog), **filters)
+        return paginate(query.order_by(*AUDIT_LOG_KEYSET.order_by()), AUDIT_LOG_KEYSET, skip, limit, cursor)
 
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[AuditLog]:
-        return self.db.query(AuditLog)\
-            .filter(AuditLog.user_id == user_id)\
-            .order_by(AuditLog.created_at.desc())\
-            .offset(skip).limit(limit).all()
+    def count(self, **filters) -> int:
+        return AUDIT_LOG_FILTERS.apply(self.db.query(AuditLog), **filters).count()
+
+    def get_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[AuditLog]:
+        return paginate(
+            self.db.query(AuditLog)
+            .filter(AuditLog.clinic_id == clinic_id)
+            .order_by(AuditLog.created_at.desc()),
+            AUDIT_LOG_KEYSET, skip, limit, cursor
+        )
+
+    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[AuditLog]:
+        return paginate(
+            self.db.query(AuditLog)
+            .filter(AuditLog.user_id == user_id)
+            .order_by(AuditLog.created_at.desc()),
+            AUDIT_LOG_KEYSET, skip, limit, cursor
+        )
 
     def get_by_entity(self, entity_type: str, entity_id: str) -> List[AuditLog]:
         return self.db.query(AuditLog)\
@@ -44,42 +70,40 @@ class AuditLogRepository:
             .order_by(AuditLog.created_at.desc())\
             .all()
 
-    def get_unreviewed(self, skip: int = 0, limit: int = 100) -> List[AuditLog]:
-        return self.db.query(AuditLog)\
-            .filter(AuditLog.is_reviewed == False)\
-            .order_by(AuditLog.created_at.desc())\
-            .offset(skip).limit(limit).all()
+    def get_unreviewed(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[AuditLog]:
+        return paginate(
+            self.db.query(AuditLog)
+            .filter(AuditLog.is_reviewed == False)
+            .order_by(AuditLog.created_at.desc()),
+            AUDIT_LOG_KEYSET, skip, limit, cursor
+        )
 
     def update(self, audit_log_id: int, audit_log: schemas.AuditLogUpdate, reviewed_by_user_id: Optional[int] = None) -> Optional[AuditLog]:
-        db_audit_log = self.get_by_id(audit_log_id)
-        if db_audit_log:
-            update_data = audit_log.model_dump(exclude_unset=True)
-            
-            # Si se está marcando como revisado, actualizar campos relacionados
-            if update_data.get('is_reviewed') == True:
-                update_data['reviewed_at'] = datetime.now()
-                if reviewed_by_user_id:
-                    update_data['reviewed_by_user_id'] = reviewed_by_user_id
-
-            for key, value in update_data.items():
-                setattr(db_audit_log, key, value)
-            
-            self.db.commit()
-            self.db.refresh(db_audit_log)
-            return db_audit_log
-        return None
-
-    def get_by_severity(self, severity: str, skip: int = 0, limit: int = 100) -> List[AuditLog]:
-        return self.db.query(AuditLog)\
-            .filter(AuditLog.severity == severity)\
-            .order_by(AuditLog.created_at.desc())\
-            .offset(skip).limit(limit).all()
+        update_data = audit_log.model_dump(exclude_unset=True)
 
-    def get_by_date_range(self, start_date: datetime, end_date: datetime, skip: int = 0, limit: int = 100) -> List[AuditLog]:
-        return self.db.query(AuditLog)\
+        # Si se está marcando como revisado, actualizar campos relacionados
+        if update_data.get('is_reviewed') == True:
+            update_data['reviewed_at'] = datetime.now()
+            if reviewed_by_user_id:
+                update_data['reviewed_by_user_id'] = reviewed_by_user_id
+
+        return update_by_id(self.db, AuditLog, audit_log_id, update_data)
+
+    def get_by_severity(self, severity: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[AuditLog]:
+        return paginate(
+            self.db.query(AuditLog)
+            .filter(AuditLog.severity == severity)
+            .order_by(AuditLog.created_at.desc()),
+            AUDIT_LOG_KEYSET, skip, limit, cursor
+        )
+
+    def get_by_date_range(self, start_date: datetime, end_date: datetime, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[AuditLog]:
+        return paginate(
+            self.db.query(AuditLog)
             .filter(
                 AuditLog.created_at >= start_date,
                 AuditLog.created_at <= end_date
-            )\
-            .order_by(AuditLog.created_at.desc())\
-            .offset(skip).limit(limit).all()
+            )
+            .order_by(AuditLog.created_at.desc()),
+            AUDIT_LOG_KEYSET, skip, limit, cursor
+        )
@@ -0,0 +1,130 @@
+"""
+Repositorio base genérico.
+
+Las consultas de cada entidad se construyen una sola vez con `select()` y
+parámetros con nombre (`bindparam`) y se guardan por clase. En cada llamada
+solo se ejecuta la sentencia ya construida: no se vuelve a armar la consulta
+ni a calcular su clave de caché, y SQLAlchemy reutiliza el SQL compilado.
+
+    class IOPExamRepository(BaseRepository[IOPExam]):
+        model = IOPExam
+        read_plan = IOPEXAM_READ_PLAN
+
+        def get_by_consultation_id(self, consultation_id, skip=0, limit=100):
+            return self._get_many_by(IOPExam.consultation_id, consultation_id, skip, limit)
+
+Los listados con filtros opcionales declaran un `FilterSpec` en `filters` y
+usan `find()`.
+
+Las filas borradas lógicamente se excluyen en la sesión (app.core.soft_delete).
+"""
+from typing import Any, Callable, ClassVar, Dict, Generic, Iterable, List, Optional, Type, TypeVar
+
+from sqlalchemy import bindparam, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.soft_delete import exclude_deleted
+from app.data.filters import FilterSpec
+from app.data.write_path import insert_chunked, insert_one, soft_delete_by_id, update_by_id
+
+ModelT = TypeVar("ModelT")
+
+
+class BaseRepository(Generic[ModelT]):
+    model: ClassVar[Type[Any]]
+    # Opciones de carga (normalmente un ReadPlan); se evalúan al construir la sentencia
+    read_plan: ClassVar[Iterable] = ()
+    filters: ClassVar[Optional[FilterSpec]] = None
+
+    _statements: ClassVar[Dict[Any, Any]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._statements = {}
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # --- sentencias en caché ---
+
+    @classmethod
+    def _statement(cls, key: Any, build: Callable[[], Any]):
+        statement = cls._statements.get(key)
+        if statement is None:
+            statement = cls._statements[key] = build()
+        return statement
+
+    @classmethod
+    def _select(cls):
+        return exclude_deleted(select(cls.model).options(*cls.read_plan))
+
+    @classmethod
+    def _by_columns(cls, columns, paged: bool):
+        def build():
+            statement = cls._select().where(
+                *(column == bindparam(column.key) for column in columns)
+            )
+            if paged:
+                statement = statement.offset(bindparam("skip")).limit(bindparam("limit"))
+            return statement
+        return cls._statement((tuple(column.key for column in columns), paged), build)
+
+    def _scalars(self, statement, params: Dict[str, Any]):
+        # unique(): los joinedload de colecciones repiten la entidad principal
+        return self.db.execute(statement, params).unique().scalars()
+
+    # --- lecturas ---
+
+    def get_by_id(self, obj_id: Any) -> Optional[ModelT]:
+        primary_key = inspect(self.model).primary_key[0]
+        statement = self._by_columns((primary_key,), paged=False)
+        return self._scalars(statement, {primary_key.key: obj_id}).first()
+
+    def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelT]:
+        statement = self._statement(
+            "all", lambda: self._select().offset(bindparam("skip")).limit(bindparam("limit"))
+        )
+        return self._scalars(statement, {"skip": skip, "limit": limit}).all()
+
+    def find(self, skip: int = 0, limit: int = 100, **filters) -> List[ModelT]:
+        """Listado con todos los filtros de `filters` que lleguen con valor, ordenado por clave primaria."""
+        statement = self.filters.apply(self._select(), **filters) if self.filters else self._select()
+        statement = statement.order_by(*inspect(self.model).primary_key).offset(skip).limit(limit)
+        return self._scalars(statement, {}).all()
+
+    def _get_one_by(self, *criteria) -> Optional[ModelT]:
+        """Primera fila donde cada columna es igual al valor: `_get_one_by((Model.email, email))`."""
+        columns = tuple(column for column, _ in criteria)
+        params = {column.key: value for column, value in criteria}
+        return self._scalars(self._by_columns(columns, paged=False), params).first()
+
+    def _get_many_by(self, column, value: Any, skip: Optional[int] = None, limit: Optional[int] = None) -> List[ModelT]:
+        """Filas con `column == value`; sin `skip`/`limit` devuelve todas."""
+        if skip is None and limit is None:
+            return self._scalars(self._by_columns((column,), paged=False), {column.key: value}).all()
+        params = {column.key: value, "skip": skip or 0, "limit": 100 if limit is None else limit}
+        return self._scalars(self._by_columns((column,), paged=True), params).all()
+
+    # --- escrituras ---
+
+    def _insert(self, obj: ModelT, commit: bool = True) -> ModelT:
+        return insert_one(self.db, obj, commit=commit)
+
+    def _insert_many(self, rows: List[Dict[str, Any]], chunk_size: int,
+                     before_commit: Optional[Callable[[List[ModelT]], None]] = None) -> List[Any]:
+        """Alta masiva por bloques; por cada fila, el objeto creado o el mensaje de error."""
+        return insert_chunked(self.db, self.model, rows, chunk_size, before_commit=before_commit)
+
+    def _update(self, obj_id: Any, values: Dict[str, Any], commit: bool = True) -> Optional[ModelT]:
+        return update_by_id(self.db, self.model, obj_id, values, commit=commit)
+
+    def _soft_delete(self, obj_id: Any, deleted_at: Any, commit: bool = True, **values: Any) -> bool:
+        return soft_delete_by_id(self.db, self.model, obj_id, deleted_at=deleted_at, commit=commit, **values)
+
+    def _hard_delete(self, obj_id: Any) -> bool:
+        db_obj = self.get_by_id(obj_id)
+        if db_obj:
+            self.db.delete(db_obj)
+            self.db.commit()
+            return True
+        return False
@@ -4,6 +4,7 @@ from datetime import datetime
 from sqlalchemy import or_
 from app.domain.models.consentform import ConsentForm
 from app.domain.schemas import ConsentFormCreate, ConsentFormUpdate
+from app.data.write_path import insert_one, update_by_id, soft_delete_by_id
 
 class ConsentFormRepository:
     def __init__(self, db: Session):
@@ -14,15 +15,11 @@ class ConsentFormRepository:
             **consent_form.dict(),
             created_by_user_id=created_by_user_id
         )
-        self.db.add(db_consent_form)
-        self.db.commit()
-        self.db.refresh(db_consent_form)
-        return db_consent_form
+        return insert_one(self.db, db_consent_form)
 
     def get_by_id(self, consent_form_id: int) -> Optional[ConsentForm]:
         return self.db.query(ConsentForm).filter(
-            ConsentForm.id == consent_form_id,
-            ConsentForm.deleted_at.is_(None)
+            ConsentForm.id == consent_form_id
         ).first()
 
     def get_all(
@@ -35,7 +32,7 @@ class ConsentFormRepository:
         consultation_id: Optional[int] = None,
         status: Optional[str] = None
     ) -> List[ConsentForm]:
-        query = self.db.query(ConsentForm).filter(ConsentForm.deleted_at.is_(None))
+        query = self.db.query(ConsentForm)
 
         if clinic_id:
             query = query.filter(ConsentForm.clinic_id == clinic_id)
@@ -57,8 +54,7 @@ class ConsentFormRepository:
         limit: int = 100
     ) -> List[ConsentForm]:
         return self.db.query(ConsentForm).filter(
-            ConsentForm.patient_id == patient_id,
-            ConsentForm.deleted_at.is_(None)
+            ConsentForm.patient_id == patient_id
         ).offset(skip).limit(limit).all()
 
     def get_by_clinic_id(
@@ -68,8 +64,7 @@ class ConsentFormRepository:
         limit: int = 100
     ) -> List[ConsentForm]:
         return self.db.query(ConsentForm).filter(
-            ConsentForm.clinic_id == clinic_id,
-            ConsentForm.deleted_at.is_(None)
+            ConsentForm.clinic_id == clinic_id
         ).offset(skip).limit(limit).all()
 
     def update(
@@ -78,20 +73,9 @@ class ConsentFormRepository:
         consent_form: ConsentFormUpdate,
         updated_by_user_id: int
     ) -> Optional[ConsentForm]:
-        db_consent_form = self.get_by_id(consent_form_id)
-        if db_consent_form:
-            update_data = consent_form.dict(exclude_unset=True)
-            update_data["updated_by_user_id"] = updated_by_user_id
-            for field, value in update_data.items():
-                setattr(db_consent_form, field, value)
-            self.db.commit()
-            self.db.refresh(db_consent_form)
-        return db_consent_form
+        update_data = consent_form.dict(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        return update_by_id(self.db, ConsentForm, consent_form_id, update_data)
 
     def soft_delete(self, consent_form_id: int) -> bool:
-        db_consent_form = self.get_by_id(consent_form_id)
-        if db_consent_form:
-            db_consent_form.deleted_at = datetime.utcnow()
-            self.db.commit()
-            return True
-        return False
+        return soft_delete_by_id(self.db, ConsentForm, consent_form_id, deleted_at=datetime.utcnow())
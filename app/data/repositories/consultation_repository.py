@@ -1,69 +1,103 @@
-from sqlalchemy.orm import Session
 from app.domain import schemas
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
 
 from app.domain.models.consultation import Consultation
+from app.domain.models.patient import Patient
+from app.data.read_plans import ReadPlan
+from app.data.filters import Eq, FilterSpec, Gte, Lte
+from app.data.repositories.base_repository import BaseRepository
+
+CONSULTATION_READ_PLAN = ReadPlan(Consultation, schemas.ConsultationResponse)
+
+class ConsultationRepository(BaseRepository[Consultation]):
+    model = Consultation
+    read_plan = CONSULTATION_READ_PLAN
+    filters = FilterSpec(
+        clinic_id=Eq(Consultation.clinic_id),
+        patient_id=Eq(Consultation.patient_id),
+        doctor_id=Eq(Consultation.doctor_id),
+        appointment_id=Eq(Consultation.appointment_id),
+        date_from=Gte(Consultation.consultation_date),
+        date_to=Lte(Consultation.consultation_date),
+    )
 
-class ConsultationRepository:
-    def __init__(self, db: Session):
-        self.db = db
-    
     def create(self, consultation: schemas.ConsultationCreate, created_by_user_id: int) -> Consultation:
         db_consultation = Consultation(
             **consultation.dict(),
             created_by_user_id=created_by_user_id,
             updated_by_user_id=created_by_user_id
         )
-        self.db.add(db_consultation)
-        self.db.commit()
-        self.db.refresh(db_consultation)
-        return db_consultation
+        return self._insert(db_consultation)
 
-    def get_by_id(self, consultation_id: int) -> Optional[Consultation]:
-        return self.db.query(Consultation).filter(
-            Consultation.id == consultation_id,
-            Consultation.deleted_at == None
-        ).first()
-
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Consultation]:
-        return self.db.query(Consultation).filter(
-            Consultation.deleted_at == None
-        ).offset(skip).limit(limit).all()
-    
     def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[Consultation]:
-        return self.db.query(Consultation).filter(
-            Consultation.patient_id == patient_id,
-            Consultation.deleted_at == None
-        ).offset(skip).limit(limit).all()
-    
+        return self._get_many_by(Consultation.patient_id, patient_id, skip, limit)
+
     def get_by_doctor_id(self, doctor_id: int, skip: int = 0, limit: int = 100) -> List[Consultation]:
-        return self.db.query(Consultation).filter(
-            Consultation.doctor_id == doctor_id,
-            Consultation.deleted_at == None
-        ).offset(skip).limit(limit).all()
+        return self._get_many_by(Consultation.doctor_id, doctor_id, skip, limit)
 
     def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[Consultation]:
-        return self.db.query(Consultation).filter(
-            Consultation.clinic_id == clinic_id,
-            Consultation.deleted_at == None
-        ).offset(skip).limit(limit).all()
+        return self._get_many_by(Consultation.clinic_id, clinic_id, skip, limit)
 
     def update(self, consultation_id: int, consultation: schemas.ConsultationUpdate, updated_by_user_id: int) -> Optional[Consultation]:
-        db_consultation = self.get_by_id(consultation_id)
-        if db_consultation:
-            update_data = consultation.dict(exclude_unset=True)
-            update_data["updated_by_user_id"] = updated_by_user_id
-            for key, value in update_data.items():
-                setattr(db_consultation, key, value)
-            self.db.commit()
-            self.db.refresh(db_consultation)
-        return db_consultation
+        update_data = consultation.dict(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        return self._update(consultation_id, update_data)
 
     def soft_delete(self, consultation_id: int) -> bool:
-        db_consultation = self.get_by_id(consultation_id)
-        if db_consultation:
-            db_consultation.deleted_at = datetime.utcnow()
-            self.db.commit()
-            return True
-        return False
+        return self._soft_delete(consultation_id, deleted_at=datetime.utcnow())
+
+    # --- resolución por lotes (importación de exámenes) ---
+
+    def _scoped(self, statement, clinic_id: Optional[int]):
+        return statement.where(Consultation.clinic_id == clinic_id) if clinic_id is not None else statement
+
+    def existing_ids(self, consultation_ids: Iterable[int], clinic_id: Optional[int] = None) -> Set[int]:
+        """Ids de la lista que corresponden a consultas activas, en una sola consulta."""
+        consultation_ids = set(consultation_ids)
+        if not consultation_ids:
+            return set()
+        statement = select(Consultation.id).where(Consultation.id.in_(consultation_ids))
+        return set(self.db.scalars(self._scoped(statement, clinic_id)))
+
+    def ids_by_appointment(self, appointment_ids: Iterable[int], clinic_id: Optional[int] = None) -> Dict[int, int]:
+        """{appointment_id: consultation_id}; si una cita tiene varias consultas gana la más reciente."""
+        appointment_ids = set(appointment_ids)
+        if not appointment_ids:
+            return {}
+        statement = (
+            select(Consultation.appointment_id, Consultation.id)
+            .where(Consultation.appointment_id.in_(appointment_ids))
+            .order_by(Consultation.consultation_date, Consultation.id)
+        )
+        return dict(self.db.execute(self._scoped(statement, clinic_id)).all())
+
+    def ids_by_patient_day(
+        self, keys: Iterable[Tuple[str, date]], clinic_id: Optional[int] = None
+    ) -> Dict[Tuple[str, date], int]:
+        """
+        {(patient_identifier, día): consultation_id} con la última consulta del
+        paciente ese día. Una sola consulta acotada al rango de días pedido.
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+        days = [day for _, day in keys]
+        statement = (
+            select(Patient.patient_identifier, Consultation.consultation_date, Consultation.id)
+            .join(Patient, Patient.id == Consultation.patient_id)
+            .where(
+                Patient.patient_identifier.in_({identifier for identifier, _ in keys}),
+                Consultation.consultation_date >= datetime.combine(min(days), time.min),
+                Consultation.consultation_date < datetime.combine(max(days) + timedelta(days=1), time.min),
+            )
+            .order_by(Consultation.consultation_date, Consultation.id)
+        )
+        resolved = {}
+        for identifier, consultation_date, consultation_id in self.db.execute(self._scoped(statement, clinic_id)):
+            key = (identifier, consultation_date.date())
+            if key in keys:
+                resolved[key] = consultation_id
+        return resolved
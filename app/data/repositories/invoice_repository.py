@@ -2,7 +2,33 @@ from sqlalchemy.orm import Session
 from app.domain import schemas
 from app.domain.models import Invoice
 from typing import List, Optional
-from sqlalchemy import or_
+from sqlalchemy import func
+from app.data.write_path import insert_one, update_by_id, soft_delete_by_id
+from app.data.pagination import Keyset, paginate
+from app.data.filters import Eq, FilterSpec, FullText, Gte, Lte, Prefix
+
+INVOICE_KEYSET = Keyset(Invoice.created_at, Invoice.id)
+# Búsqueda: las más recientes primero
+INVOICE_SEARCH_KEYSET = Keyset(Invoice.issue_date, Invoice.id, descending=True)
+INVOICE_FILTERS = FilterSpec(
+    clinic_id=Eq(Invoice.clinic_id),
+    patient_id=Eq(Invoice.patient_id),
+    status=Eq(Invoice.payment_status),
+    start_date=Gte(Invoice.issue_date),
+    end_date=Lte(Invoice.issue_date),
+)
+INVOICE_SEARCH_FILTERS = FilterSpec(
+    clinic_id=Eq(Invoice.clinic_id),
+    patient_id=Eq(Invoice.patient_id),
+    invoice_number=Prefix(Invoice.invoice_number),
+    status=Eq(Invoice.payment_status),
+    payment_method=Eq(Invoice.payment_method),
+    notes=FullText(Invoice.notes),
+    issue_date_from=Gte(Invoice.issue_date),
+    issue_date_to=Lte(Invoice.issue_date),
+    due_date_from=Gte(Invoice.due_date),
+    due_date_to=Lte(Invoice.due_date),
+)
 
 class InvoiceRepository:
     def __init__(self, db: Session):
@@ -10,76 +36,72 @@ class InvoiceRepository:
 
     def create(self, invoice: schemas.InvoiceCreate, created_by_user_id: int) -> Invoice:
         db_invoice = Invoice(**invoice.model_dump(), created_by_user_id=created_by_user_id)
-        self.db.add(db_invoice)
-        self.db.commit()
-        self.db.refresh(db_invoice)
-        return db_invoice
+        return insert_one(self.db, db_invoice)
 
     def get_by_id(self, invoice_id: int) -> Optional[Invoice]:
         return self.db.query(Invoice).filter(
-            Invoice.id == invoice_id,
-            Invoice.deleted_at == None
+            Invoice.id == invoice_id
         ).first()
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Invoice]:
-        return self.db.query(Invoice).filter(
-            Invoice.deleted_at == None
-        ).offset(skip).limit(limit).all()
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        clinic_id: Optional[int] = None,
+        patient_id: Optional[int] = None,
+        payment_status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[Invoice]:
+        query = self.db.query(Invoice)
+        if clinic_id is not None:
+            query = query.filter(Invoice.clinic_id == clinic_id)
+        if patient_id is not None:
+            query = query.filter(Invoice.patient_id == patient_id)
+        if payment_status is not None:
+            query = query.filter(Invoice.payment_status == payment_status)
+        return paginate(query, INVOICE_KEYSET, skip, limit, cursor)
 
-    def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[Invoice]:
-        return self.db.query(Invoice).filter(
-            Invoice.patient_id == patient_id,
-            Invoice.deleted_at == None
-        ).offset(skip).limit(limit).all()
+    def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Invoice]:
+        return paginate(
+            self.db.query(Invoice).filter(
+                Invoice.patient_id == patient_id
+            ),
+            INVOICE_KEYSET, skip, limit, cursor
+        )
     
-    def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[Invoice]:
-        return self.db.query(Invoice).filter(
-            Invoice.clinic_id == clinic_id,
-            Invoice.deleted_at == None
-        ).offset(skip).limit(limit).all()
+    def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Invoice]:
+        return paginate(
+            self.db.query(Invoice).filter(
+                Invoice.clinic_id == clinic_id
+            ),
+            INVOICE_KEYSET, skip, limit, cursor
+        )
 
-    def get_by_consultation_id(self, consultation_id: int, skip: int = 0, limit: int = 100) -> List[Invoice]:
-        return self.db.query(Invoice).filter(
-            Invoice.consultation_id == consultation_id,
-            Invoice.deleted_at == None
-        ).offset(skip).limit(limit).all()
+    def get_by_consultation_id(self, consultation_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Invoice]:
+        return paginate(
+            self.db.query(Invoice).filter(
+                Invoice.consultation_id == consultation_id
+            ),
+            INVOICE_KEYSET, skip, limit, cursor
+        )
 
-    def get_by_appointment_id(self, appointment_id: int, skip: int = 0, limit: int = 100) -> List[Invoice]:
-        return self.db.query(Invoice).filter(
-            Invoice.appointment_id == appointment_id,
-            Invoice.deleted_at == None
-        ).offset(skip).limit(limit).all()
+    def get_by_appointment_id(self, appointment_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Invoice]:
+        return paginate(
+            self.db.query(Invoice).filter(
+                Invoice.appointment_id == appointment_id
+            ),
+            INVOICE_KEYSET, skip, limit, cursor
+        )
 
     def update(self, invoice_id: int, invoice: schemas.InvoiceUpdate, updated_by_user_id: int) -> Optional[Invoice]:
-        db_invoice = self.get_by_id(invoice_id)
-        if db_invoice:
-            update_data = invoice.model_dump(exclude_unset=True)
-            update_data['updated_by_user_id'] = updated_by_user_id
-            for field, value in update_data.items():
-                setattr(db_invoice, field, value)
-            self.db.commit()
-            self.db.refresh(db_invoice)
-        return db_invoice
+        update_data = invoice.model_dump(exclude_unset=True)
+        update_data['updated_by_user_id'] = updated_by_user_id
+        return update_by_id(self.db, Invoice, invoice_id, update_data)
 
     def delete(self, invoice_id: int) -> bool:
-        db_invoice = self.get_by_id(invoice_id)
-        if db_invoice:
-            db_invoice.deleted_at = func.now()
-            self.db.commit()
-            return True
-        return False
+        return soft_delete_by_id(self.db, Invoice, invoice_id, deleted_at=func.now())
 
-    def search_invoices(self, search_term: str, clinic_id: Optional[int] = None) -> List[Invoice]:
-        query = self.db.query(Invoice).filter(Invoice.deleted_at == None)
-        
-        if clinic_id:
-            query = query.filter(Invoice.clinic_id == clinic_id)
-            
-        return query.filter(
-            or_(
-                Invoice.invoice_number.ilike(f"%{search_term}%"),
-                Invoice.payment_status.ilike(f"%{search_term}%"),
-                Invoice.payment_method.ilike(f"%{search_term}%"),
-                Invoice.notes.ilike(f"%{search_term}%")
-            )
-        ).all()
+    def search(self, limit: int = 50, cursor: Optional[str] = None, **filters):
+        """Facturas con los filtros recibidos, de la más reciente a la más antigua, paginadas por cursor"""
+        query = INVOICE_SEARCH_FILTERS.apply(self.db.query(Invoice), **filters)
+        return paginate(query, INVOICE_SEARCH_KEYSET, 0, limit, cursor or "")
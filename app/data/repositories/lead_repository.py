@@ -1,7 +1,63 @@
+import re
 from sqlalchemy.orm import Session
 from app.domain import models, schemas
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from sqlalchemy import or_, and_, select
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.contact import PHONE_SUFFIX_LENGTH, digits, normalize_email, normalize_phone, phone_suffix
+from app.data.pagination import Keyset, paginate
+from app.data.filters import Eq, FilterSpec, Prefix
+from app.data.write_path import insert_chunked, insert_one, update_by_id
+
+_PHONE_LIKE = re.compile(r"[\d\s()+.\-]+")
+
+
+class ContactSearch:
+    """
+    Búsqueda de leads que usa las columnas normalizadas: un teléfono (en
+    cualquier formato) por E.164 o por sus últimos dígitos, un email por
+    prefijo del email normalizado y cualquier otro término, además, por
+    coincidencia parcial en nombre, apellido o teléfono.
+    """
+
+    def clause(self, value):
+        term = value.strip()
+        number = digits(term)
+        if _PHONE_LIKE.fullmatch(term) and len(number) >= PHONE_SUFFIX_LENGTH:
+            e164 = normalize_phone(term) if len(number) >= settings.PHONE_NATIONAL_NUMBER_LENGTH else None
+            if e164:
+                return models.Lead.mobile_phone_e164 == e164
+            return models.Lead.mobile_phone_suffix == number[-PHONE_SUFFIX_LENGTH:]
+        email_prefix = Prefix(models.Lead.email_normalized).clause(term.lower())
+        if "@" in term:
+            return email_prefix
+        pattern = f"%{term}%"
+        return or_(
+            models.Lead.first_name.ilike(pattern),
+            models.Lead.last_name.ilike(pattern),
+            email_prefix,
+            models.Lead.mobile_phone.ilike(pattern),
+        )
+
+LEAD_KEYSET = Keyset(models.Lead.created_at, models.Lead.lead_id)
+LEAD_FILTERS = FilterSpec(
+    status=Eq(models.Lead.status),
+    service_id=Eq(models.Lead.service_id),
+    channel=Eq(models.Lead.channel),
+    search=ContactSearch(),
+)
+
+
+def contact_columns(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Añade a `values` las columnas normalizadas de los campos de contacto que traiga."""
+    if "mobile_phone" in values:
+        e164 = normalize_phone(values["mobile_phone"])
+        values["mobile_phone_e164"] = e164
+        values["mobile_phone_suffix"] = phone_suffix(e164)
+    if "email" in values:
+        values["email_normalized"] = normalize_email(values["email"])
+    return values
+
 
 class LeadRepository:
     def __init__(self, db: Session):
@@ -15,81 +71,113 @@ class LeadRepository:
         if lead_data.get("service_id") == 0:
             lead_data["service_id"] = None
             
-        db_lead = models.Lead(**lead_data)
-        self.db.add(db_lead)
-        self.db.commit()
-        self.db.refresh(db_lead)
-        return db_lead
+        db_lead = models.Lead(**contact_columns(lead_data))
+        return insert_one(self.db, db_lead)
+
+    def create_many(self, rows: List[dict], chunk_size: int) -> List:
+        """Alta masiva por bloques; por cada fila, el lead creado o el mensaje de error"""
+        for row in rows:
+            if row.get("service_id") == 0:
+                row["service_id"] = None
+            contact_columns(row)
+        return insert_chunked(self.db, models.Lead, rows, chunk_size)
+
+    def get_existing_contacts(self, phones: Iterable[str], emails: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Teléfonos (E.164) y emails normalizados de las listas que ya tiene algún lead, en una sola consulta"""
+        phones, emails = [phone for phone in phones if phone], [email for email in emails if email]
+        if not phones and not emails:
+            return set(), set()
+        rows = self.db.execute(
+            select(models.Lead.mobile_phone_e164, models.Lead.email_normalized).where(or_(
+                models.Lead.mobile_phone_e164.in_(phones),
+                models.Lead.email_normalized.in_(emails),
+            ))
+        ).all()
+        wanted_phones, wanted_emails = set(phones), set(emails)
+        return (
+            {phone for phone, _ in rows if phone in wanted_phones},
+            {email for _, email in rows if email in wanted_emails},
+        )
+
+    def find_contact_conflict(
+        self, mobile_phone_e164: Optional[str], email_normalized: Optional[str], exclude_lead_id: Optional[int] = None
+    ) -> Optional[models.Lead]:
+        """Otro lead con el mismo teléfono o email normalizado; una consulta por los índices únicos"""
+        criteria = []
+        if mobile_phone_e164:
+            criteria.append(models.Lead.mobile_phone_e164 == mobile_phone_e164)
+        if email_normalized:
+            criteria.append(models.Lead.email_normalized == email_normalized)
+        if not criteria:
+            return None
+        query = self.db.query(models.Lead).filter(or_(*criteria))
+        if exclude_lead_id is not None:
+            query = query.filter(models.Lead.lead_id != exclude_lead_id)
+        return query.first()
 
     def get_by_id(self, lead_id: int) -> Optional[models.Lead]:
         """Obtiene un lead por su ID"""
         return self.db.query(models.Lead).filter(models.Lead.lead_id == lead_id).first()
 
     def get_by_mobile_phone(self, mobile_phone: str) -> Optional[models.Lead]:
-        """Obtiene un lead por su número de teléfono móvil"""
-        return self.db.query(models.Lead).filter(models.Lead.mobile_phone == mobile_phone).first()
+        """Obtiene un lead por su número de teléfono móvil, en cualquier formato"""
+        e164 = normalize_phone(mobile_phone)
+        if e164 is None:
+            return None
+        return self.db.query(models.Lead).filter(models.Lead.mobile_phone_e164 == e164).first()
     
     def get_by_email(self, email: str) -> Optional[models.Lead]:
-        """Obtiene un lead por su email"""
-        return self.db.query(models.Lead).filter(models.Lead.email == email).first()
+        """Obtiene un lead por su email, sin distinguir mayúsculas"""
+        email_key = normalize_email(email)
+        if email_key is None:
+            return None
+        return self.db.query(models.Lead).filter(models.Lead.email_normalized == email_key).first()
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[models.Lead]:
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Lead]:
         """Obtiene todos los leads con paginación"""
-        return self.db.query(models.Lead).offset(skip).limit(limit).all()
+        return paginate(self.db.query(models.Lead), LEAD_KEYSET, skip, limit, cursor)
+
+    def find(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters) -> List[models.Lead]:
+        """Obtiene leads aplicando a la vez todos los filtros recibidos"""
+        query = LEAD_FILTERS.apply(self.db.query(models.Lead), **filters)
+        return paginate(query.order_by(*LEAD_KEYSET.order_by()), LEAD_KEYSET, skip, limit, cursor)
 
-    def get_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[models.Lead]:
+    def get_by_status(self, status: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Lead]:
         """Obtiene leads por su estado"""
-        return self.db.query(models.Lead).filter(models.Lead.status == status).offset(skip).limit(limit).all()
+        return paginate(self.db.query(models.Lead).filter(models.Lead.status == status), LEAD_KEYSET, skip, limit, cursor)
 
-    def get_by_service_id(self, service_id: int, skip: int = 0, limit: int = 100) -> List[models.Lead]:
+    def get_by_service_id(self, service_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Lead]:
         """Obtiene leads por ID de servicio"""
-        return self.db.query(models.Lead).filter(models.Lead.service_id == service_id).offset(skip).limit(limit).all()
+        return paginate(self.db.query(models.Lead).filter(models.Lead.service_id == service_id), LEAD_KEYSET, skip, limit, cursor)
 
-    def get_by_channel(self, channel: str, skip: int = 0, limit: int = 100) -> List[models.Lead]:
+    def get_by_channel(self, channel: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Lead]:
         """Obtiene leads por canal"""
-        return self.db.query(models.Lead).filter(models.Lead.channel == channel).offset(skip).limit(limit).all()
+        return paginate(self.db.query(models.Lead).filter(models.Lead.channel == channel), LEAD_KEYSET, skip, limit, cursor)
 
-    def search(self, query: str, skip: int = 0, limit: int = 100) -> List[models.Lead]:
+    def search(self, query: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Lead]:
         """Busca leads por nombre, apellido, email o teléfono"""
-        search_query = f"%{query}%"
-        return self.db.query(models.Lead).filter(
-            or_(
-                models.Lead.first_name.ilike(search_query),
-                models.Lead.last_name.ilike(search_query),
-                models.Lead.email.ilike(search_query),
-                models.Lead.mobile_phone.ilike(search_query)
-            )
-        ).offset(skip).limit(limit).all()
+        return paginate(
+            LEAD_FILTERS.apply(self.db.query(models.Lead), search=query),
+            LEAD_KEYSET, skip, limit, cursor
+        )
 
     def update(self, lead_id: int, lead: schemas.LeadUpdate) -> Optional[models.Lead]:
         """Actualiza un lead existente por su ID"""
-        db_lead = self.get_by_id(lead_id)
-        if db_lead:
-            # Solo actualiza los campos no nulos
-            update_data = lead.dict(exclude_unset=True)
-            
-            # Corregir casos específicos
-            if "service_id" in update_data and (update_data["service_id"] == 0 or update_data["service_id"] is None):
-                update_data["service_id"] = None
-                
-            if "appointment_id" in update_data and update_data["appointment_id"] == 0:
-                update_data["appointment_id"] = None
-                
-            for key, value in update_data.items():
-                setattr(db_lead, key, value)
-                
-            self.db.commit()
-            self.db.refresh(db_lead)
-        return db_lead
+        # Solo actualiza los campos no nulos
+        update_data = lead.dict(exclude_unset=True)
+
+        # Corregir casos específicos
+        if "service_id" in update_data and (update_data["service_id"] == 0 or update_data["service_id"] is None):
+            update_data["service_id"] = None
+
+        if "appointment_id" in update_data and update_data["appointment_id"] == 0:
+            update_data["appointment_id"] = None
+
+        return update_by_id(self.db, models.Lead, lead_id, contact_columns(update_data))
 
     def update_status(self, lead_id: int, status: str) -> Optional[models.Lead]:
         """Actualiza solo el estado de un lead"""
-        db_lead = self.get_by_id(lead_id)
-        if db_lead:
-            db_lead.status = status
-            self.db.commit()
-            self.db.refresh(db_lead)
-        return db_lead
+        return update_by_id(self.db, models.Lead, lead_id, {"status": status})
 
     def delete(self, lead_id: int) -> bool:
         """Elimina un lead por su ID"""
@@ -1,66 +1,106 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Set
 from app.domain.models.patient import Patient
-from app.domain.schemas import PatientCreate, PatientUpdate
+from app.domain.schemas import PatientCreate, PatientUpdate, PatientResponse
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.data.read_plans import ReadPlan
+from app.data.pagination import Keyset, paginate
+from app.data.filters import Eq, FilterSpec
+from app.data.patient_search import PatientSearchIndex
+from app.data.repositories.base_repository import BaseRepository
+
+PATIENT_READ_PLAN = ReadPlan(Patient, PatientResponse)
+PATIENT_KEYSET = Keyset(Patient.created_at, Patient.id)
+
+class PatientRepository(BaseRepository[Patient]):
+    model = Patient
+    read_plan = PATIENT_READ_PLAN
+    filters = FilterSpec(clinic_id=Eq(Patient.clinic_id))
 
-class PatientRepository:
     def __init__(self, db: Session):
-        self.db = db
+        super().__init__(db)
+        self.search_index = PatientSearchIndex(db)
+
+    def _query(self):
+        return self.db.query(Patient).options(*PATIENT_READ_PLAN)
 
     def create(self, patient: PatientCreate, created_by_user_id: int) -> Patient:
         db_patient = Patient(**patient.dict(), created_by_user_id=created_by_user_id)
-        self.db.add(db_patient)
+        # Fila y tokens en una transacción: un paciente guardado siempre se encuentra
+        db_patient = self._insert(db_patient, commit=False)
+        self.search_index.index([db_patient], commit=False)
         self.db.commit()
-        self.db.refresh(db_patient)
         return db_patient
 
-    def get_by_id(self, patient_id: int) -> Optional[Patient]:
-        return self.db.query(Patient).filter(
-            Patient.id == patient_id,
-            Patient.deleted_at.is_(None)
-        ).first()
+    def create_many(self, rows: List[dict], chunk_size: int) -> List:
+        return self._insert_many(rows, chunk_size, before_commit=lambda patients: self.search_index.index(patients, commit=False))
 
     def get_by_email(self, email: str) -> Optional[Patient]:
         return self.db.query(Patient).filter(
-            Patient.email == email,
-            Patient.deleted_at.is_(None)
+            Patient.email == email
         ).first()
 
-    def get_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[Patient]:
-        return self.db.query(Patient).filter(
-            Patient.clinic_id == clinic_id,
-            Patient.deleted_at.is_(None)
-        ).offset(skip).limit(limit).all()
+    def get_existing_emails(self, emails: List[str]) -> Set[str]:
+        """Emails de la lista que ya tiene algún paciente, en una sola consulta."""
+        if not emails:
+            return set()
+        return set(self.db.scalars(select(Patient.email).where(Patient.email.in_(emails))))
 
-    def search(self, clinic_id: int, search_term: str) -> List[Patient]:
-        return self.db.query(Patient).filter(
-            Patient.clinic_id == clinic_id,
-            Patient.deleted_at.is_(None),
-            or_(
+    def get_all(
+        self,
+        clinic_id: Optional[int] = None,
+        search_term: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[Patient]:
+        query = self._query()
+        if clinic_id is not None:
+            query = query.filter(Patient.clinic_id == clinic_id)
+        if search_term and clinic_id is not None:
+            query = query.filter(Patient.id.in_(self.search_index.matching_ids(clinic_id, search_term)))
+        elif search_term:
+            # Sin clínica no hay índice que usar (está particionado por clinic_id)
+            query = query.filter(or_(
                 Patient.first_name.ilike(f"%{search_term}%"),
                 Patient.last_name.ilike(f"%{search_term}%"),
                 Patient.email.ilike(f"%{search_term}%"),
                 Patient.patient_identifier.ilike(f"%{search_term}%")
-            )
-        ).all()
+            ))
+        return paginate(query, PATIENT_KEYSET, skip, limit, cursor)
+
+    def get_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Patient]:
+        return paginate(
+            self._query().filter(
+                Patient.clinic_id == clinic_id
+            ),
+            PATIENT_KEYSET, skip, limit, cursor
+        )
+
+    def search(self, clinic_id: int, search_term: str, skip: int = 0, limit: int = 20) -> List[Patient]:
+        """Pacientes de la clínica ordenados por relevancia (app.data.patient_search)."""
+        ranked = self.search_index.search(clinic_id, search_term, skip, limit)
+        if not ranked:
+            return []
+        ids = [patient_id for patient_id, _ in ranked]
+        statement = self._select().where(Patient.id.in_(ids))
+        by_id = {patient.id: patient for patient in self._scalars(statement, {})}
+        # Un paciente borrado entre ambas consultas simplemente no aparece
+        return [by_id[patient_id] for patient_id in ids if patient_id in by_id]
 
     def update(self, patient_id: int, patient: PatientUpdate, updated_by_user_id: int) -> Optional[Patient]:
-        db_patient = self.get_by_id(patient_id)
-        if db_patient:
-            update_data = patient.dict(exclude_unset=True)
-            update_data["updated_by_user_id"] = updated_by_user_id
-            for key, value in update_data.items():
-                setattr(db_patient, key, value)
-            self.db.commit()
-            self.db.refresh(db_patient)
+        update_data = patient.dict(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        db_patient = self._update(patient_id, update_data, commit=False)
+        if db_patient is not None:
+            self.search_index.index([db_patient], commit=False)
+        self.db.commit()
         return db_patient
 
     def soft_delete(self, patient_id: int) -> bool:
-        db_patient = self.get_by_id(patient_id)
-        if db_patient:
-            db_patient.deleted_at = datetime.utcnow()
-            self.db.commit()
-            return True
-        return False
\ No newline at end of file
+        deleted = self._soft_delete(patient_id, deleted_at=datetime.utcnow(), commit=False)
+        if deleted:
+            self.search_index.remove([patient_id], commit=False)
+        self.db.commit()
+        return deleted
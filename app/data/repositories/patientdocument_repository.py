@@ -1,9 +1,15 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.domain.models.patientdocument import PatientDocument
-from app.domain.schemas import PatientDocumentCreate, PatientDocumentUpdate
+from app.domain.schemas import PatientDocumentCreate, PatientDocumentUpdate, PatientDocumentResponse
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, select
+from app.data.read_plans import ReadPlan
+from app.data.write_path import insert_one, update_by_id, soft_delete_by_id, update_statement, soft_delete_statement
+from app.data.change_capture import record_change, statement_change
+
+PATIENTDOCUMENT_READ_PLAN = ReadPlan(PatientDocument, PatientDocumentResponse)
 
 class PatientDocumentRepository:
     def __init__(self, db: Session):
@@ -11,20 +17,15 @@ class PatientDocumentRepository:
 
     def create(self, document: PatientDocumentCreate, created_by_user_id: int) -> PatientDocument:
         db_document = PatientDocument(**document.model_dump(), created_by_user_id=created_by_user_id)
-        self.db.add(db_document)
-        self.db.commit()
-        self.db.refresh(db_document)
-        return db_document
+        return insert_one(self.db, db_document)
 
     def get_by_id(self, document_id: int) -> Optional[PatientDocument]:
         return self.db.query(PatientDocument).filter(
-            PatientDocument.id == document_id,
-            PatientDocument.deleted_at.is_(None)
+            PatientDocument.id == document_id
         ).first()
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
         return self.db.query(PatientDocument)\
-            .filter(PatientDocument.deleted_at.is_(None))\
             .offset(skip)\
             .limit(limit)\
             .all()
@@ -32,8 +33,7 @@ class PatientDocumentRepository:
     def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
         return self.db.query(PatientDocument)\
             .filter(
-                PatientDocument.patient_id == patient_id,
-                PatientDocument.deleted_at.is_(None)
+                PatientDocument.patient_id == patient_id
             )\
             .offset(skip)\
             .limit(limit)\
@@ -42,8 +42,7 @@ class PatientDocumentRepository:
     def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
         return self.db.query(PatientDocument)\
             .filter(
-                PatientDocument.clinic_id == clinic_id,
-                PatientDocument.deleted_at.is_(None)
+                PatientDocument.clinic_id == clinic_id
             )\
             .offset(skip)\
             .limit(limit)\
@@ -53,7 +52,6 @@ class PatientDocumentRepository:
         return self.db.query(PatientDocument)\
             .filter(
                 PatientDocument.clinic_id == clinic_id,
-                PatientDocument.deleted_at.is_(None),
                 or_(
                     PatientDocument.title.ilike(f"%{search_term}%"),
                     PatientDocument.document_type.ilike(f"%{search_term}%"),
@@ -65,28 +63,116 @@ class PatientDocumentRepository:
             .all()
 
     def update(self, document_id: int, document: PatientDocumentUpdate, updated_by_user_id: int) -> Optional[PatientDocument]:
-        db_document = self.get_by_id(document_id)
-        if db_document:
-            update_data = document.model_dump(exclude_unset=True)
-            update_data["updated_by_user_id"] = updated_by_user_id
-            for key, value in update_data.items():
-                setattr(db_document, key, value)
-            self.db.commit()
-            self.db.refresh(db_document)
-        return db_document
+        update_data = document.model_dump(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        return update_by_id(self.db, PatientDocument, document_id, update_data)
 
     def delete(self, document_id: int) -> bool:
+        return soft_delete_by_id(self.db, PatientDocument, document_id, deleted_at=datetime.utcnow())
+
+    def hard_delete(self, document_id: int) -> bool:
         db_document = self.get_by_id(document_id)
         if db_document:
-            db_document.deleted_at = datetime.utcnow()
+            self.db.delete(db_document)
             self.db.commit()
             return True
         return False
 
-    def hard_delete(self, document_id: int) -> bool:
-        db_document = self.get_by_id(document_id)
+
+class AsyncPatientDocumentRepository:
+    """
+    Variante asíncrona de PatientDocumentRepository sobre AsyncSession.
+    Las relaciones de la respuesta se cargan siempre con el read plan, ya que
+    en modo asíncrono no se permiten cargas perezosas.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _select(self):
+        return select(PatientDocument).options(*PATIENTDOCUMENT_READ_PLAN)
+
+    async def create(self, document: PatientDocumentCreate, created_by_user_id: int) -> PatientDocument:
+        db_document = PatientDocument(**document.model_dump(), created_by_user_id=created_by_user_id)
+        self.db.add(db_document)
+        await self.db.commit()
+        return await self.get_by_id(db_document.id)
+
+    async def get_by_id(self, document_id: int) -> Optional[PatientDocument]:
+        result = await self.db.execute(
+            self._select()
+            .filter(PatientDocument.id == document_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
+        result = await self.db.execute(self._select().offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
+        result = await self.db.execute(
+            self._select()
+            .filter(PatientDocument.patient_id == patient_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
+        result = await self.db.execute(
+            self._select()
+            .filter(PatientDocument.clinic_id == clinic_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def search(self, search_term: str, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocument]:
+        result = await self.db.execute(
+            self._select()
+            .filter(
+                PatientDocument.clinic_id == clinic_id,
+                or_(
+                    PatientDocument.title.ilike(f"%{search_term}%"),
+                    PatientDocument.document_type.ilike(f"%{search_term}%"),
+                    PatientDocument.description.ilike(f"%{search_term}%")
+                )
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def update(self, document_id: int, document: PatientDocumentUpdate, updated_by_user_id: int) -> Optional[PatientDocument]:
+        update_data = document.model_dump(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        statement = update_statement(PatientDocument, document_id, update_data)
+        change = statement_change(self.db.sync_session, PatientDocument, "UPDATE", document_id, update_data)
+        result = await self.db.execute(statement, execution_options={"synchronize_session": False})
+        if result.rowcount > 0:
+            record_change(self.db.sync_session, change)
+        await self.db.commit()
+        if result.rowcount == 0:
+            return None
+        # Relee con el plan de lectura: en modo asíncrono las relaciones no se cargan de forma perezosa
+        return await self.get_by_id(document_id)
+
+    async def delete(self, document_id: int) -> bool:
+        deleted_at = datetime.utcnow()
+        change = statement_change(self.db.sync_session, PatientDocument, "DELETE", document_id, {"deleted_at": deleted_at})
+        result = await self.db.execute(
+            soft_delete_statement(PatientDocument, document_id, deleted_at=deleted_at),
+            execution_options={"synchronize_session": False},
+        )
+        if result.rowcount > 0:
+            record_change(self.db.sync_session, change)
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def hard_delete(self, document_id: int) -> bool:
+        db_document = await self.get_by_id(document_id)
         if db_document:
-            self.db.delete(db_document)
-            self.db.commit()
+            await self.db.delete(db_document)
+            await self.db.commit()
             return True
         return False
@@ -1,67 +1,40 @@
-from sqlalchemy.orm import Session
 from app.domain import schemas
 from app.domain.models import Payment
 from typing import List, Optional
-from sqlalchemy import or_, func
+from sqlalchemy import func
+from app.data.filters import Eq, FilterSpec, Gte, Lte
+from app.data.repositories.base_repository import BaseRepository
 
-class PaymentRepository:
-    def __init__(self, db: Session):
-        self.db = db
+class PaymentRepository(BaseRepository[Payment]):
+    model = Payment
+    filters = FilterSpec(
+        invoice_id=Eq(Payment.invoice_id),
+        patient_id=Eq(Payment.patient_id),
+        clinic_id=Eq(Payment.clinic_id),
+        start_date=Gte(Payment.payment_date),
+        end_date=Lte(Payment.payment_date),
+    )
 
     def create(self, payment: schemas.PaymentCreate, created_by_user_id: int) -> Payment:
         db_payment = Payment(
             **payment.model_dump(),
             created_by_user_id=created_by_user_id
         )
-        self.db.add(db_payment)
-        self.db.commit()
-        self.db.refresh(db_payment)
-        return db_payment
-    
-    def get_by_id(self, payment_id: int) -> Optional[Payment]:
-        return self.db.query(Payment).filter(
-            Payment.id == payment_id,
-            Payment.deleted_at == None
-        ).first()
+        return self._insert(db_payment)
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Payment]:
-        return self.db.query(Payment).filter(
-            Payment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-    
     def get_by_invoice_id(self, invoice_id: int, skip: int = 0, limit: int = 100) -> List[Payment]:
-        return self.db.query(Payment).filter(
-            Payment.invoice_id == invoice_id,
-            Payment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-    
+        return self._get_many_by(Payment.invoice_id, invoice_id, skip, limit)
+
     def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[Payment]:
-        return self.db.query(Payment).filter(
-            Payment.patient_id == patient_id,
-            Payment.deleted_at == None
-        ).offset(skip).limit(limit).all()
-    
+        return self._get_many_by(Payment.patient_id, patient_id, skip, limit)
+
     def get_by_clinic_id(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[Payment]:
-        return self.db.query(Payment).filter(
-            Payment.clinic_id == clinic_id,
-            Payment.deleted_at == None
-        ).offset(skip).limit(limit).all()
+        return self._get_many_by(Payment.clinic_id, clinic_id, skip, limit)
 
     def update(self, payment_id: int, payment: schemas.PaymentUpdate, updated_by_user_id: int) -> Optional[Payment]:
-        db_payment = self.get_by_id(payment_id)
-        if db_payment:
-            payment_data = payment.model_dump(exclude_unset=True)
-            payment_data["updated_by_user_id"] = updated_by_user_id
-            for key, value in payment_data.items():
-                setattr(db_payment, key, value)
-            self.db.commit()
-            self.db.refresh(db_payment)
-        return db_payment
+        payment_data = payment.model_dump(exclude_unset=True)
+        payment_data["updated_by_user_id"] = updated_by_user_id
+        return self._update(payment_id, payment_data)
 
     def delete(self, payment_id: int) -> bool:
-        payment = self.get_by_id(payment_id)
-        if payment:
-            payment.deleted_at = func.now()
-            self.db.commit()
-            return True
-        return False
+        return self._soft_delete(payment_id, deleted_at=func.now())
@@ -5,6 +5,15 @@ from datetime import datetime
 
 from app.domain.models.performance_metrics import PerformanceMetrics
 from app.domain.models.performance_metrics_schemas import PerformanceMetricCreate, PerformanceMetricUpdate
+from app.data.write_path import insert_one, update_by_id, soft_delete_by_id
+from app.data.filters import Eq, FilterSpec, Gte, Lte
+
+PERFORMANCE_METRIC_FILTERS = FilterSpec(
+    clinic_id=Eq(PerformanceMetrics.clinic_id),
+    category=Eq(PerformanceMetrics.metric_category),
+    start_date=Gte(PerformanceMetrics.measurement_date),
+    end_date=Lte(PerformanceMetrics.measurement_date),
+)
 
 class PerformanceMetricsRepository:
     def __init__(self, db: Session):
@@ -16,20 +25,25 @@ class PerformanceMetricsRepository:
             created_by_user_id=created_by_user_id,
             updated_by_user_id=created_by_user_id
         )
-        self.db.add(db_metric)
-        self.db.commit()
-        self.db.refresh(db_metric)
-        return db_metric
+        return insert_one(self.db, db_metric)
 
     def get_by_id(self, metric_id: int) -> Optional[PerformanceMetrics]:
         return self.db.query(PerformanceMetrics).filter(
-            PerformanceMetrics.id == metric_id,
-            PerformanceMetrics.deleted_at == None
+            PerformanceMetrics.id == metric_id
         ).first()
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[PerformanceMetrics]:
         return self.db.query(PerformanceMetrics)\
-            .filter(PerformanceMetrics.deleted_at == None)\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+
+    def find(self, skip: int = 0, limit: int = 100, **filters) -> List[PerformanceMetrics]:
+        query = PERFORMANCE_METRIC_FILTERS.apply(
+            self.db.query(PerformanceMetrics),
+            **filters
+        )
+        return query.order_by(PerformanceMetrics.measurement_date.desc(), PerformanceMetrics.id.desc())\
             .offset(skip)\
             .limit(limit)\
             .all()
@@ -37,8 +51,7 @@ class PerformanceMetricsRepository:
     def get_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PerformanceMetrics]:
         return self.db.query(PerformanceMetrics)\
             .filter(
-                PerformanceMetrics.clinic_id == clinic_id,
-                PerformanceMetrics.deleted_at == None
+                PerformanceMetrics.clinic_id == clinic_id
             )\
             .offset(skip)\
             .limit(limit)\
@@ -47,28 +60,16 @@ class PerformanceMetricsRepository:
     def get_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[PerformanceMetrics]:
         return self.db.query(PerformanceMetrics)\
             .filter(
-                PerformanceMetrics.metric_category == category,
-                PerformanceMetrics.deleted_at == None
+                PerformanceMetrics.metric_category == category
             )\
             .offset(skip)\
             .limit(limit)\
             .all()
 
     def update(self, metric_id: int, metric: PerformanceMetricUpdate, updated_by_user_id: int) -> Optional[PerformanceMetrics]:
-        db_metric = self.get_by_id(metric_id)
-        if db_metric:
-            update_data = metric.model_dump(exclude_unset=True)
-            update_data["updated_by_user_id"] = updated_by_user_id
-            for field, value in update_data.items():
-                setattr(db_metric, field, value)
-            self.db.commit()
-            self.db.refresh(db_metric)
-        return db_metric
+        update_data = metric.model_dump(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        return update_by_id(self.db, PerformanceMetrics, metric_id, update_data)
 
     def soft_delete(self, metric_id: int) -> bool:
-        db_metric = self.get_by_id(metric_id)
-        if db_metric:
-            db_metric.deleted_at = datetime.now()
-            self.db.commit()
-            return True
-        return False
+        return soft_delete_by_id(self.db, PerformanceMetrics, metric_id, deleted_at=datetime.now())
@@ -1,70 +1,48 @@
-from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.domain.models.prescription import Prescription
-from app.domain.schemas import PrescriptionCreate, PrescriptionUpdate
+from app.domain.schemas import PrescriptionCreate, PrescriptionUpdate, PrescriptionResponse
 from datetime import datetime
+from sqlalchemy import bindparam
+from app.data.read_plans import ReadPlan
+from app.data.filters import Eq, FilterSpec
+from app.data.repositories.base_repository import BaseRepository
+
+PRESCRIPTION_READ_PLAN = ReadPlan(Prescription, PrescriptionResponse)
+
+class PrescriptionRepository(BaseRepository[Prescription]):
+    model = Prescription
+    read_plan = PRESCRIPTION_READ_PLAN
+    filters = FilterSpec(
+        patient_id=Eq(Prescription.patient_id),
+        consultation_id=Eq(Prescription.consultation_id),
+    )
 
-class PrescriptionRepository:
-    def __init__(self, db: Session):
-        self.db = db
-    
     def create(self, prescription: PrescriptionCreate, created_by_user_id: int) -> Prescription:
         db_prescription = Prescription(
             **prescription.dict(),
             created_by_user_id=created_by_user_id,
             updated_by_user_id=created_by_user_id
         )
-        self.db.add(db_prescription)
-        self.db.commit()
-        self.db.refresh(db_prescription)
-        return db_prescription
-
-    def get_by_id(self, prescription_id: int) -> Optional[Prescription]:
-        return self.db.query(Prescription).filter(
-            Prescription.id == prescription_id,
-            Prescription.deleted_at.is_(None)
-        ).first()
+        return self._insert(db_prescription)
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Prescription]:
-        return self.db.query(Prescription).filter(
-            Prescription.deleted_at.is_(None)
-        ).offset(skip).limit(limit).all()
-    
     def get_by_patient_id(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[Prescription]:
-        return self.db.query(Prescription).filter(
-            Prescription.patient_id == patient_id,
-            Prescription.deleted_at.is_(None)
-        ).offset(skip).limit(limit).all()
+        return self._get_many_by(Prescription.patient_id, patient_id, skip, limit)
 
     def get_by_consultation_id(self, consultation_id: int, skip: int = 0, limit: int = 100) -> List[Prescription]:
-        return self.db.query(Prescription).filter(
-            Prescription.consultation_id == consultation_id,
-            Prescription.deleted_at.is_(None)
-        ).offset(skip).limit(limit).all()
+        return self._get_many_by(Prescription.consultation_id, consultation_id, skip, limit)
 
     def get_active_by_patient(self, patient_id: int) -> List[Prescription]:
-        return self.db.query(Prescription).filter(
-            Prescription.patient_id == patient_id,
+        statement = self._statement("active_by_patient", lambda: self._select().where(
+            Prescription.patient_id == bindparam("patient_id"),
             Prescription.is_active == True,
-            Prescription.deleted_at.is_(None),
-            Prescription.expiration_date > datetime.utcnow()
-        ).all()
+            Prescription.expiration_date > bindparam("now")
+        ))
+        return self._scalars(statement, {"patient_id": patient_id, "now": datetime.utcnow()}).all()
 
     def update(self, prescription_id: int, prescription: PrescriptionUpdate, updated_by_user_id: int) -> Optional[Prescription]:
-        db_prescription = self.get_by_id(prescription_id)
-        if db_prescription:
-            update_data = prescription.dict(exclude_unset=True)
-            update_data["updated_by_user_id"] = updated_by_user_id
-            for key, value in update_data.items():
-                setattr(db_prescription, key, value)
-            self.db.commit()
-            self.db.refresh(db_prescription)
-        return db_prescription
+        update_data = prescription.dict(exclude_unset=True)
+        update_data["updated_by_user_id"] = updated_by_user_id
+        return self._update(prescription_id, update_data)
 
     def soft_delete(self, prescription_id: int) -> bool:
-        db_prescription = self.get_by_id(prescription_id)
-        if db_prescription:
-            db_prescription.deleted_at = datetime.utcnow()
-            self.db.commit()
-            return True
-        return False
+        return self._soft_delete(prescription_id, deleted_at=datetime.utcnow())
@@ -1,54 +1,36 @@
-from sqlalchemy.orm import Session
 from app.domain import models, schemas
 from typing import List, Optional
 from datetime import datetime
+from app.data.repositories.base_repository import BaseRepository
 
-class ResourceRepository:
-    def __init__(self, db: Session):
-        self.db = db
+class ResourceRepository(BaseRepository[models.Resource]):
+    model = models.Resource
 
     def create(self, resource: schemas.ResourceCreate, user_id: int) -> models.Resource:
         db_resource = models.Resource(
             **resource.dict(),
             created_by_user_id=user_id
         )
-        self.db.add(db_resource)
-        self.db.commit()
-        self.db.refresh(db_resource)
-        return db_resource
-
-    def get_by_id(self, resource_id: int) -> Optional[models.Resource]:
-        return self.db.query(models.Resource).filter(
-            models.Resource.id == resource_id,
-            models.Resource.deleted_at.is_(None)
-        ).first()
-
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[models.Resource]:
-        return self.db.query(models.Resource).filter(
-            models.Resource.deleted_at.is_(None)
-        ).offset(skip).limit(limit).all()
+        return self._insert(db_resource)
 
     def get_by_clinic(self, clinic_id: int) -> List[models.Resource]:
-        return self.db.query(models.Resource).filter(
+        return self._get_many_by(models.Resource.clinic_id, clinic_id)
+
+    def get_schedulable(self, clinic_id: int, resource_type: Optional[str] = None) -> List[models.Resource]:
+        """Recursos activos de la clínica que admiten citas."""
+        query = self.db.query(models.Resource).filter(
             models.Resource.clinic_id == clinic_id,
-            models.Resource.deleted_at.is_(None)
-        ).all()
+            models.Resource.is_schedulable == True,
+            models.Resource.is_active == True,
+        )
+        if resource_type:
+            query = query.filter(models.Resource.resource_type == resource_type)
+        return query.order_by(models.Resource.id).all()
 
     def update(self, resource_id: int, resource: schemas.ResourceUpdate, user_id: int) -> Optional[models.Resource]:
-        db_resource = self.get_by_id(resource_id)
-        if db_resource:
-            update_data = resource.dict(exclude_unset=True)
-            update_data["updated_by_user_id"] = user_id
-            for key, value in update_data.items():
-                setattr(db_resource, key, value)
-            self.db.commit()
-            self.db.refresh(db_resource)
-        return db_resource
+        update_data = resource.dict(exclude_unset=True)
+        update_data["updated_by_user_id"] = user_id
+        return self._update(resource_id, update_data)
 
     def delete(self, resource_id: int) -> bool:
-        db_resource = self.get_by_id(resource_id)
-        if db_resource:
-            db_resource.deleted_at = datetime.utcnow()
-            self.db.commit()
-            return True
-        return False
\ No newline at end of file
+        return self._soft_delete(resource_id, deleted_at=datetime.utcnow())
@@ -1,36 +1,29 @@
-from sqlalchemy.orm import Session
 from app.domain.models import Role
 from app.domain import schemas
+from app.core.cache import invalidate_role_principals
+from app.data.repositories.base_repository import BaseRepository
 
-class RoleRepository:
-    def __init__(self, db: Session):
-        self.db = db
+class RoleRepository(BaseRepository[Role]):
+    model = Role
 
     def get_role_by_id(self, role_id: int):
-        return self.db.query(Role).filter(Role.id == role_id).first()
+        return self.get_by_id(role_id)
 
     def get_role_by_name(self, name: str):
-        return self.db.query(Role).filter(Role.name == name).first()
+        return self._get_one_by((Role.name, name))
 
     def get_roles(self, skip: int = 0, limit: int = 100):
-        return self.db.query(Role).offset(skip).limit(limit).all()
+        return self.get_all(skip, limit)
 
     def create_role(self, role: schemas.RoleCreate):
         db_role = Role(name=role.name, description=role.description)
-        self.db.add(db_role)
-        self.db.commit()
-        self.db.refresh(db_role)
-        return db_role
+        return self._insert(db_role)
 
     def update_role(self, role_id: int, role_update: schemas.RoleUpdate):
-        db_role = self.get_role_by_id(role_id)
+        update_data = role_update.model_dump(exclude_unset=True)
+        db_role = self._update(role_id, update_data)
         if db_role:
-            update_data = role_update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(db_role, key, value)
-            self.db.add(db_role)
-            self.db.commit()
-            self.db.refresh(db_role)
+            invalidate_role_principals(role_id)
         return db_role
 
     def delete_role(self, role_id: int):
@@ -38,4 +31,5 @@ class RoleRepository:
         if db_role:
             self.db.delete(db_role)
             self.db.commit()
-        return db_role
\ No newline at end of file
+            invalidate_role_principals(role_id)
+        return db_role
@@ -1,7 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
-from app.domain.models import User
+from typing import List
+from app.domain.models import Role, User
 from app.domain import schemas
 from passlib.context import CryptContext
+from app.core.cache import invalidate_user_principal
+from app.core.soft_delete import INCLUDE_DELETED
+from app.data.write_path import insert_one, update_by_id
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,11 +22,18 @@ class UserRepository:
     def get_user_by_id(self, user_id: int):
         return self.db.query(User).filter(User.id == user_id).first()
 
-    def get_user_by_username(self, username: str):
-        return self.db.query(User).filter(User.username == username).first()
+    def get_user_by_username(self, username: str, include_deleted: bool = False):
+        # include_deleted: username y email son únicos también entre usuarios borrados
+        return self.db.query(User)\
+            .execution_options(**{INCLUDE_DELETED: include_deleted})\
+            .filter(User.username == username)\
+            .first()
 
-    def get_user_by_email(self, email: str):
-        return self.db.query(User).filter(User.email == email).first()
+    def get_user_by_email(self, email: str, include_deleted: bool = False):
+        return self.db.query(User)\
+            .execution_options(**{INCLUDE_DELETED: include_deleted})\
+            .filter(User.email == email)\
+            .first()
 
     def create_user(self, user: schemas.UserCreate):
         hashed_password = get_password_hash(user.password)
@@ -38,10 +49,7 @@ class UserRepository:
             associated_clinic_id=user.associated_clinic_id,
             is_active=True # Por defecto activo al crear
         )
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return db_user
+        return insert_one(self.db, db_user)
 
     def get_users(self, skip: int = 0, limit: int = 100):
         return self.db.query(User)\
@@ -53,6 +61,19 @@ class UserRepository:
             .limit(limit)\
             .all()
 
+    def get_clinic_user_ids(self, clinic_id: int, role_names: List[str]) -> List[int]:
+        """Ids de los usuarios activos de la clínica con alguno de los roles."""
+        return [
+            user_id for user_id, in self.db.query(User.id)
+            .join(User.role)
+            .filter(
+                User.associated_clinic_id == clinic_id,
+                User.is_active == True,
+                Role.name.in_(role_names),
+            )
+            .order_by(User.id)
+        ]
+
     def get_users_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100):
         return self.db.query(User)\
             .filter(User.associated_clinic_id == clinic_id)\
@@ -65,16 +86,12 @@ class UserRepository:
             .all()
 
     def update_user(self, user_id: int, user_update: schemas.UserUpdate):
-        db_user = self.get_user_by_id(user_id)
+        update_data = user_update.model_dump(exclude_unset=True)
+        if "password" in update_data:
+            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        db_user = update_by_id(self.db, User, user_id, update_data)
         if db_user:
-            update_data = user_update.model_dump(exclude_unset=True)
-            if "password" in update_data:
-                update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
-            for key, value in update_data.items():
-                setattr(db_user, key, value)
-            self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
+            invalidate_user_principal(user_id)
         return db_user
 
     def delete_user(self, user_id: int):
@@ -82,4 +99,5 @@ class UserRepository:
         if db_user:
             self.db.delete(db_user)
             self.db.commit()
+            invalidate_user_principal(user_id)
         return db_user
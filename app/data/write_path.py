@@ -0,0 +1,198 @@
+"""
+Ruta de escritura compartida por los repositorios.
+
+Cada operación hace un único viaje de escritura a la base de datos:
+
+- insert_one: INSERT que trae en la misma sentencia los valores generados por
+  el servidor (created_at, updated_at...) gracias a `eager_defaults` y
+  RETURNING; no hay `refresh` posterior.
+- update_by_id: un único `UPDATE ... WHERE id = :id AND deleted_at IS NULL`
+  con las columnas recibidas, devolviendo la fila con RETURNING cuando el
+  dialecto lo soporta (en MySQL se relee la fila por clave primaria).
+- soft_delete_by_id: un único UPDATE que marca `deleted_at`, sin SELECT previo.
+- insert_chunked: altas masivas con un INSERT de varias filas por bloque y una
+  transacción por bloque; si un bloque falla se reintenta fila a fila con
+  SAVEPOINT para aislar las filas erróneas.
+
+Los repositorios asíncronos usan directamente `update_statement` y
+`soft_delete_statement`.
+
+Las sentencias que no pasan por el flush (UPDATE por id, borrado lógico,
+INSERT de varias filas) anotan su cambio para la auditoría automática (ver
+app/data/change_capture.py); lo que pasa por el flush se captura allí.
+
+Las sesiones se crean con `expire_on_commit=False`, así que los objetos
+devueltos siguen cargados después del commit. Con `commit=False` (y
+`before_commit` en insert_chunked) el llamador escribe otras filas en la misma
+transacción antes de confirmar, como el índice de búsqueda de pacientes.
+"""
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
+
+from sqlalchemy import insert, inspect, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.data.change_capture import created_change, record_change, statement_change
+
+ModelT = TypeVar("ModelT")
+
+
+def _primary_key(model):
+    return inspect(model).primary_key[0]
+
+
+def _column_values(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    # Solo columnas mapeadas; el patrón anterior (setattr) ignoraba el resto
+    columns = inspect(model).column_attrs.keys()
+    return {key: value for key, value in values.items() if key in columns}
+
+
+def _active_filter(model, statement):
+    if hasattr(model, "deleted_at"):
+        return statement.where(model.deleted_at.is_(None))
+    return statement
+
+
+def insert_one(db: Session, obj: ModelT, commit: bool = True) -> ModelT:
+    """Inserta `obj` y confirma; los valores por defecto del servidor llegan con el INSERT."""
+    db.add(obj)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return obj
+
+
+def update_statement(model, obj_id: Any, values: Dict[str, Any]):
+    """`UPDATE ... WHERE pk = :id [AND deleted_at IS NULL]` con las columnas de `values`, o None si no hay ninguna."""
+    values = _column_values(model, values)
+    if not values:
+        return None
+    return _active_filter(model, update(model).where(_primary_key(model) == obj_id)).values(**values)
+
+
+def soft_delete_statement(model, obj_id: Any, deleted_at: Any, **values: Any):
+    return (
+        update(model)
+        .where(_primary_key(model) == obj_id, model.deleted_at.is_(None))
+        .values(deleted_at=deleted_at, **values)
+    )
+
+
+def update_by_id(db: Session, model: Type[ModelT], obj_id: Any, values: Dict[str, Any], commit: bool = True) -> Optional[ModelT]:
+    """Actualiza las columnas de `values` de una fila activa. Devuelve None si no existe."""
+    statement = update_statement(model, obj_id, values)
+    if statement is None:
+        return _active_filter(model, db.query(model).filter(_primary_key(model) == obj_id)).first()
+    change = statement_change(db, model, "UPDATE", obj_id, values)
+
+    if db.get_bind(clause=statement).dialect.update_returning:
+        result = db.execute(
+            statement.returning(model),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )
+        db_obj = result.scalars().first()
+        if db_obj is not None:
+            record_change(db, change)
+        if commit:
+            db.commit()
+        return db_obj
+
+    result = db.execute(statement, execution_options={"synchronize_session": False})
+    if result.rowcount > 0:
+        record_change(db, change)
+    if commit:
+        db.commit()
+    if result.rowcount == 0:
+        return None
+    return db.get(model, obj_id, populate_existing=True)
+
+
+def soft_delete_by_id(db: Session, model, obj_id: Any, deleted_at: Any, commit: bool = True, **values: Any) -> bool:
+    """Marca `deleted_at` (y `values`) en una fila activa con un único UPDATE."""
+    change = statement_change(db, model, "DELETE", obj_id, {"deleted_at": deleted_at, **values})
+    result = db.execute(
+        soft_delete_statement(model, obj_id, deleted_at, **values),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount > 0:
+        record_change(db, change)
+    if commit:
+        db.commit()
+    return result.rowcount > 0
+
+
+def insert_many(db: Session, model: Type[ModelT], rows: List[Dict[str, Any]], returning: bool = True) -> List[Optional[ModelT]]:
+    """
+    Inserta `rows` sin confirmar. Con RETURNING en executemany (SQLite,
+    MariaDB) es un único INSERT de varias filas que devuelve los objetos en el
+    orden de `rows`; en MySQL el ORM necesita el id de cada fila y emite un
+    INSERT por fila dentro de la misma transacción.
+
+    Con `returning=False` no se crean objetos ni se leen ids: un solo
+    executemany (INSERT de varias filas también en MySQL) y None por fila.
+    """
+    if not rows:
+        return []
+    if not returning:
+        db.execute(insert(model), rows)
+        for row in rows:
+            record_change(db, created_change(model, values=row))
+        return [None] * len(rows)
+    if db.get_bind(mapper=inspect(model)).dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(model).returning(model, sort_by_parameter_order=True)
+        objs = list(db.scalars(statement, rows))
+        for obj in objs:
+            record_change(db, created_change(model, obj=obj))
+        return objs
+    objs = [model(**row) for row in rows]
+    db.add_all(objs)
+    db.flush()
+    return objs
+
+
+def _failure(error: DBAPIError) -> str:
+    return str(error.orig) if error.orig is not None else str(error)
+
+
+def insert_chunked(
+    db: Session,
+    model: Type[ModelT],
+    rows: List[Dict[str, Any]],
+    chunk_size: int,
+    returning: bool = True,
+    before_commit: Optional[Callable[[List[ModelT]], None]] = None,
+) -> List[Union[ModelT, str, None]]:
+    """
+    Inserta `rows` en bloques de `chunk_size`, confirmando cada bloque. Devuelve,
+    en el orden de `rows`, el objeto creado (None con `returning=False`) o el
+    mensaje de error de esa fila. `before_commit` recibe los objetos creados
+    de cada bloque antes de confirmarlo, en su misma transacción.
+    """
+    results: List[Union[ModelT, str, None]] = []
+
+    def commit_chunk(outcomes: List[Union[ModelT, str, None]]) -> None:
+        if before_commit is not None:
+            before_commit([outcome for outcome in outcomes if isinstance(outcome, model)])
+        db.commit()
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            outcomes = insert_many(db, model, chunk, returning)
+            commit_chunk(outcomes)
+            results.extend(outcomes)
+            continue
+        except DBAPIError:
+            db.rollback()
+        # El bloque falló: fila a fila, cada una en su SAVEPOINT, y un solo commit
+        outcomes = []
+        for row in chunk:
+            try:
+                with db.begin_nested():
+                    outcomes.extend(insert_many(db, model, [row], returning))
+            except DBAPIError as error:
+                outcomes.append(_failure(error))
+        commit_chunk(outcomes)
+        results.extend(outcomes)
+    return results
@@ -1,3 +1,6 @@
+import importlib
+import pkgutil
+
 from .appointment import Appointment
 from .clinic import Clinic
 from .permission import Permission
@@ -17,6 +20,7 @@ from .consentform import ConsentForm
 from .invoice import Invoice
 from .payment import Payment
 from .lead import Lead
+from .patient_search_token import PatientSearchToken
 
 
 __all__ = [
@@ -38,5 +42,18 @@ __all__ = [
     "ConsentForm",
     "Invoice",
     "Payment",
-    "Lead"
+    "Lead",
+    "PatientSearchToken",
+    "load_all_models",
 ]
+
+
+def load_all_models() -> None:
+    """
+    Importa todos los módulos de modelos (no solo los de arriba) para que sus
+    tablas queden en Base.metadata y se puedan configurar las relaciones
+    fuera de la API (migraciones, comandos, pruebas).
+    """
+    for module in pkgutil.iter_modules(__path__):
+        if not module.name.endswith("_schemas"):
+            importlib.import_module(f"{__name__}.{module.name}")
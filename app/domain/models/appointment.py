@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 from typing import List, Optional
 
-class Appointment(Base):
+class Appointment(SoftDeleteMixin, Base):
     __tablename__ = "appointments"
+    # Agendas por clínica, médico y paciente ordenadas por hora de inicio
+    __table_args__ = (
+        Index("ix_appointments_clinic_id_deleted_at_start_time", "clinic_id", "deleted_at", "start_time"),
+        Index("ix_appointments_primary_doctor_id_deleted_at_start_time", "primary_doctor_id", "deleted_at", "start_time"),
+        Index("ix_appointments_patient_id_deleted_at_start_time", "patient_id", "deleted_at", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=False)    
@@ -2,10 +2,11 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, E
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 from typing import List, Optional
 
-class AppointmentService(Base):
+class AppointmentService(SoftDeleteMixin, Base):
     __tablename__ = "appointmentservices"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -1,12 +1,20 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
-from sqlalchemy.dialects.mysql import JSON
+from app.core.compressed_json import CompressedJSON
 from typing import List, Optional
 
 class AuditLog(Base):
     __tablename__ = "auditlogs"
+    # Listado por fecha, búsquedas por entidad, clínica o usuario y lecturas de un paciente
+    __table_args__ = (
+        Index("ix_auditlogs_created_at", "created_at"),
+        Index("ix_auditlogs_entity_type_entity_id", "entity_type", "entity_id", "created_at"),
+        Index("ix_auditlogs_clinic_id_created_at", "clinic_id", "created_at"),
+        Index("ix_auditlogs_user_id_created_at", "user_id", "created_at"),
+        Index("ix_auditlogs_action_type_entity_id_created_at", "action_type", "entity_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -15,12 +23,13 @@ class AuditLog(Base):
     entity_type = Column(String(100))  # e.g., 'Patient', 'Appointment', 'User'
     entity_id = Column(String(100))  # String to support various ID formats
     details = Column(Text)
-    old_values = Column(JSON)
-    new_values = Column(JSON)
+    # JSON comprimido a partir de AUDIT_PAYLOAD_COMPRESS_MIN_BYTES
+    old_values = Column(CompressedJSON)
+    new_values = Column(CompressedJSON)
     ip_address = Column(String(50))
     user_agent = Column(String(255))
     severity = Column(String(50))  # e.g., 'Low', 'Medium', 'High', 'Critical'
-    related_records = Column(JSON)  # For storing related record IDs
+    related_records = Column(CompressedJSON)  # For storing related record IDs
     system_component = Column(String(100))  # e.g., 'Authentication', 'Patient Management'
     is_reviewed = Column(Boolean, default=False)
     reviewed_by_user_id = Column(Integer, ForeignKey("users.id"))
@@ -2,10 +2,11 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, E
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 from typing import List, Optional
 
-class Clinic(Base):
+class Clinic(SoftDeleteMixin, Base):
     __tablename__ = "clinics"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 
-class ConsentForm(Base):
+class ConsentForm(SoftDeleteMixin, Base):
     __tablename__ = "consentforms"
+    # Consentimientos de un paciente
+    __table_args__ = (
+        Index("ix_consentforms_patient_id_deleted_at", "patient_id", "deleted_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 
-class Consultation(Base):
+class Consultation(SoftDeleteMixin, Base):
     __tablename__ = "consultations"
+    # Historial de consultas de un paciente
+    __table_args__ = (
+        Index("ix_consultations_patient_id_deleted_at_consultation_date", "patient_id", "deleted_at", "consultation_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     appointment_id = Column(Integer, ForeignKey("appointments.id", ondelete="CASCADE"), nullable=False)
@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, JSON
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.orm import relationship
 
-class EducationalResource(Base):
+class EducationalResource(SoftDeleteMixin, Base):
     __tablename__ = "educational_resources"
     
     id = Column(Integer, primary_key=True, index=True)
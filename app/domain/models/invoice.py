@@ -1,11 +1,23 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 
-class Invoice(Base):
+class Invoice(SoftDeleteMixin, Base):
     __tablename__ = "invoices"
+    # Facturas de un paciente o de una clínica en orden de creación; la
+    # búsqueda ordena y filtra por fecha de emisión o de vencimiento y busca
+    # en las notas con FULLTEXT
+    __table_args__ = (
+        Index("ix_invoices_patient_id_deleted_at_created_at", "patient_id", "deleted_at", "created_at"),
+        Index("ix_invoices_clinic_id_deleted_at_created_at", "clinic_id", "deleted_at", "created_at"),
+        Index("ix_invoices_clinic_id_deleted_at_issue_date", "clinic_id", "deleted_at", "issue_date"),
+        Index("ix_invoices_clinic_id_deleted_at_due_date", "clinic_id", "deleted_at", "due_date"),
+        Index("ix_invoices_deleted_at_issue_date", "deleted_at", "issue_date"),
+        Index("ft_invoices_notes", "notes", mysql_prefix="FULLTEXT"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
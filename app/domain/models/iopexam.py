@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 
-class IOPExam(Base):
+class IOPExam(SoftDeleteMixin, Base):
     __tablename__ = "iopexams"
+    # Mediciones de PIO de una consulta
+    __table_args__ = (
+        Index("ix_iopexams_consultation_id_deleted_at", "consultation_id", "deleted_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     consultation_id = Column(Integer, ForeignKey("consultations.id", ondelete="CASCADE"), nullable=False)
@@ -1,15 +1,23 @@
-from sqlalchemy import Column, Integer, String, Enum, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Enum, Text, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Lead(Base):
     __tablename__ = "leads"
+    # Filtro por estado en el orden del listado
+    __table_args__ = (
+        Index("ix_leads_status_created_at", "status", "created_at"),
+    )
 
     lead_id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     mobile_phone = Column(String(20), nullable=False, unique=True)
     email = Column(String(150))
+    # Columnas de búsqueda y deduplicación (app.core.contact); las mantiene LeadRepository
+    mobile_phone_e164 = Column(String(16), unique=True, index=True)
+    mobile_phone_suffix = Column(String(7), index=True)
+    email_normalized = Column(String(150), unique=True, index=True)
     age = Column(Integer)
     city = Column(String(80))
     service_id = Column(Integer, ForeignKey("services.id"))
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 from typing import List, Optional
 
-class Patient(Base):
+class Patient(SoftDeleteMixin, Base):
     __tablename__ = "patients"
+    # Listado de pacientes por clínica (orden del cursor)
+    __table_args__ = (
+        Index("ix_patients_clinic_id_deleted_at_created_at", "clinic_id", "deleted_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     clinic_id = Column(Integer, ForeignKey("clinics.id"), nullable=False)
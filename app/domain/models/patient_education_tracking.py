@@ -2,8 +2,9 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, T
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 
-class PatientEducationTracking(Base):
+class PatientEducationTracking(SoftDeleteMixin, Base):
     __tablename__ = "patient_education_tracking"
     
     id = Column(Integer, primary_key=True, index=True)
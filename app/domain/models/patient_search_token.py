@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, SmallInteger, ForeignKey, Index
+from app.core.database import Base
+
+class PatientSearchToken(Base):
+    """Índice invertido de la búsqueda de pacientes (app.data.patient_search)."""
+    __tablename__ = "patient_search_tokens"
+    # La clave primaria (clinic_id, token, patient_id) resuelve la búsqueda;
+    # el índice por paciente, la reindexación al actualizar o borrar
+    __table_args__ = (
+        Index("ix_patient_search_tokens_patient_id", "patient_id"),
+    )
+
+    clinic_id = Column(Integer, primary_key=True, autoincrement=False)
+    token = Column(String(32), primary_key=True)
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    weight = Column(SmallInteger, nullable=False)
+
+    def __repr__(self):
+        return f"<PatientSearchToken(clinic_id={self.clinic_id}, token='{self.token}', patient_id={self.patient_id})>"
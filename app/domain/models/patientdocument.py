@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 
-class PatientDocument(Base):
+class PatientDocument(SoftDeleteMixin, Base):
     __tablename__ = "patientdocuments"
+    # Documentos de un paciente
+    __table_args__ = (
+        Index("ix_patientdocuments_patient_id_deleted_at", "patient_id", "deleted_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 
-class Payment(Base):
+class Payment(SoftDeleteMixin, Base):
     __tablename__ = "payments"
+    # Pagos de una factura o de un paciente
+    __table_args__ = (
+        Index("ix_payments_invoice_id_deleted_at", "invoice_id", "deleted_at"),
+        Index("ix_payments_patient_id_deleted_at", "patient_id", "deleted_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
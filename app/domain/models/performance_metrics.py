@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Date, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Date, Enum, Text, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from datetime import datetime
 
-class PerformanceMetrics(Base):
+class PerformanceMetrics(SoftDeleteMixin, Base):
     __tablename__ = "performance_metrics"
+    # Métricas de una clínica por fecha de medición
+    __table_args__ = (
+        Index("ix_performance_metrics_clinic_id_deleted_at_measurement_date", "clinic_id", "deleted_at", "measurement_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     clinic_id = Column(Integer, ForeignKey("clinics.id", ondelete="CASCADE"), nullable=False)
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 
-class Prescription(Base):
+class Prescription(SoftDeleteMixin, Base):
     __tablename__ = "prescriptions"
+    # Recetas de un paciente o de una consulta
+    __table_args__ = (
+        Index("ix_prescriptions_patient_id_deleted_at", "patient_id", "deleted_at"),
+        Index("ix_prescriptions_consultation_id_deleted_at", "consultation_id", "deleted_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     consultation_id = Column(Integer, ForeignKey("consultations.id", ondelete="CASCADE"), nullable=False)
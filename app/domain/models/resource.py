@@ -2,8 +2,9 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, E
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 
-class Resource(Base):
+class Resource(SoftDeleteMixin, Base):
     __tablename__ = "resources"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -1,14 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from sqlalchemy.dialects.mysql import JSON
 from typing import List, Optional
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     __allow_unmapped__ = True
     
     __tablename__ = "users"
+    # Usuarios de una clínica
+    __table_args__ = (
+        Index("ix_users_associated_clinic_id_deleted_at", "associated_clinic_id", "deleted_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, index=True, nullable=False)
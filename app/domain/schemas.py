@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, HttpUrl, constr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Generic, TypeVar
 from datetime import datetime
 from enum import Enum
 from decimal import Decimal
@@ -17,6 +17,16 @@ class Message(BaseModel):
     message: str
     details: Optional[Dict[str, Any]] = None
 
+# Página de resultados paginados por cursor (ver app/data/pagination.py)
+ItemT = TypeVar("ItemT")
+
+class CursorPage(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 # Schemas para Roles
 class RoleBase(BaseModel):
     name: str
@@ -250,6 +260,7 @@ class AppointmentUpdate(BaseModel):
     cancellation_reason: Optional[str] = None
     confirmation_sent_at: Optional[datetime] = None
     reminder_sent_at: Optional[datetime] = None
+    updated_by_user_id: Optional[int] = None
 
 class AppointmentInDB(AppointmentBase):
     id: int
@@ -820,6 +831,14 @@ class ConsentFormResponse(ConsentFormInDB):
     signed_by_user: Optional[UserInDB] = None
 
 # Schemas para Facturas
+class InvoicePaymentStatusEnum(str, Enum):
+    PENDING = "Pending"
+    PAID = "Paid"
+    PARTIALLY_PAID = "Partially Paid"
+    OVERDUE = "Overdue"
+    CANCELLED = "Cancelled"
+    REFUNDED = "Refunded"
+
 class InvoiceBase(BaseModel):
     patient_id: int
     clinic_id: int
@@ -1034,6 +1053,7 @@ class LeadStatusUpdate(BaseModel):
 
 class LeadInDB(LeadBase):
     lead_id: int
+    mobile_phone_e164: Optional[str] = None
     status: LeadStatusEnum
     appointment_id: Optional[int] = None
     created_at: datetime
@@ -1044,3 +1064,95 @@ class LeadInDB(LeadBase):
 
 class LeadResponse(LeadInDB):
     service: Optional[ServiceInDB] = None
+
+# Schemas para altas masivas
+class BulkItemResult(BaseModel):
+    index: int
+    status: str  # "created" o "failed"
+    id: Optional[int] = None
+    errors: List[str] = []
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+# Schemas para la importación de exámenes de equipos
+class ExamImportError(BaseModel):
+    line: int
+    errors: List[str]
+
+class ExamImportResult(BaseModel):
+    exam_type: str
+    total: int
+    created: int
+    failed: int
+    errors: List[ExamImportError]
+    errors_truncated: bool = False
+
+# Schemas para telemetría de administración
+class DatabasePoolStatus(BaseModel):
+    name: str
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    wait_ms_p50: Optional[float] = None
+    wait_ms_p95: Optional[float] = None
+    wait_ms_p99: Optional[float] = None
+    wait_ms_max: Optional[float] = None
+    peak_in_use: Optional[int] = None
+    peak_overflow: Optional[int] = None
+
+class SQLStatementStats(BaseModel):
+    fingerprint: str
+    sql: str
+    calls: int
+    rows: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+class AuditSinkStatus(BaseModel):
+    running: bool
+    queued: int
+    queue_size: int
+    overflow_policy: str
+    submitted: int
+    written: int
+    batches: int
+    dropped: int
+    rejected: int
+    spilled: int
+    replayed: int
+    failures: int
+
+
+class ReadAccessStatus(BaseModel):
+    pending_groups: int
+    recorded: int
+    skipped: int
+    flushed_rows: int
+
+
+class AvailabilitySlot(BaseModel):
+    start: datetime
+    end: datetime
+    doctor_id: Optional[int] = None
+    resource_id: Optional[int] = None
+
+
+class AvailabilityResult(BaseModel):
+    clinic_id: int
+    service_id: int
+    timezone: str
+    duration_minutes: int
+    slots: List[AvailabilitySlot]
+    # Hay más huecos en la ventana que los devueltos
+    truncated: bool
@@ -1,9 +1,13 @@
-from app.data.repositories.appointment_repository import AppointmentRepository
+from app.data.repositories.appointment_repository import AppointmentRepository, APPOINTMENT_FILTERS
+from app.data.export import stream_export
+from app.domain.models import Appointment
 from app.data.repositories.appointment_service_repository import AppointmentServiceRepository
 from app.domain import schemas
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from app.core.config import settings
+from app.services.bulk import BulkBatch
 
 class AppointmentService:
     def __init__(self, db: Session):
@@ -12,6 +16,14 @@ class AppointmentService:
     def create_appointment(self, appointment: schemas.AppointmentCreate) -> schemas.AppointmentInDB:
         return self.repository.create(appointment)
 
+    def create_appointments(self, items: List[Dict[str, Any]], created_by_user_id: int) -> dict:
+        """Alta masiva: valida cada cita e inserta las válidas por bloques."""
+        batch = BulkBatch(schemas.AppointmentCreate, items)
+        pending = batch.pending()
+        rows = [dict(item.dict(), created_by_user_id=created_by_user_id) for _, item in pending]
+        batch.record(pending, self.repository.create_many(rows, settings.BULK_CHUNK_SIZE))
+        return batch.result()
+
     def get_appointment(self, appointment_id: int) -> Optional[schemas.AppointmentInDB]:
         return self.repository.get_by_id(appointment_id)    
     
@@ -24,21 +36,23 @@ class AppointmentService:
         doctor_id: Optional[int] = None,
         status: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None
     ) -> List[schemas.AppointmentInDB]:
-        # Si se proporcionan criterios de filtrado específicos, aplicarlos
-        if clinic_id is not None:
-            return self.repository.get_by_clinic_id(clinic_id, skip, limit)
-        elif patient_id is not None:
-            return self.repository.get_by_patient_id(patient_id, skip, limit)
-        elif doctor_id is not None:
-            return self.repository.get_by_doctor_id(doctor_id, skip, limit)
-        elif status is not None:
-            return self.repository.get_by_status(status, skip, limit)
-        elif start_date is not None or end_date is not None:
-            return self.repository.get_by_date_range(start_date, end_date, skip, limit)
-        # Si no hay filtros específicos, devolver todas las citas
-        return self.repository.get_all(skip, limit)
+        # Todos los filtros recibidos se combinan en una sola consulta
+        return self.repository.find(
+            skip, limit, cursor,
+            clinic_id=clinic_id,
+            patient_id=patient_id,
+            doctor_id=doctor_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    def export_appointments(self, **filters):
+        """Columnas y filas (iterador perezoso) de las citas filtradas, para exportar en streaming."""
+        return stream_export(Appointment, APPOINTMENT_FILTERS, **filters)
 
     def update_appointment(self, appointment_id: int, appointment: schemas.AppointmentUpdate) -> Optional[schemas.AppointmentInDB]:
         return self.repository.update(appointment_id, appointment)
@@ -46,14 +60,14 @@ class AppointmentService:
     def delete_appointment(self, appointment_id: int) -> bool:
         return self.repository.delete(appointment_id)
 
-    def get_appointments_by_patient(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[schemas.AppointmentInDB]:
-        return self.repository.get_by_patient_id(patient_id, skip, limit)
+    def get_appointments_by_patient(self, patient_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AppointmentInDB]:
+        return self.repository.get_by_patient_id(patient_id, skip, limit, cursor)
 
-    def get_appointments_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[schemas.AppointmentInDB]:
-        return self.repository.get_by_clinic_id(clinic_id, skip, limit)
+    def get_appointments_by_clinic(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AppointmentInDB]:
+        return self.repository.get_by_clinic_id(clinic_id, skip, limit, cursor)
 
-    def get_appointments_by_doctor(self, doctor_id: int, skip: int = 0, limit: int = 100) -> List[schemas.AppointmentInDB]:
-        return self.repository.get_by_doctor_id(doctor_id, skip, limit)    
+    def get_appointments_by_doctor(self, doctor_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AppointmentInDB]:
+        return self.repository.get_by_doctor_id(doctor_id, skip, limit, cursor)    
     
     def cancel_appointment(self, appointment_id: int, cancellation_reason: Optional[str] = None) -> bool:
         """
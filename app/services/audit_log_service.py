@@ -1,7 +1,14 @@
-from app.data.repositories.audit_log_repository import AuditLogRepository
+from itertools import chain, islice
+
+from app.data.repositories.audit_log_repository import AuditLogRepository, AUDIT_LOG_FILTERS, AUDIT_LOG_KEYSET
+from app.data.audit_archive import audit_archive
+from app.data.export import stream_export
+from app.data.pagination import Page
+from app.domain.models.auditlog import AuditLog
 from app.domain import schemas
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from fastapi import HTTPException, status
 
 class AuditLogService:
@@ -12,7 +19,7 @@ class AuditLogService:
         return self.repository.create(audit_log)
 
     def get_audit_log(self, audit_log_id: int) -> schemas.AuditLogInDB:
-        db_audit_log = self.repository.get_by_id(audit_log_id)
+        db_audit_log = self.repository.get_by_id(audit_log_id) or audit_archive.get(audit_log_id)
         if not db_audit_log:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -20,20 +27,69 @@ class AuditLogService:
             )
         return db_audit_log
 
-    def get_audit_logs(self, skip: int = 0, limit: int = 100) -> List[schemas.AuditLogInDB]:
-        return self.repository.get_all(skip, limit)
+    def get_audit_logs(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AuditLogInDB]:
+        return self.repository.get_all(skip, limit, cursor)
+
+    def search_audit_logs(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        clinic_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        severity: Optional[str] = None,
+        action_type: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        is_reviewed: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ) -> List[schemas.AuditLogInDB]:
+        """
+        Primero la tabla (meses recientes); cuando se agota, continúa con los
+        meses archivados, que son siempre anteriores.
+        """
+        filters = dict(
+            clinic_id=clinic_id,
+            user_id=user_id,
+            severity=severity,
+            action_type=action_type,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_reviewed=is_reviewed,
+        )
+        result = self.repository.find(skip, limit, cursor, **filters)
+        if cursor is None:
+            if len(result) == limit:
+                return result
+            # Página incompleta: el resto sale del archivo, descontando lo que `skip` saltó en la tabla
+            archive_skip = 0 if result else max(skip - self.repository.count(**filters), 0)
+            return result + list(islice(audit_archive.search(filters), archive_skip, archive_skip + limit - len(result)))
 
-    def get_clinic_audit_logs(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[schemas.AuditLogInDB]:
-        return self.repository.get_by_clinic(clinic_id, skip, limit)
+        if result.next_cursor is not None:
+            return result
+        # Tabla agotada: se completa con el archivo y se ordena todo junto, por si
+        # quedan en la tabla filas tardías de meses ya archivados
+        before = tuple(AUDIT_LOG_KEYSET.decode(cursor)) if cursor else None
+        items = result.items + list(islice(audit_archive.search(filters, before), limit + 1))
+        items.sort(key=AUDIT_LOG_KEYSET.values, reverse=True)
+        next_cursor = AUDIT_LOG_KEYSET.encode(items[limit - 1]) if len(items) > limit else None
+        return Page(items[:limit], next_cursor)
 
-    def get_user_audit_logs(self, user_id: int, skip: int = 0, limit: int = 100) -> List[schemas.AuditLogInDB]:
-        return self.repository.get_by_user(user_id, skip, limit)
+    def get_clinic_audit_logs(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AuditLogInDB]:
+        return self.repository.get_by_clinic(clinic_id, skip, limit, cursor)
+
+    def get_user_audit_logs(self, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AuditLogInDB]:
+        return self.repository.get_by_user(user_id, skip, limit, cursor)
 
     def get_entity_audit_logs(self, entity_type: str, entity_id: str) -> List[schemas.AuditLogInDB]:
-        return self.repository.get_by_entity(entity_type, entity_id)
+        archived = audit_archive.search({"entity_type": entity_type, "entity_id": entity_id})
+        return self.repository.get_by_entity(entity_type, entity_id) + list(archived)
 
-    def get_unreviewed_audit_logs(self, skip: int = 0, limit: int = 100) -> List[schemas.AuditLogInDB]:
-        return self.repository.get_unreviewed(skip, limit)
+    def get_unreviewed_audit_logs(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.AuditLogInDB]:
+        return self.repository.get_unreviewed(skip, limit, cursor)
 
     def update_audit_log(self, 
                         audit_log_id: int, 
@@ -49,3 +105,11 @@ class AuditLogService:
 
     def delete_audit_log(self, audit_log_id: int) -> bool:
         return self.repository.delete(audit_log_id)
+
+    def export_audit_logs(self, **filters):
+        """
+        Columnas y filas (iterador perezoso) de los registros filtrados, para
+        exportar en streaming: primero los archivados (más antiguos) y después los de la tabla.
+        """
+        columns, rows = stream_export(AuditLog, AUDIT_LOG_FILTERS, **filters)
+        return columns, chain(audit_archive.search(filters, descending=False), rows)
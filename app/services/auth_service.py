@@ -5,9 +5,12 @@ from app.core.config import settings
 from app.domain import schemas
 from app.data.repositories.user_repository import UserRepository, verify_password
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
-from app.domain.models import Role, RolePermission
+from app.domain.models import Role, RolePermission, User
+from app.core.cache import principal_cache
+from app.core.principal import Principal
 
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 SECRET_KEY = settings.SECRET_KEY
@@ -39,34 +42,60 @@ def authenticate_user(db: Session, username: str, password: str):
         return None
     return user
 
-def get_current_user_from_token(db: Session, token: str):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_username(token: str) -> str:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = schemas.TokenData(username=username)
     except JWTError:
-        raise credentials_exception
-    
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_username(token_data.username)
+        raise _credentials_exception()
+    return token_data.username
+
+def get_current_user_from_token(db: Session, token: str) -> Principal:
+    username = _token_username(token)
+    user = principal_cache.get(username)
+    if user is None:
+        user = _load_principal(db, username)
+        if user is None:
+            raise _credentials_exception()
+        principal_cache.set(username, user)
+    return user
+
+async def get_current_user_from_token_async(db: AsyncSession, token: str) -> Principal:
+    """Igual que get_current_user_from_token, sin salir del event loop."""
+    username = _token_username(token)
+    user = principal_cache.get(username)
     if user is None:
-        raise credentials_exception
-    
-    # Cargar relaciones necesarias
-    user = db.query(user.__class__)\
-        .filter(user.__class__.id == user.id)\
+        # La misma carga, ejecutada sobre la conexión asíncrona de la sesión
+        user = await db.run_sync(_load_principal, username)
+        if user is None:
+            raise _credentials_exception()
+        principal_cache.set(username, user)
+    return user
+
+def _load_principal(db: Session, username: str) -> Optional[Principal]:
+    # Usuario y rol en una consulta (join); permisos del rol en una segunda
+    user = db.query(User)\
+        .filter(User.username == username)\
         .options(
-            joinedload(user.__class__.role)
+            joinedload(User.role)
             .subqueryload(Role.role_permissions)
             .joinedload(RolePermission.permission)
         )\
         .first()
-    
-    return user
+    if user is None:
+        return None
+
+    # Copia inmutable: se comparte entre peticiones e hilos sin tocar la sesión.
+    # Los permisos del rol quedan fijados al cargar y caducan con la entrada de
+    # principal_cache (su TTL), también en los workers que no atendieron el cambio
+    return Principal.from_user(user)
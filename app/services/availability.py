@@ -0,0 +1,124 @@
+"""
+Motor de disponibilidad: huecos libres de médicos y recursos.
+
+Las citas de la ventana consultada se cargan una sola vez en un
+`IntervalIndex` por médico y otro por recurso: los intervalos ocupados,
+ordenados y fusionados en dos listas (inicios y fines), de modo que saber si
+un tramo está libre es una búsqueda binaria y recorrer los huecos de un día
+es lineal en las citas de ese día.
+
+Todas las horas son hora local de la clínica sin zona, como se guardan las
+citas. Los huecos empiezan en la apertura y cada `step` minutos:
+
+    windows = opening_windows(start, end, time(9), time(18), [0, 1, 2, 3, 4])
+    slots = free_slots(windows, timedelta(minutes=30), timedelta(minutes=15), doctors, resources)
+"""
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class IntervalIndex:
+    """Intervalos ocupados [inicio, fin) de un médico o recurso, fusionados y ordenados."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime]] = ()):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                # Solapa o toca al anterior: se fusionan
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        # Primer intervalo que termina después de `start`: está libre si empieza después de `end`
+        index = bisect_right(self.ends, start)
+        return index == len(self.starts) or self.starts[index] >= end
+
+    def gaps(self, start: datetime, end: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """Tramos libres dentro de [start, end)."""
+        index = bisect_right(self.ends, start)
+        cursor = start
+        while index < len(self.starts) and self.starts[index] < end:
+            if self.starts[index] > cursor:
+                yield cursor, self.starts[index]
+            cursor = max(cursor, self.ends[index])
+            index += 1
+        if cursor < end:
+            yield cursor, end
+
+
+class Slot(NamedTuple):
+    start: datetime
+    end: datetime
+    doctor_id: Optional[int]
+    resource_id: Optional[int]
+
+
+# (apertura del día, inicio, fin): la apertura fija la rejilla de inicios
+Window = Tuple[datetime, datetime, datetime]
+
+
+def opening_windows(
+    start: datetime, end: datetime, opening: time, closing: time, workdays: Sequence[int]
+) -> Iterator[Window]:
+    """Horario de atención de cada día laborable entre `start` y `end`, recortado a ese rango."""
+    day: date = start.date()
+    while day <= end.date():
+        if day.weekday() in workdays:
+            opens = datetime.combine(day, opening)
+            window_start = max(opens, start)
+            window_end = min(datetime.combine(day, closing), end)
+            if window_start < window_end:
+                yield opens, window_start, window_end
+        day += timedelta(days=1)
+
+
+def _first_start(moment: datetime, anchor: datetime, step: timedelta) -> datetime:
+    """Primer inicio de la rejilla (anchor + k * step) que no es anterior a `moment`."""
+    steps = -((anchor - moment) // step)
+    return anchor + max(steps, 0) * step
+
+
+def free_slots(
+    windows: Iterable[Window],
+    duration: timedelta,
+    step: timedelta,
+    doctors: Optional[Dict[int, IntervalIndex]],
+    resources: Optional[Dict[int, IntervalIndex]] = None,
+) -> Iterator[Slot]:
+    """
+    Huecos de `duration` en orden de inicio (y de médico/recurso). Con
+    `doctors`, uno por médico libre, con el primer recurso de `resources`
+    libre si se indican; sin médicos, uno por recurso libre. Es perezoso por
+    días: pedir pocos huecos no recorre toda la ventana.
+    """
+    owners = doctors if doctors is not None else resources or {}
+    for anchor, start, end in windows:
+        day = []
+        for owner_id, index in owners.items():
+            for gap_start, gap_end in index.gaps(start, end):
+                slot_start = _first_start(gap_start, anchor, step)
+                while slot_start + duration <= gap_end:
+                    slot_end = slot_start + duration
+                    if doctors is None:
+                        day.append(Slot(slot_start, slot_end, None, owner_id))
+                    elif resources is None:
+                        day.append(Slot(slot_start, slot_end, owner_id, None))
+                    else:
+                        resource_id = next(
+                            (resource_id for resource_id, busy in resources.items() if busy.is_free(slot_start, slot_end)),
+                            None,
+                        )
+                        if resource_id is not None:
+                            day.append(Slot(slot_start, slot_end, owner_id, resource_id))
+                    slot_start += step
+        day.sort(key=lambda slot: (slot.start, slot.doctor_id or 0, slot.resource_id or 0))
+        yield from day
@@ -0,0 +1,145 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.data.repositories.appointment_repository import AppointmentRepository
+from app.data.repositories.clinic_repository import ClinicRepository
+from app.data.repositories.resource_repository import ResourceRepository
+from app.data.repositories.service_repository import ServiceRepository
+from app.data.repositories.user_repository import UserRepository
+from app.services.availability import IntervalIndex, free_slots, opening_windows
+
+
+def _zone(name: str):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        # Sin base de datos de zonas (p. ej. Windows sin tzdata) UTC sigue funcionando
+        if name.upper() == "UTC":
+            return timezone.utc
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Zona horaria de la clínica desconocida: {name}",
+        )
+
+
+def _local(moment: datetime, zone) -> datetime:
+    """Hora local de la clínica sin zona (como se guardan las citas)."""
+    if moment.tzinfo is not None:
+        return moment.astimezone(zone).replace(tzinfo=None)
+    return moment
+
+
+def _indexes(ids: List[int], rows, position: int) -> Dict[int, IntervalIndex]:
+    busy = defaultdict(list)
+    for row in rows:
+        if row[position] is not None:
+            busy[row[position]].append((row[2], row[3]))
+    return {owner_id: IntervalIndex(busy[owner_id]) for owner_id in ids}
+
+
+class AvailabilityService:
+    def __init__(self, db: Session):
+        self.clinics = ClinicRepository(db)
+        self.services = ServiceRepository(db)
+        self.resources = ResourceRepository(db)
+        self.users = UserRepository(db)
+        self.appointments = AppointmentRepository(db)
+
+    def find_slots(
+        self,
+        clinic_id: int,
+        service_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        doctor_id: Optional[int] = None,
+        resource_id: Optional[int] = None,
+        resource_type: Optional[str] = None,
+        with_doctor: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Huecos reservables del servicio en [start_date, end_date): por médico
+        (`doctor_id` o todos los de la clínica), con un recurso libre si se
+        pide `resource_id` o `resource_type`; con with_doctor=False, solo por
+        recurso. Las fechas sin zona se entienden en la hora local de la clínica.
+        """
+        clinic = self.clinics.get_by_id(clinic_id)
+        if not clinic:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Clínica no encontrada")
+        service = self.services.get_by_id(service_id, clinic_id)
+        if not service or not service.is_active:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Servicio no encontrado en la clínica")
+        zone = _zone(clinic.timezone)
+
+        # Sin huecos en el pasado
+        start = max(_local(start_date, zone), datetime.now(zone).replace(tzinfo=None))
+        end = _local(end_date, zone)
+        if end <= start:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El rango de fechas está vacío o ya pasó")
+        if end - start > timedelta(days=settings.AVAILABILITY_MAX_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El rango no puede superar {settings.AVAILABILITY_MAX_DAYS} días",
+            )
+
+        resources = None
+        if resource_id is not None or resource_type:
+            candidates = self.resources.get_schedulable(clinic_id, resource_type)
+            resource_ids = [resource.id for resource in candidates if resource_id is None or resource.id == resource_id]
+            if resource_id is not None and not resource_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Recurso no encontrado o no admite citas",
+                )
+            resources = _indexes(resource_ids, self.appointments.get_busy_intervals(start, end, clinic_id=clinic_id), 1)
+        elif not with_doctor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Sin médico hay que indicar resource_id o resource_type",
+            )
+
+        doctors = None
+        if with_doctor:
+            doctor_ids = [doctor_id] if doctor_id is not None else self.users.get_clinic_user_ids(
+                clinic_id, settings.AVAILABILITY_DOCTOR_ROLES
+            )
+            rows = self.appointments.get_busy_intervals(start, end, doctor_ids=doctor_ids) if doctor_ids else []
+            doctors = _indexes(doctor_ids, rows, 0)
+
+        limit = min(limit, settings.AVAILABILITY_MAX_SLOTS)
+        windows = opening_windows(
+            start, end, settings.AVAILABILITY_OPENING_TIME, settings.AVAILABILITY_CLOSING_TIME, settings.AVAILABILITY_WORKDAYS
+        )
+        slots = list(islice(
+            free_slots(
+                windows,
+                timedelta(minutes=service.duration_minutes),
+                timedelta(minutes=settings.AVAILABILITY_SLOT_STEP_MINUTES),
+                doctors,
+                resources,
+            ),
+            limit + 1,
+        ))
+        return {
+            "clinic_id": clinic_id,
+            "service_id": service_id,
+            "timezone": clinic.timezone,
+            "duration_minutes": service.duration_minutes,
+            "slots": [
+                {
+                    "start": slot.start.replace(tzinfo=zone),
+                    "end": slot.end.replace(tzinfo=zone),
+                    "doctor_id": slot.doctor_id,
+                    "resource_id": slot.resource_id,
+                }
+                for slot in slots[:limit]
+            ],
+            "truncated": len(slots) > limit,
+        }
@@ -0,0 +1,89 @@
+"""
+Altas masivas con resultado por elemento.
+
+Cada elemento se valida con el schema Create de la entidad; los inválidos o
+rechazados por reglas de negocio se informan sin impedir el alta del resto:
+
+    batch = BulkBatch(schemas.AppointmentCreate, items)
+    pending = batch.pending()
+    batch.record(pending, repository.create_many([item.dict() for _, item in pending]))
+    return batch.result()
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+
+
+def validation_messages(error: ValidationError) -> List[str]:
+    """Un mensaje `campo: error` por cada fallo de validación."""
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return messages
+
+
+class BulkBatch:
+    def __init__(self, schema: Type[BaseModel], items: List[Dict[str, Any]], id_attr: str = "id"):
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Máximo {settings.BULK_MAX_ITEMS} elementos por petición",
+            )
+        self.size = len(items)
+        self.id_attr = id_attr
+        self.valid: List[Tuple[int, Any]] = []
+        self.errors: Dict[int, List[str]] = {}
+        self.created: Dict[int, Any] = {}
+        for index, item in enumerate(items):
+            try:
+                self.valid.append((index, schema.model_validate(item)))
+            except ValidationError as error:
+                self.errors[index] = validation_messages(error)
+
+    def reject(self, index: int, message: str) -> None:
+        self.errors.setdefault(index, []).append(message)
+
+    def pending(self) -> List[Tuple[int, Any]]:
+        """Elementos válidos y no rechazados, con su posición en la petición."""
+        return [(index, item) for index, item in self.valid if index not in self.errors]
+
+    def record(self, pending: List[Tuple[int, Any]], outcomes: List[Any]) -> None:
+        """Asocia a cada elemento pendiente el objeto creado o el error devuelto por `insert_chunked`."""
+        for (index, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, str):
+                self.reject(index, outcome)
+            else:
+                self.created[index] = getattr(outcome, self.id_attr)
+
+    def result(self) -> dict:
+        results = []
+        for index in range(self.size):
+            if index in self.created:
+                results.append({"index": index, "status": "created", "id": self.created[index]})
+            else:
+                results.append({"index": index, "status": "failed", "errors": self.errors.get(index, [])})
+        return {"created": len(self.created), "failed": self.size - len(self.created), "results": results}
+
+
+def duplicates(
+    pending: List[Tuple[int, Any]], field: str, normalize: Optional[Callable[[Any], Any]] = None
+) -> Dict[int, str]:
+    """
+    Elementos cuyo `field` ya apareció antes en el mismo lote: {índice: valor}.
+    Con `normalize` se comparan los valores normalizados.
+    """
+    seen = set()
+    repeated = {}
+    for index, item in pending:
+        value = getattr(item, field)
+        key = normalize(value) if normalize and value is not None else value
+        if key is None:
+            continue
+        if key in seen:
+            repeated[index] = value
+        seen.add(key)
+    return repeated
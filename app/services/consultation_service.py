@@ -2,6 +2,7 @@ from app.data.repositories.consultation_repository import ConsultationRepository
 from app.domain import schemas
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from fastapi import HTTPException, status
 
 class ConsultationService:
@@ -20,8 +21,26 @@ class ConsultationService:
             )
         return consultation
 
-    def get_consultations(self, skip: int = 0, limit: int = 100) -> List[schemas.ConsultationInDB]:
-        return self.repository.get_all(skip, limit)
+    def get_consultations(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        clinic_id: Optional[int] = None,
+        patient_id: Optional[int] = None,
+        doctor_id: Optional[int] = None,
+        appointment_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> List[schemas.ConsultationInDB]:
+        return self.repository.find(
+            skip, limit,
+            clinic_id=clinic_id,
+            patient_id=patient_id,
+            doctor_id=doctor_id,
+            appointment_id=appointment_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
     def get_consultations_by_patient(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[schemas.ConsultationInDB]:
         return self.repository.get_by_patient_id(patient_id, skip, limit)
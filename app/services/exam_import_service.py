@@ -0,0 +1,271 @@
+"""
+Importación de exportaciones de equipos (autorefractómetros, tonómetros...).
+
+El archivo (CSV con cabecera o NDJSON, una fila JSON por línea) se lee fila a
+fila sin cargarlo en memoria. Las columnas se corresponden con los campos del
+schema Create del examen; las columnas desconocidas se guardan en `exam_data`.
+
+Cada fila se asocia a una consulta por, en este orden:
+
+- `consultation_id`
+- `appointment_id` (consulta de esa cita)
+- `patient_identifier` + `exam_date` (última consulta del paciente ese día)
+
+Las filas se procesan en lotes de IMPORT_BATCH_SIZE: la resolución de
+consultas son como mucho tres consultas por lote y el alta un único INSERT de
+varias filas en su propia transacción. Las filas erróneas se informan con su
+número de línea sin detener la importación.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.sql_metrics import batched_queries
+from app.data.repositories.consultation_repository import ConsultationRepository
+from app.data.write_path import insert_chunked
+from app.domain import schemas
+from app.domain.models.iopexam import IOPExam
+from app.domain.models.refractionexam import RefractionExam
+from app.domain.models.visualacuityexam import VisualAcuityExam
+from app.services.bulk import validation_messages
+
+
+class ExamType:
+    def __init__(self, model, create_schema: Type[BaseModel]):
+        self.model = model
+        self.create_schema = create_schema
+
+
+EXAM_TYPES = {
+    "refraction": ExamType(RefractionExam, schemas.RefractionExamCreate),
+    "iop": ExamType(IOPExam, schemas.IOPExamCreate),
+    "visual_acuity": ExamType(VisualAcuityExam, schemas.VisualAcuityExamCreate),
+}
+
+FILE_FORMATS = ("csv", "ndjson")
+
+# Columnas que solo sirven para encontrar la consulta
+RESOLUTION_COLUMNS = ("appointment_id", "patient_identifier")
+
+
+def detect_format(filename: Optional[str], file_format: Optional[str] = None) -> str:
+    if file_format:
+        file_format = file_format.lower()
+    elif filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        file_format = {"jsonl": "ndjson", "json": "ndjson"}.get(extension, extension)
+    if file_format not in FILE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato no soportado; use uno de: {', '.join(FILE_FORMATS)}",
+        )
+    return file_format
+
+
+def iter_records(stream: BinaryIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """(número de línea, registro) por fila; un registro ilegible llega como ValueError."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as error:
+                yield reader.line_num, ValueError(f"CSV inválido: {error}")
+                continue
+            # Las celdas vacías son campos sin valor
+            yield reader.line_num, {key: (value if value != "" else None) for key, value in record.items() if key}
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield line_number, ValueError(f"JSON inválido: {error}")
+                continue
+            if not isinstance(record, dict):
+                yield line_number, ValueError("Cada línea debe ser un objeto JSON")
+                continue
+            yield line_number, record
+
+
+class _Row:
+    __slots__ = ("line", "values", "appointment_id", "patient_identifier")
+
+    def __init__(self, line: int, values: Dict[str, Any], appointment_id, patient_identifier):
+        self.line = line
+        self.values = values
+        self.appointment_id = appointment_id
+        self.patient_identifier = patient_identifier
+
+
+class ExamImportReport:
+    def __init__(self, exam_type: str):
+        self.exam_type = exam_type
+        self.total = 0
+        self.created = 0
+        self.errors: List[dict] = []
+        self.failed = 0
+
+    def fail(self, line: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": messages})
+
+    def result(self) -> dict:
+        return {
+            "exam_type": self.exam_type,
+            "total": self.total,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class ExamImportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.consultations = ConsultationRepository(db)
+
+    def import_file(
+        self,
+        exam_type: str,
+        stream: BinaryIO,
+        file_format: str,
+        created_by_user_id: Optional[int],
+        clinic_id: Optional[int] = None,
+    ) -> dict:
+        """Importa el archivo por lotes; con `clinic_id` solo se aceptan consultas de esa clínica."""
+        if exam_type not in EXAM_TYPES:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tipo de examen desconocido")
+        kind = EXAM_TYPES[exam_type]
+        report = ExamImportReport(exam_type)
+        records = iter_records(stream, file_format)
+        with batched_queries():
+            while True:
+                batch = list(islice(records, settings.IMPORT_BATCH_SIZE))
+                if not batch:
+                    break
+                report.total += len(batch)
+                self._import_batch(kind, batch, report, created_by_user_id, clinic_id)
+        return report.result()
+
+    def _parse(self, kind: ExamType, line: int, record: Dict[str, Any]) -> _Row:
+        fields = kind.create_schema.model_fields
+        values = {key: value for key, value in record.items() if key in fields}
+        extra = {
+            key: value for key, value in record.items()
+            if key not in fields and key not in RESOLUTION_COLUMNS and value is not None
+        }
+        exam_data = values.get("exam_data")
+        if isinstance(exam_data, str):
+            try:
+                exam_data = json.loads(exam_data)
+            except ValueError:
+                raise ValueError("exam_data: JSON inválido")
+        if extra:
+            exam_data = {**(exam_data or {}), **extra}
+        values["exam_data"] = exam_data
+
+        appointment_id = record.get("appointment_id")
+        patient_identifier = record.get("patient_identifier")
+        if values.get("consultation_id") is None and appointment_id is None and patient_identifier is None:
+            raise ValueError("Se requiere consultation_id, appointment_id o patient_identifier")
+        if appointment_id is not None:
+            try:
+                appointment_id = int(appointment_id)
+            except (TypeError, ValueError):
+                raise ValueError("appointment_id: debe ser un entero")
+
+        # La consulta se resuelve después; 0 solo cumple el schema mientras tanto
+        validated = kind.create_schema.model_validate({**values, "consultation_id": values.get("consultation_id") or 0})
+        values = validated.dict()
+        by_patient_day = not values["consultation_id"] and appointment_id is None
+        if by_patient_day and values["exam_date"] is None:
+            raise ValueError("exam_date es obligatorio para resolver la consulta por patient_identifier")
+        return _Row(line, values, appointment_id, str(patient_identifier) if patient_identifier is not None else None)
+
+    def _import_batch(self, kind: ExamType, batch, report: ExamImportReport, created_by_user_id, clinic_id) -> None:
+        rows: List[_Row] = []
+        for line, record in batch:
+            if isinstance(record, ValueError):
+                report.fail(line, [str(record)])
+                continue
+            try:
+                rows.append(self._parse(kind, line, record))
+            except ValidationError as error:
+                report.fail(line, validation_messages(error))
+            except ValueError as error:
+                report.fail(line, [str(error)])
+
+        resolved = self._resolve(rows, clinic_id)
+        imported_at = datetime.now()
+        pending: List[_Row] = []
+        for row in rows:
+            consultation_id = resolved.get(id(row))
+            if consultation_id is None:
+                report.fail(row.line, ["No se encontró la consulta"])
+                continue
+            row.values.update(
+                consultation_id=consultation_id,
+                created_by_user_id=created_by_user_id,
+                updated_by_user_id=created_by_user_id,
+            )
+            if row.values["exam_date"] is None:
+                # Mismo valor que el defecto de la columna, pero explícito: el INSERT
+                # de varias filas necesita que todas tengan las mismas columnas
+                row.values["exam_date"] = imported_at
+            pending.append(row)
+
+        outcomes = insert_chunked(
+            self.db, kind.model, [row.values for row in pending], settings.IMPORT_BATCH_SIZE, returning=False
+        )
+        for row, outcome in zip(pending, outcomes):
+            if isinstance(outcome, str):
+                report.fail(row.line, [outcome])
+            else:
+                report.created += 1
+
+    def _resolve(self, rows: List[_Row], clinic_id: Optional[int]) -> Dict[int, int]:
+        """{id(fila): consultation_id} para todo el lote, con una consulta por criterio."""
+        by_id = [row for row in rows if row.values["consultation_id"]]
+        by_appointment = [row for row in rows if not row.values["consultation_id"] and row.appointment_id is not None]
+        by_patient_day = [
+            row for row in rows
+            if not row.values["consultation_id"] and row.appointment_id is None
+        ]
+
+        existing = self.consultations.existing_ids((row.values["consultation_id"] for row in by_id), clinic_id)
+        appointments = self.consultations.ids_by_appointment((row.appointment_id for row in by_appointment), clinic_id)
+        patient_days = self.consultations.ids_by_patient_day(
+            ((row.patient_identifier, _day(row.values["exam_date"])) for row in by_patient_day), clinic_id
+        )
+
+        resolved = {}
+        for row in by_id:
+            if row.values["consultation_id"] in existing:
+                resolved[id(row)] = row.values["consultation_id"]
+        for row in by_appointment:
+            if row.appointment_id in appointments:
+                resolved[id(row)] = appointments[row.appointment_id]
+        for row in by_patient_day:
+            key = (row.patient_identifier, _day(row.values["exam_date"]))
+            if key in patient_days:
+                resolved[id(row)] = patient_days[key]
+        return resolved
+
+
+def _day(value) -> date:
+    return value.date() if hasattr(value, "date") else value
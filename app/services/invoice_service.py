@@ -1,8 +1,11 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from app.data.repositories.invoice_repository import InvoiceRepository
+from app.data.repositories.invoice_repository import InvoiceRepository, INVOICE_FILTERS
+from app.data.export import stream_export
+from app.domain.models import Invoice
 from app.domain import schemas
 from typing import List, Optional
+from app.core.config import settings
 
 class InvoiceService:
     def __init__(self, db: Session):
@@ -27,20 +30,28 @@ class InvoiceService:
             )
         return invoice
     
-    def get_invoices(self, skip: int = 0, limit: int = 100) -> List[schemas.InvoiceInDB]:
-        return self.repository.get_all(skip, limit)
+    def get_invoices(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        clinic_id: Optional[int] = None,
+        patient_id: Optional[int] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[schemas.InvoiceInDB]:
+        return self.repository.get_all(skip, limit, clinic_id, patient_id, status, cursor)
     
-    def get_patient_invoices(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[schemas.InvoiceInDB]:
-        return self.repository.get_by_patient_id(patient_id, skip, limit)
+    def get_patient_invoices(self, patient_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.InvoiceInDB]:
+        return self.repository.get_by_patient_id(patient_id, skip, limit, cursor)
     
-    def get_clinic_invoices(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[schemas.InvoiceInDB]:
-        return self.repository.get_by_clinic_id(clinic_id, skip, limit)
+    def get_clinic_invoices(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.InvoiceInDB]:
+        return self.repository.get_by_clinic_id(clinic_id, skip, limit, cursor)
     
-    def get_consultation_invoices(self, consultation_id: int, skip: int = 0, limit: int = 100) -> List[schemas.InvoiceInDB]:
-        return self.repository.get_by_consultation_id(consultation_id, skip, limit)
+    def get_consultation_invoices(self, consultation_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.InvoiceInDB]:
+        return self.repository.get_by_consultation_id(consultation_id, skip, limit, cursor)
     
-    def get_appointment_invoices(self, appointment_id: int, skip: int = 0, limit: int = 100) -> List[schemas.InvoiceInDB]:
-        return self.repository.get_by_appointment_id(appointment_id, skip, limit)
+    def get_appointment_invoices(self, appointment_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.InvoiceInDB]:
+        return self.repository.get_by_appointment_id(appointment_id, skip, limit, cursor)
     
     def update_invoice(self, invoice_id: int, invoice: schemas.InvoiceUpdate, updated_by_user_id: int) -> schemas.InvoiceInDB:
         updated_invoice = self.repository.update(invoice_id, invoice, updated_by_user_id)
@@ -59,5 +70,10 @@ class InvoiceService:
             )
         return True
     
-    def search_invoices(self, search_term: str, clinic_id: Optional[int] = None) -> List[schemas.InvoiceInDB]:
-        return self.repository.search_invoices(search_term, clinic_id)
+    def search_invoices(self, limit: int = 50, cursor: Optional[str] = None, **filters):
+        """Búsqueda estructurada; la página nunca supera INVOICE_SEARCH_MAX_LIMIT facturas."""
+        return self.repository.search(min(limit, settings.INVOICE_SEARCH_MAX_LIMIT), cursor, **filters)
+
+    def export_invoices(self, **filters):
+        """Columnas y filas (iterador perezoso) de las facturas filtradas, para exportar en streaming."""
+        return stream_export(Invoice, INVOICE_FILTERS, **filters)
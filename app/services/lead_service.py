@@ -1,15 +1,83 @@
 from app.data.repositories.lead_repository import LeadRepository
 from app.domain import schemas
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.contact import normalize_email, normalize_phone
+from app.services.bulk import BulkBatch, duplicates
 
 class LeadService:
     def __init__(self, db: Session):
         self.repository = LeadRepository(db)
 
+    def _check_contact(self, mobile_phone: Optional[str], email: Optional[str], lead_id: Optional[int] = None) -> None:
+        """Rechaza teléfonos inválidos y teléfonos o emails que ya tiene otro lead (comparados normalizados)"""
+        e164 = normalize_phone(mobile_phone)
+        if mobile_phone is not None and e164 is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El teléfono {mobile_phone} no es válido"
+            )
+        email_key = normalize_email(email)
+        conflict = self.repository.find_contact_conflict(e164, email_key, exclude_lead_id=lead_id)
+        if conflict is None:
+            return
+        self._raise_conflict(bool(e164 and conflict.mobile_phone_e164 == e164), mobile_phone, email, lead_id)
+
+    def _raise_conflict(self, phone: bool, mobile_phone: Optional[str], email: Optional[str],
+                        lead_id: Optional[int] = None) -> None:
+        other = "otro lead" if lead_id is not None else "un lead"
+        if phone:
+            detail = f"Ya existe {other} con el teléfono {mobile_phone}"
+        else:
+            detail = f"Ya existe {other} con el email {email}"
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+    def _unique_violation(self, error: IntegrityError, mobile_phone: Optional[str], email: Optional[str],
+                          lead_id: Optional[int] = None) -> None:
+        """Otro lead ocupó el teléfono o el email entre la comprobación y la escritura: mismo 409"""
+        self.repository.db.rollback()
+        message = str(error.orig)
+        if "mobile_phone_e164" in message:
+            self._raise_conflict(True, mobile_phone, email, lead_id)
+        if "email_normalized" in message:
+            self._raise_conflict(False, mobile_phone, email, lead_id)
+        raise error
+
     def create_lead(self, lead: schemas.LeadCreate) -> schemas.LeadInDB:
-        """Crea un nuevo lead"""
-        return self.repository.create(lead)
+        """Crea un nuevo lead si su teléfono y email no están ya registrados"""
+        self._check_contact(lead.mobile_phone, lead.email)
+        try:
+            return self.repository.create(lead)
+        except IntegrityError as error:
+            self._unique_violation(error, lead.mobile_phone, lead.email)
+
+    def create_leads(self, items: List[Dict[str, Any]]) -> dict:
+        """Alta masiva: valida cada lead, rechaza teléfonos o emails ya usados o repetidos e inserta por bloques"""
+        batch = BulkBatch(schemas.LeadCreate, items, id_attr="lead_id")
+        for index, item in batch.pending():
+            if normalize_phone(item.mobile_phone) is None:
+                batch.reject(index, f"El teléfono {item.mobile_phone} no es válido")
+        pending = batch.pending()
+        phones, emails = self.repository.get_existing_contacts(
+            [normalize_phone(item.mobile_phone) for _, item in pending],
+            [normalize_email(item.email) for _, item in pending],
+        )
+        for index, item in pending:
+            if normalize_phone(item.mobile_phone) in phones:
+                batch.reject(index, f"Ya existe un lead con el teléfono {item.mobile_phone}")
+            elif item.email and normalize_email(item.email) in emails:
+                batch.reject(index, f"Ya existe un lead con el email {item.email}")
+        for field, normalize in (("mobile_phone", normalize_phone), ("email", normalize_email)):
+            for index, value in duplicates(batch.pending(), field, normalize).items():
+                batch.reject(index, f"El valor {value} de {field} está repetido en el lote")
+
+        pending = batch.pending()
+        rows = [item.dict() for _, item in pending]
+        batch.record(pending, self.repository.create_many(rows, settings.BULK_CHUNK_SIZE))
+        return batch.result()
 
     def get_lead(self, lead_id: int) -> Optional[schemas.LeadInDB]:
         """Obtiene un lead por su ID"""
@@ -23,29 +91,53 @@ class LeadService:
         """Obtiene un lead por su email"""
         return self.repository.get_by_email(email)
 
-    def get_leads(self, skip: int = 0, limit: int = 100) -> List[schemas.LeadInDB]:
+    def get_leads(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.LeadInDB]:
         """Obtiene todos los leads con paginación"""
-        return self.repository.get_all(skip, limit)
+        return self.repository.get_all(skip, limit, cursor)
+
+    def find_leads(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        service_id: Optional[int] = None,
+        channel: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[schemas.LeadInDB]:
+        """Obtiene leads combinando estado, servicio, canal y búsqueda"""
+        return self.repository.find(
+            skip, limit, cursor,
+            status=status,
+            service_id=service_id,
+            channel=channel,
+            search=search,
+        )
 
-    def get_leads_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[schemas.LeadInDB]:
+    def get_leads_by_status(self, status: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.LeadInDB]:
         """Obtiene leads por su estado"""
-        return self.repository.get_by_status(status, skip, limit)
+        return self.repository.get_by_status(status, skip, limit, cursor)
 
-    def get_leads_by_service(self, service_id: int, skip: int = 0, limit: int = 100) -> List[schemas.LeadInDB]:
+    def get_leads_by_service(self, service_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.LeadInDB]:
         """Obtiene leads por ID de servicio"""
-        return self.repository.get_by_service_id(service_id, skip, limit)
+        return self.repository.get_by_service_id(service_id, skip, limit, cursor)
 
-    def get_leads_by_channel(self, channel: str, skip: int = 0, limit: int = 100) -> List[schemas.LeadInDB]:
+    def get_leads_by_channel(self, channel: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.LeadInDB]:
         """Obtiene leads por canal"""
-        return self.repository.get_by_channel(channel, skip, limit)
+        return self.repository.get_by_channel(channel, skip, limit, cursor)
 
-    def search_leads(self, query: str, skip: int = 0, limit: int = 100) -> List[schemas.LeadInDB]:
+    def search_leads(self, query: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.LeadInDB]:
         """Busca leads por nombre, apellido, email o teléfono"""
-        return self.repository.search(query, skip, limit)
+        return self.repository.search(query, skip, limit, cursor)
 
     def update_lead(self, lead_id: int, lead: schemas.LeadUpdate) -> Optional[schemas.LeadInDB]:
-        """Actualiza un lead existente por su ID"""
-        return self.repository.update(lead_id, lead)
+        """Actualiza un lead existente por su ID; el teléfono y el email no pueden ser los de otro lead"""
+        if lead.mobile_phone is not None or lead.email is not None:
+            self._check_contact(lead.mobile_phone, lead.email, lead_id)
+        try:
+            return self.repository.update(lead_id, lead)
+        except IntegrityError as error:
+            self._unique_violation(error, lead.mobile_phone, lead.email, lead_id)
 
     def update_lead_status(self, lead_id: int, status_update: schemas.LeadStatusUpdate) -> Optional[schemas.LeadInDB]:
         """Actualiza solo el estado de un lead"""
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from app.data.repositories.patient_repository import PatientRepository
+from app.data.export import stream_export
+from app.domain.models import Patient
 from app.domain.schemas import PatientCreate, PatientUpdate, PatientInDB
 from fastapi import HTTPException
+from app.core.config import settings
+from app.services.bulk import BulkBatch, duplicates
 
 class PatientService:
     def __init__(self, db: Session):
@@ -17,17 +21,47 @@ class PatientService:
         
         return self.repository.create(patient, created_by_user_id)
 
+    def create_patients(self, items: List[Dict[str, Any]], created_by_user_id: int) -> dict:
+        """Alta masiva: valida cada paciente, rechaza emails ya registrados o repetidos e inserta por bloques."""
+        batch = BulkBatch(PatientCreate, items)
+        pending = batch.pending()
+        registered = self.repository.get_existing_emails([item.email for _, item in pending if item.email])
+        for index, item in pending:
+            if item.email in registered:
+                batch.reject(index, "Email already registered")
+        for index in duplicates(batch.pending(), "email"):
+            batch.reject(index, "Email repeated in the batch")
+
+        pending = batch.pending()
+        rows = [dict(item.dict(), created_by_user_id=created_by_user_id) for _, item in pending]
+        batch.record(pending, self.repository.create_many(rows, settings.BULK_CHUNK_SIZE))
+        return batch.result()
+
     def get_patient(self, patient_id: int) -> Optional[PatientInDB]:
         patient = self.repository.get_by_id(patient_id)
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
         return patient
 
-    def get_clinic_patients(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PatientInDB]:
-        return self.repository.get_by_clinic(clinic_id, skip, limit)
+    def get_patients(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        clinic_id: Optional[int] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[PatientInDB]:
+        return self.repository.get_all(clinic_id, search, skip, limit, cursor)
+
+    def export_patients(self, clinic_id: Optional[int] = None):
+        """Columnas y filas (iterador perezoso) de los pacientes, para exportar en streaming."""
+        return stream_export(Patient, PatientRepository.filters, clinic_id=clinic_id)
+
+    def get_clinic_patients(self, clinic_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[PatientInDB]:
+        return self.repository.get_by_clinic(clinic_id, skip, limit, cursor)
 
-    def search_patients(self, clinic_id: int, search_term: str) -> List[PatientInDB]:
-        return self.repository.search(clinic_id, search_term)
+    def search_patients(self, clinic_id: int, search_term: str, skip: int = 0, limit: int = 20) -> List[PatientInDB]:
+        return self.repository.search(clinic_id, search_term, skip, limit)
 
     def update_patient(self, patient_id: int, patient: PatientUpdate, updated_by_user_id: int) -> PatientInDB:
         updated_patient = self.repository.update(patient_id, patient, updated_by_user_id)
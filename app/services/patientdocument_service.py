@@ -1,7 +1,8 @@
 from fastapi import HTTPException
-from app.data.repositories.patientdocument_repository import PatientDocumentRepository
+from app.data.repositories.patientdocument_repository import PatientDocumentRepository, AsyncPatientDocumentRepository
 from app.domain.schemas import PatientDocumentCreate, PatientDocumentUpdate, PatientDocumentInDB
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 class PatientDocumentService:
@@ -44,3 +45,45 @@ class PatientDocumentService:
         if not self.repository.hard_delete(document_id):
             raise HTTPException(status_code=404, detail="Documento no encontrado")
         return True
+
+
+class AsyncPatientDocumentService:
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncPatientDocumentRepository(db)
+
+    async def create_document(self, document: PatientDocumentCreate, created_by_user_id: int) -> PatientDocumentInDB:
+        return await self.repository.create(document, created_by_user_id)
+
+    async def get_document(self, document_id: int) -> Optional[PatientDocumentInDB]:
+        document = await self.repository.get_by_id(document_id)
+        if not document:
+            raise HTTPException(status_code=404, detail="Documento no encontrado")
+        return document
+
+    async def get_documents(self, skip: int = 0, limit: int = 100) -> List[PatientDocumentInDB]:
+        return await self.repository.get_all(skip, limit)
+
+    async def get_patient_documents(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocumentInDB]:
+        return await self.repository.get_by_patient_id(patient_id, skip, limit)
+
+    async def get_clinic_documents(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocumentInDB]:
+        return await self.repository.get_by_clinic_id(clinic_id, skip, limit)
+
+    async def search_documents(self, search_term: str, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PatientDocumentInDB]:
+        return await self.repository.search(search_term, clinic_id, skip, limit)
+
+    async def update_document(self, document_id: int, document: PatientDocumentUpdate, updated_by_user_id: int) -> PatientDocumentInDB:
+        updated_document = await self.repository.update(document_id, document, updated_by_user_id)
+        if not updated_document:
+            raise HTTPException(status_code=404, detail="Documento no encontrado")
+        return updated_document
+
+    async def delete_document(self, document_id: int) -> bool:
+        if not await self.repository.delete(document_id):
+            raise HTTPException(status_code=404, detail="Documento no encontrado")
+        return True
+
+    async def hard_delete_document(self, document_id: int) -> bool:
+        if not await self.repository.hard_delete(document_id):
+            raise HTTPException(status_code=404, detail="Documento no encontrado")
+        return True
@@ -1,5 +1,7 @@
 from fastapi import HTTPException, status
 from app.data.repositories.payment_repository import PaymentRepository
+from app.data.export import stream_export
+from app.domain.models import Payment
 from app.domain import schemas
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -43,3 +45,7 @@ class PaymentService:
 
     def delete_payment(self, payment_id: int) -> bool:
         return self.repository.delete(payment_id)
+
+    def export_payments(self, **filters):
+        """Columnas y filas (iterador perezoso) de los pagos filtrados, para exportar en streaming."""
+        return stream_export(Payment, PaymentRepository.filters, **filters)
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date
 
 from app.data.repositories.performance_metrics_repository import PerformanceMetricsRepository
 from app.domain.models.performance_metrics_schemas import (
@@ -29,6 +30,23 @@ class PerformanceMetricsService:
     def get_metrics(self, skip: int = 0, limit: int = 100) -> List[PerformanceMetricInDB]:
         return self.repository.get_all(skip, limit)
 
+    def find_metrics(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        clinic_id: Optional[int] = None,
+        category: Optional[MetricCategoryEnum] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[PerformanceMetricInDB]:
+        return self.repository.find(
+            skip, limit,
+            clinic_id=clinic_id,
+            category=category,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
     def get_clinic_metrics(self, clinic_id: int, skip: int = 0, limit: int = 100) -> List[PerformanceMetricInDB]:
         return self.repository.get_by_clinic(clinic_id, skip, limit)
 
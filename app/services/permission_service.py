@@ -3,6 +3,7 @@ from app.domain.schemas import PermissionCreate, PermissionUpdate, PermissionInD
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fastapi import HTTPException, status
+from app.core.cache import principal_cache
 
 class PermissionService:
     def __init__(self, db: Session):
@@ -30,6 +31,8 @@ class PermissionService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Permiso no encontrado"
             )
+        # Los usuarios en caché llevan los nombres de permiso de su rol
+        principal_cache.clear()
         return updated_permission
 
     def delete_permission(self, permission_id: int) -> bool:
@@ -38,4 +41,5 @@ class PermissionService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Permiso no encontrado"
             )
+        principal_cache.clear()
         return True
\ No newline at end of file
@@ -21,8 +21,14 @@ class PrescriptionService:
             )
         return prescription
 
-    def get_prescriptions(self, skip: int = 0, limit: int = 100) -> List[schemas.PrescriptionInDB]:
-        return self.repository.get_all(skip, limit)
+    def get_prescriptions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        patient_id: Optional[int] = None,
+        consultation_id: Optional[int] = None
+    ) -> List[schemas.PrescriptionInDB]:
+        return self.repository.find(skip, limit, patient_id=patient_id, consultation_id=consultation_id)
 
     def get_patient_prescriptions(self, patient_id: int, skip: int = 0, limit: int = 100) -> List[schemas.PrescriptionInDB]:
         return self.repository.get_by_patient_id(patient_id, skip, limit)
@@ -24,9 +24,9 @@ class UserService:
         return user
 
     def create_user(self, user_create: schemas.UserCreate):
-        if self.user_repo.get_user_by_username(user_create.username):
+        if self.user_repo.get_user_by_username(user_create.username, include_deleted=True):
             raise HTTPException(status_code=400, detail="Username already registered")
-        if self.user_repo.get_user_by_email(user_create.email):
+        if self.user_repo.get_user_by_email(user_create.email, include_deleted=True):
             raise HTTPException(status_code=400, detail="Email already registered")
         if user_create.role_id:
             role = self.role_repo.get_role_by_id(user_create.role_id)
@@ -57,7 +57,7 @@ class UserService:
             raise HTTPException(status_code=404, detail="User not found")
 
         if user_update.email and user_update.email != existing_user.email:
-            if self.user_repo.get_user_by_email(user_update.email):
+            if self.user_repo.get_user_by_email(user_update.email, include_deleted=True):
                 raise HTTPException(status_code=400, detail="Email already registered by another user")
 
         if user_update.role_id:
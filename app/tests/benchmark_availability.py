@@ -0,0 +1,116 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Benchmark en proceso (sin servidor): huecos libres de un mes para todos los
+# médicos de una clínica con agenda llena (app/services/availability.py).
+#   python -m app.tests.benchmark_availability
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.domain.models import Appointment, Clinic, Patient, Resource, Role, Service, User, load_all_models
+from app.services.availability_service import AvailabilityService
+
+load_all_models()
+
+DOCTORS = 20
+ROOMS = 8
+ITERATIONS = 20
+# Primer día de la ventana (lunes); debe estar en el futuro
+FIRST_DAY = date(2030, 1, 7)
+DAYS = 31
+# Latencia máxima admitida (mediana) de un mes para todos los médicos
+LATENCY_BUDGET_MS = 100
+
+
+def seed(db):
+    """Agenda ocupada en torno al 70 %: citas de 30 a 60 minutos de 9 a 18 h."""
+    clinic = Clinic(name='Benchmark', timezone='UTC', is_active=True)
+    role = Role(name='doctor')
+    db.add_all([clinic, role])
+    db.flush()
+    doctors = [
+        User(username=f'doc{i}', email=f'doc{i}@x.com', hashed_password='x', first_name='A', last_name='B',
+             role_id=role.id, associated_clinic_id=clinic.id)
+        for i in range(DOCTORS)
+    ]
+    rooms = [Resource(clinic_id=clinic.id, name=f'Sala {i}', resource_type='Room') for i in range(ROOMS)]
+    patient = Patient(clinic_id=clinic.id, first_name='Ana', last_name='Pérez', date_of_birth=datetime(1990, 1, 1))
+    service = Service(clinic_id=clinic.id, name='Consulta', duration_minutes=30, base_price=100)
+    db.add_all(doctors + rooms + [patient, service])
+    db.flush()
+    generator = random.Random(0)
+    appointments = []
+    for day in range(DAYS):
+        opens = datetime.combine(FIRST_DAY + timedelta(days=day), datetime.min.time()) + timedelta(hours=9)
+        for doctor in doctors:
+            moment = opens
+            while moment < opens + timedelta(hours=9):
+                length = timedelta(minutes=generator.choice((30, 45, 60)))
+                if generator.random() < 0.7:
+                    appointments.append(Appointment(
+                        clinic_id=clinic.id, patient_id=patient.id, primary_doctor_id=doctor.id,
+                        resource_id=generator.choice(rooms).id, start_time=moment, end_time=moment + length,
+                        status='Scheduled',
+                    ))
+                moment += length
+    db.add_all(appointments)
+    db.commit()
+    return clinic.id, service.id, len(appointments)
+
+
+def measure(name, func):
+    func()  # calentar la caché de SQL compilado
+    timings = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    median_ms = statistics.median(timings) * 1e3
+    print(f"{name:<36} {median_ms:8.2f} ms   {len(result['slots']):5d} huecos   truncated={result['truncated']}")
+    return median_ms
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'clinic.db')}")
+        Base.metadata.create_all(engine)
+        # Solo se mide la lectura: las altas de la agenda no pasan por la auditoría
+        settings.AUDIT_CHANGE_CAPTURE_ENABLED = False
+        with Session(engine) as db:
+            try:
+                clinic_id, service_id, count = seed(db)
+            finally:
+                settings.AUDIT_CHANGE_CAPTURE_ENABLED = True
+            print(f"citas: {count}")
+            service = AvailabilityService(db)
+            start = datetime.combine(FIRST_DAY, datetime.min.time())
+            end = start + timedelta(days=DAYS)
+
+            def find(**kwargs):
+                return service.find_slots(clinic_id, service_id, start, end, **kwargs)
+
+            results = [
+                measure('mes, todos los médicos (100)', lambda: find()),
+                measure('mes, todos los médicos (2000)', lambda: find(limit=2000)),
+                measure('mes, médico + sala (2000)', lambda: find(resource_type='Room', limit=2000)),
+                measure('mes, un médico (2000)', lambda: find(doctor_id=1, limit=2000)),
+            ]
+
+    for median_ms in results:
+        assert median_ms < LATENCY_BUDGET_MS, f"La disponibilidad tarda {median_ms:.1f} ms (máximo {LATENCY_BUDGET_MS} ms)"
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+# Benchmark en proceso (sin servidor): latencia de escritura con y sin la
+# auditoría automática de cambios (app/data/change_capture.py).
+#   python -m app.tests.benchmark_change_capture
+# La base de datos es un archivo SQLite (cada commit llega a disco, como en
+# un servidor real); la auditoría se escribe en otra base en segundo plano.
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.data.audit_sink as audit_sink_module
+from app.core.config import settings
+from app.core.database import Base
+from app.data.audit_sink import AuditSink
+from app.data.write_path import soft_delete_by_id, update_by_id
+from app.domain.models import AuditLog, Clinic, Patient
+from app.tests.benchmark_repositories import seed
+
+ITERATIONS = 1000
+# Latencia añadida máxima admitida
+OVERHEAD_BUDGET = 0.05
+
+
+def orm_update(db, patient_id, i):
+    patient = db.get(Patient, patient_id)
+    patient.phone_number = f'555{i:07d}'
+    patient.allergies = f'Control {i}'
+    db.commit()
+
+
+def statement_update(db, patient_id, i):
+    update_by_id(db, Patient, patient_id, {'phone_number': f'556{i:07d}', 'allergies': f'Revisión {i}'})
+
+
+def statement_soft_delete(db, patient_ids, i):
+    soft_delete_by_id(db, Patient, patient_ids[i], datetime.utcnow())
+
+
+def orm_create(db, clinic_id, i):
+    db.add(Patient(clinic_id=clinic_id, first_name=f'P{i}', last_name='Benchmark', date_of_birth=datetime(1990, 1, 1)))
+    db.commit()
+
+
+def measure(name, func, db, target):
+    # Llamadas alternas con y sin auditoría y la mediana de cada grupo: el
+    # ruido del disco y el crecimiento de la tabla afectan igual a los dos
+    timings = {False: [], True: []}
+    for i in range(ITERATIONS * 2):
+        enabled = bool(i % 2)
+        settings.AUDIT_CHANGE_CAPTURE_ENABLED = enabled
+        start = time.perf_counter()
+        func(db, target, i)
+        timings[enabled].append(time.perf_counter() - start)
+    off_us = statistics.median(timings[False]) * 1e6
+    on_us = statistics.median(timings[True]) * 1e6
+    overhead = on_us / off_us - 1
+    print(f"{name:<30} sin auditoría {off_us:8.1f} us   con auditoría {on_us:8.1f} us   {overhead:+6.1%}")
+    return overhead
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'clinic.db')}")
+        audit_engine = create_engine(f"sqlite:///{os.path.join(directory, 'audit.db')}")
+        Base.metadata.create_all(engine)
+        AuditLog.__table__.create(audit_engine)
+        sink = AuditSink(session_factory=sessionmaker(bind=audit_engine), spill_path='')
+        audit_sink_module.audit_sink = sink
+        try:
+            with Session(engine, expire_on_commit=False) as db:
+                seed(db)
+                clinic_id = db.scalar(select(Clinic.id))
+                patient_id = db.scalar(select(Patient.id))
+                # Pacientes para borrar, uno por llamada
+                db.add_all([
+                    Patient(clinic_id=clinic_id, first_name=f'B{i}', last_name='Benchmark', date_of_birth=datetime(1990, 1, 1))
+                    for i in range(ITERATIONS * 2)
+                ])
+                db.commit()
+                deleted_ids = db.scalars(select(Patient.id).where(Patient.last_name == 'Benchmark')).all()
+                db.expunge_all()
+                results = [
+                    measure('update (flush)', orm_update, db, patient_id),
+                    measure('update_by_id', statement_update, db, patient_id),
+                    measure('soft_delete_by_id', statement_soft_delete, db, deleted_ids),
+                    measure('alta (flush)', orm_create, db, clinic_id),
+                ]
+            sink.stop()
+        finally:
+            settings.AUDIT_CHANGE_CAPTURE_ENABLED = True
+        with Session(audit_engine) as audit_db:
+            print(f"registros de auditoría escritos: {audit_db.scalar(select(func.count()).select_from(AuditLog))}")
+
+    for overhead in results:
+        assert overhead < OVERHEAD_BUDGET, f"La auditoría añade {overhead:.1%} de latencia (máximo {OVERHEAD_BUDGET:.0%})"
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import cProfile
+import os
+import pstats
+import time
+from datetime import datetime
+
+# Benchmark en proceso (sin servidor): Query del ORM armada en cada llamada
+# frente a las sentencias en caché de BaseRepository.
+#   python -m app.tests.benchmark_repositories
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.domain.models import Appointment, Clinic, Patient, Role, User, load_all_models
+from app.domain.models.consultation import Consultation
+from app.data.repositories.appointment_repository import AppointmentRepository, APPOINTMENT_READ_PLAN
+from app.data.repositories.consultation_repository import ConsultationRepository, CONSULTATION_READ_PLAN
+
+load_all_models()
+
+ITERATIONS = 1000
+# Módulos de construcción de sentencias, claves de caché y compilación de SQLAlchemy
+SQL_BUILD_MODULES = ('sqlalchemy/sql/', 'sqlalchemy/orm/query.py', 'sqlalchemy/orm/context.py')
+
+
+def seed(db):
+    clinic = Clinic(name='Benchmark', timezone='UTC', is_active=True)
+    role = Role(name='doctor')
+    db.add_all([clinic, role])
+    db.flush()
+    doctor = User(username='doc', email='doc@x.com', hashed_password='x', first_name='A', last_name='B',
+                  role_id=role.id, associated_clinic_id=clinic.id)
+    patient = Patient(clinic_id=clinic.id, first_name='Ana', last_name='Pérez', date_of_birth=datetime(1990, 1, 1))
+    db.add_all([doctor, patient])
+    db.flush()
+    for i in range(20):
+        appointment = Appointment(clinic_id=clinic.id, patient_id=patient.id, primary_doctor_id=doctor.id,
+                                  start_time=datetime(2030, 1, 1, 9 + i % 8), end_time=datetime(2030, 1, 1, 10 + i % 8),
+                                  status='Scheduled')
+        db.add(appointment)
+        db.flush()
+        db.add(Consultation(appointment_id=appointment.id, patient_id=patient.id, clinic_id=clinic.id,
+                            doctor_id=doctor.id, chief_complaint='Control'))
+    db.commit()
+
+
+def legacy_get_appointment(db, appointment_id):
+    return db.query(Appointment).options(*APPOINTMENT_READ_PLAN).filter(
+        Appointment.id == appointment_id, Appointment.deleted_at == None
+    ).first()
+
+
+def legacy_consultations_by_patient(db, patient_id):
+    return db.query(Consultation).options(*CONSULTATION_READ_PLAN).filter(
+        Consultation.patient_id == patient_id, Consultation.deleted_at == None
+    ).offset(0).limit(100).all()
+
+
+def measure(name, func):
+    func()  # calentar la caché de SQL compilado
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    for _ in range(ITERATIONS):
+        func()
+    profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    stats = pstats.Stats(profiler).stats
+    build_time = sum(
+        entry[2] for (filename, _, _), entry in stats.items()
+        if any(module in filename.replace('\\', '/') for module in SQL_BUILD_MODULES)
+    )
+    per_call_us = elapsed / ITERATIONS * 1e6
+    build_us = build_time / ITERATIONS * 1e6
+    print(f"{name:<40} {per_call_us:8.1f} us/llamada   construcción+compilación {build_us:8.1f} us/llamada")
+    return build_us
+
+
+def main():
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as db:
+        seed(db)
+        appointments = AppointmentRepository(db)
+        consultations = ConsultationRepository(db)
+
+        results = [
+            (measure('get_by_id (Query)', lambda: legacy_get_appointment(db, 5)),
+             measure('get_by_id (BaseRepository)', lambda: appointments.get_by_id(5))),
+            (measure('por paciente (Query)', lambda: legacy_consultations_by_patient(db, 1)),
+             measure('por paciente (BaseRepository)', lambda: consultations.get_by_patient_id(1))),
+        ]
+
+    for legacy, cached in results:
+        assert cached < legacy, f"Las sentencias en caché deberían costar menos: {cached:.1f} >= {legacy:.1f} us"
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import requests
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Prueba de carga contra un servidor en ejecución (uvicorn main:app)
+BASE_URL = 'http://127.0.0.1:8000'
+API_URL = f'{BASE_URL}/api/v1'
+
+CONCURRENT_REQUESTS = 200
+WORKERS = 50
+PATIENT_ID = 1
+# Si el event loop se bloquea, la latencia de "/" crece al ritmo de las consultas de documentos
+MAX_ROOT_P99_MS = 1000
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed_get(url, headers=None):
+    start = time.perf_counter()
+    response = requests.get(url, headers=headers)
+    return (time.perf_counter() - start) * 1000, response.status_code
+
+
+def print_stats(name, samples):
+    print(f"{name}: n={len(samples)} "
+          f"p50={statistics.median(samples):.1f}ms "
+          f"p95={percentile(samples, 95):.1f}ms "
+          f"p99={percentile(samples, 99):.1f}ms")
+
+
+def test_load_patient_documents():
+    login_data = {
+        'username': 'admin_user',
+        'password': 'admin1234.',
+        'grant_type': 'password',
+        'scope': ''
+    }
+    auth_response = requests.post(
+        f'{API_URL}/auth/token',
+        data=login_data,
+        headers={'Content-Type': 'application/x-www-form-urlencoded'}
+    )
+    print(f"Autenticación: {auth_response.status_code}")
+    # Sin token no se envía ninguna petición: la prueba no puede darse por buena
+    assert auth_response.status_code == 200, f"No se pudo autenticar: {auth_response.status_code} {auth_response.text}"
+
+    auth_headers = {
+        'Authorization': f"Bearer {auth_response.json()['access_token']}",
+        'Accept': 'application/json'
+    }
+    documents_url = f'{API_URL}/patient-documents/patient/{PATIENT_ID}'
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        document_futures = [
+            executor.submit(timed_get, documents_url, auth_headers)
+            for _ in range(CONCURRENT_REQUESTS)
+        ]
+        # Peticiones baratas intercaladas con la carga de documentos
+        root_futures = [
+            executor.submit(timed_get, f'{BASE_URL}/')
+            for _ in range(CONCURRENT_REQUESTS // 4)
+        ]
+        documents = [future.result() for future in document_futures]
+        root = [future.result() for future in root_futures]
+
+    errors = [code for _, code in documents if code != 200]
+    print(f"Errores en documentos: {len(errors)}")
+    print_stats("patient-documents", [ms for ms, _ in documents])
+    print_stats("root", [ms for ms, _ in root])
+
+    root_p99 = percentile([ms for ms, _ in root], 99)
+    assert not errors
+    assert root_p99 < MAX_ROOT_P99_MS, f"p99 de '/' = {root_p99:.1f}ms bajo carga de documentos"
+
+
+if __name__ == "__main__":
+    test_load_patient_documents()
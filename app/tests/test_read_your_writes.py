@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# Prueba en proceso (sin servidor) del enrutado a réplicas: el primario y la
+# réplica son dos archivos SQLite; la réplica es una copia que no recibe las
+# escrituras, así que una lectura atrasada se nota en la respuesta.
+#   python -m app.tests.test_read_your_writes
+# Configura la base de datos al importarse: debe ejecutarse en su propio proceso.
+DIRECTORY = tempfile.mkdtemp()
+PRIMARY_PATH = os.path.join(DIRECTORY, 'primary.db')
+REPLICA_PATH = os.path.join(DIRECTORY, 'replica.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{PRIMARY_PATH}'
+os.environ['DATABASE_REPLICA_URLS'] = f'sqlite:///{REPLICA_PATH}'
+os.environ['ASYNC_DATABASE_URL'] = ''
+os.environ['READ_YOUR_WRITES_SECONDS'] = '60'
+os.environ.setdefault('SECRET_KEY', 'test')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+
+from fastapi.testclient import TestClient
+
+import main
+from app.core.database import Base, SessionLocal, engine
+from app.domain.models import Clinic, Patient, PatientDocument, Role, User, load_all_models
+from app.services.auth_service import create_access_token
+
+load_all_models()
+
+
+def seed():
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    role = Role(name='superadmin')
+    clinic = Clinic(name='Réplicas', timezone='UTC', is_active=True)
+    db.add_all([role, clinic])
+    db.flush()
+    for username in ('writer', 'reader'):
+        db.add(User(username=username, email=f'{username}@x.com', hashed_password='x', first_name='A',
+                    last_name='B', role_id=role.id, associated_clinic_id=clinic.id))
+    patient = Patient(clinic_id=clinic.id, first_name='Ana', last_name='Pérez', date_of_birth=datetime(1990, 1, 1),
+                      patient_identifier='P1')
+    db.add(patient)
+    db.flush()
+    document = PatientDocument(patient_id=patient.id, clinic_id=clinic.id, document_type='Informe', title='Original',
+                               file_path='/docs/1.pdf', mime_type='application/pdf', file_size=1,
+                               document_date=datetime(2030, 1, 1))
+    db.add(document)
+    db.commit()
+    ids = patient.id, document.id
+    db.close()
+    engine.dispose()
+    shutil.copy(PRIMARY_PATH, REPLICA_PATH)
+    return ids
+
+
+def auth(username):
+    return {'Authorization': f"Bearer {create_access_token({'sub': username})}"}
+
+
+def test_read_your_writes():
+    patient_id, document_id = seed()
+    client = TestClient(main.app)
+    writer, reader = auth('writer'), auth('reader')
+
+    # Router asíncrono (AsyncSession)
+    response = client.put(f'/api/v1/patient-documents/{document_id}', headers=writer, json={'title': 'Revisado'})
+    assert response.status_code == 200, response.text
+    assert client.get(f'/api/v1/patient-documents/{document_id}', headers=writer).json()['title'] == 'Revisado'
+    assert client.get(f'/api/v1/patient-documents/{document_id}', headers=reader).json()['title'] == 'Original'
+
+    # Router síncrono
+    response = client.put(f'/api/v1/patients/{patient_id}', headers=writer, json={
+        'clinic_id': 1, 'first_name': 'Cambiada', 'last_name': 'Pérez', 'date_of_birth': '1990-01-01',
+        'patient_identifier': 'P1', 'gender': None, 'preferred_communication_channel': None,
+    })
+    assert response.status_code == 200, response.text
+    assert client.get(f'/api/v1/patients/{patient_id}', headers=writer).json()['first_name'] == 'Cambiada'
+    assert client.get(f'/api/v1/patients/{patient_id}', headers=reader).json()['first_name'] == 'Ana'
+    print("OK")
+
+
+if __name__ == '__main__':
+    try:
+        test_read_your_writes()
+    finally:
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
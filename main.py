@@ -1,3 +1,4 @@
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import routers
@@ -16,6 +17,9 @@ from app.api.routers import (
 )
 
 from app.core.config import settings
+from app.core.sql_metrics import SQLMetricsMiddleware
+from app.data.audit_sink import audit_sink
+from app.data.read_access import read_access
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -32,6 +36,25 @@ app = FastAPI(
     }
 )
 
+@app.on_event("startup")
+async def configure_threadpool():
+    # Los endpoints síncronos (y su acceso a BD) se ejecutan en este pool, fuera del event loop
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+@app.on_event("startup")
+def start_audit_sink():
+    # Escritor de auditoría en segundo plano; reinserta lo que quedó desbordado en disco
+    audit_sink.start()
+    # Volcado periódico de los accesos de lectura agregados
+    read_access.start()
+
+@app.on_event("shutdown")
+def stop_audit_sink():
+    # Primero las lecturas pendientes (también el minuto en curso), que van a audit_sink
+    read_access.stop()
+    # Escribe lo pendiente; lo que no dé tiempo queda en el archivo de desbordamiento
+    audit_sink.stop(timeout=settings.AUDIT_FLUSH_INTERVAL_SECONDS * 5)
+
 # Configuración de CORS
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +64,9 @@ app.add_middleware(
     allow_headers=["*"],  # Permite todas las cabeceras
 )
 
+# Consultas y tiempo de BD por petición: cabecera Server-Timing, log y detector de N+1
+app.add_middleware(SQLMetricsMiddleware)
+
 # Incluir los routers de la API
 app.include_router(routers.auth_router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(routers.users_router, prefix="/api/v1/users", tags=["Users"])
@@ -122,6 +148,11 @@ app.include_router(
     prefix="/api/leads",
     tags=["Leads"]
 )
+app.include_router(
+    routers.admin_router,
+    prefix="/api/v1/admin",
+    tags=["Admin"]
+)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,64 @@
+"""
+Entorno de Alembic conectado a `Base.metadata` y a la configuración de la app.
+
+    alembic upgrade head                 # aplica las migraciones pendientes
+    alembic upgrade head --sql > out.sql # modo offline: genera el SQL para el DBA
+    alembic revision --autogenerate -m "..."
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.core.database import Base
+from app.domain.models import load_all_models
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Importar todos los módulos de modelos para registrar sus tablas en Base.metadata
+load_all_models()
+
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    # Permite `alembic -x url=...` para apuntar a otra base sin tocar el .env
+    return context.get_x_argument(as_dictionary=True).get("url", settings.DATABASE_URL)
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        compare_type=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # Conexión propia sin pool: las migraciones no comparten el motor de la app
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
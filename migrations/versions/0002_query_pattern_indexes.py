@@ -0,0 +1,61 @@
+"""query pattern indexes
+
+Índices compuestos derivados de los predicados de los repositorios: cada
+listado filtra por una columna (clínica, médico, paciente, estado...) y
+ordena por fecha, que es también el orden del cursor de paginación.
+
+En MySQL los índices se crean con ALGORITHM=INPLACE, LOCK=NONE para que la
+tabla siga aceptando lecturas y escrituras; si el servidor no puede hacerlo
+en línea la sentencia falla en lugar de bloquear la tabla. Para revisar o
+aplicar el SQL a mano: `alembic upgrade 0001:0002 --sql`.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:40:12.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_appointments_clinic_id_start_time', 'appointments', ['clinic_id', 'start_time']),
+    ('ix_appointments_primary_doctor_id_start_time', 'appointments', ['primary_doctor_id', 'start_time']),
+    ('ix_appointments_patient_id_start_time', 'appointments', ['patient_id', 'start_time']),
+    ('ix_auditlogs_created_at', 'auditlogs', ['created_at']),
+    ('ix_auditlogs_entity_type_entity_id', 'auditlogs', ['entity_type', 'entity_id', 'created_at']),
+    ('ix_auditlogs_clinic_id_created_at', 'auditlogs', ['clinic_id', 'created_at']),
+    ('ix_auditlogs_user_id_created_at', 'auditlogs', ['user_id', 'created_at']),
+    ('ix_invoices_patient_id_created_at', 'invoices', ['patient_id', 'created_at']),
+    ('ix_invoices_clinic_id_created_at', 'invoices', ['clinic_id', 'created_at']),
+    ('ix_leads_status_created_at', 'leads', ['status', 'created_at']),
+    ('ix_consultations_patient_id_consultation_date', 'consultations', ['patient_id', 'consultation_date']),
+    ('ix_patients_clinic_id_created_at', 'patients', ['clinic_id', 'created_at']),
+]
+
+
+def _is_mysql() -> bool:
+    return op.get_context().dialect.name == 'mysql'
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        if _is_mysql():
+            op.execute(
+                f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)}), "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            )
+        else:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
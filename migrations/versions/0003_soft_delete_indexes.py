@@ -0,0 +1,102 @@
+"""soft delete indexes
+
+Todas las lecturas de modelos con borrado lógico llevan `deleted_at IS NULL`
+(app.core.soft_delete). Los índices incluyen `deleted_at` justo después de
+la columna de igualdad, para que ese filtro se resuelva en el índice y no
+leyendo cada fila:
+
+    WHERE clinic_id = ? AND deleted_at IS NULL ORDER BY start_time
+      -> (clinic_id, deleted_at, start_time)
+
+Los índices de 0002 sobre tablas con borrado lógico se reemplazan. Primero
+se crean los nuevos y después se borran los anteriores, porque en MySQL una
+FK no puede quedarse sin un índice que la cubra. Igual que en 0002, en MySQL
+se usa ALGORITHM=INPLACE, LOCK=NONE.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:52:41.307519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (índice de 0002, índice nuevo, tabla, columnas nuevas, columnas anteriores)
+REPLACED = [
+    ('ix_appointments_clinic_id_start_time', 'ix_appointments_clinic_id_deleted_at_start_time',
+     'appointments', ['clinic_id', 'deleted_at', 'start_time'], ['clinic_id', 'start_time']),
+    ('ix_appointments_primary_doctor_id_start_time', 'ix_appointments_primary_doctor_id_deleted_at_start_time',
+     'appointments', ['primary_doctor_id', 'deleted_at', 'start_time'], ['primary_doctor_id', 'start_time']),
+    ('ix_appointments_patient_id_start_time', 'ix_appointments_patient_id_deleted_at_start_time',
+     'appointments', ['patient_id', 'deleted_at', 'start_time'], ['patient_id', 'start_time']),
+    ('ix_invoices_patient_id_created_at', 'ix_invoices_patient_id_deleted_at_created_at',
+     'invoices', ['patient_id', 'deleted_at', 'created_at'], ['patient_id', 'created_at']),
+    ('ix_invoices_clinic_id_created_at', 'ix_invoices_clinic_id_deleted_at_created_at',
+     'invoices', ['clinic_id', 'deleted_at', 'created_at'], ['clinic_id', 'created_at']),
+    ('ix_consultations_patient_id_consultation_date', 'ix_consultations_patient_id_deleted_at_consultation_date',
+     'consultations', ['patient_id', 'deleted_at', 'consultation_date'], ['patient_id', 'consultation_date']),
+    ('ix_patients_clinic_id_created_at', 'ix_patients_clinic_id_deleted_at_created_at',
+     'patients', ['clinic_id', 'deleted_at', 'created_at'], ['clinic_id', 'created_at']),
+]
+
+ADDED = [
+    ('ix_payments_invoice_id_deleted_at', 'payments', ['invoice_id', 'deleted_at']),
+    ('ix_payments_patient_id_deleted_at', 'payments', ['patient_id', 'deleted_at']),
+    ('ix_patientdocuments_patient_id_deleted_at', 'patientdocuments', ['patient_id', 'deleted_at']),
+    ('ix_prescriptions_patient_id_deleted_at', 'prescriptions', ['patient_id', 'deleted_at']),
+    ('ix_prescriptions_consultation_id_deleted_at', 'prescriptions', ['consultation_id', 'deleted_at']),
+    ('ix_iopexams_consultation_id_deleted_at', 'iopexams', ['consultation_id', 'deleted_at']),
+    ('ix_refractionexams_consultation_id_deleted_at', 'refractionexams', ['consultation_id', 'deleted_at']),
+    ('ix_visualacuityexams_consultation_id_deleted_at', 'visualacuityexams', ['consultation_id', 'deleted_at']),
+    ('ix_consentforms_patient_id_deleted_at', 'consentforms', ['patient_id', 'deleted_at']),
+    ('ix_performance_metrics_clinic_id_deleted_at_measurement_date', 'performance_metrics',
+     ['clinic_id', 'deleted_at', 'measurement_date']),
+    ('ix_users_associated_clinic_id_deleted_at', 'users', ['associated_clinic_id', 'deleted_at']),
+]
+
+
+def _is_mysql() -> bool:
+    return op.get_context().dialect.name == 'mysql'
+
+
+def _create_index(name: str, table: str, columns) -> None:
+    if _is_mysql():
+        op.execute(
+            f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)}), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.create_index(name, table, columns, unique=False)
+
+
+def _drop_index(name: str, table: str) -> None:
+    if _is_mysql():
+        op.execute(f"ALTER TABLE {table} DROP INDEX {name}, ALGORITHM=INPLACE, LOCK=NONE")
+    else:
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    for _, name, table, columns, _ in REPLACED:
+        _create_index(name, table, columns)
+    for name, table, columns in ADDED:
+        _create_index(name, table, columns)
+    for old_name, _, table, _, _ in REPLACED:
+        _drop_index(old_name, table)
+
+
+def downgrade() -> None:
+    for old_name, _, table, _, old_columns in REPLACED:
+        _create_index(old_name, table, old_columns)
+    for name, table, _ in reversed(ADDED):
+        _drop_index(name, table)
+    for _, name, table, _, _ in REPLACED:
+        _drop_index(name, table)
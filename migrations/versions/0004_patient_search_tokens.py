@@ -0,0 +1,42 @@
+"""patient search tokens
+
+Tabla del índice invertido de la búsqueda de pacientes
+(app.data.patient_search). La tabla se crea vacía; para indexar los
+pacientes existentes, después de migrar:
+
+    python -m app.cli.reindex_patients
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:31:05.584120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'patient_search_tokens',
+        sa.Column('clinic_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('token', sa.String(length=32), nullable=False),
+        sa.Column('patient_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('weight', sa.SmallInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('clinic_id', 'token', 'patient_id'),
+    )
+    op.create_index('ix_patient_search_tokens_patient_id', 'patient_search_tokens', ['patient_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_patient_search_tokens_patient_id', table_name='patient_search_tokens')
+    op.drop_table('patient_search_tokens')
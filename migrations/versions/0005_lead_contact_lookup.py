@@ -0,0 +1,237 @@
+"""lead contact lookup columns
+
+Columnas normalizadas de los leads para deduplicar y buscar por teléfono y
+email con índices:
+
+- mobile_phone_e164: teléfono en E.164, único
+- mobile_phone_suffix: últimos 7 dígitos, para buscar por el final del número
+- email_normalized: email en minúsculas, único
+
+Las columnas se rellenan a partir de los datos existentes antes de crear los
+índices únicos. Si varios leads normalizan al mismo teléfono o email, solo el
+más antiguo recibe el valor; el resto se listan (aviso en la salida de
+alembic) para revisarlos a mano.
+
+En modo offline (--sql) el relleno se emite como SQL de MySQL 8
+(REGEXP_REPLACE) con la misma normalización; el SQL no lista los leads
+repetidos, solo les deja las columnas vacías. Con otros motores el modo
+offline no puede rellenar y la revisión se niega a generarse.
+
+La normalización es una copia de app.core.contact tal como era al crear la
+revisión, con el país por defecto fijo (52, números nacionales de 10
+dígitos): el resultado no depende del código ni de la configuración del
+momento de aplicarla. Otro país: `alembic -x phone_country_code=34 -x
+phone_national_length=9 upgrade ...`.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:20:44.902117
+
+"""
+import logging
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import context, op
+from alembic.util import CommandError
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_leads_mobile_phone_e164', ['mobile_phone_e164'], True),
+    ('ix_leads_mobile_phone_suffix', ['mobile_phone_suffix'], False),
+    ('ix_leads_email_normalized', ['email_normalized'], True),
+]
+
+BATCH_SIZE = 1000
+
+PHONE_DEFAULT_COUNTRY_CODE = '52'
+PHONE_NATIONAL_NUMBER_LENGTH = 10
+PHONE_SUFFIX_LENGTH = 7
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+_NOT_DIGIT = re.compile(r'\D')
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def _phone_settings():
+    arguments = context.get_x_argument(as_dictionary=True)
+    return (
+        arguments.get('phone_country_code', PHONE_DEFAULT_COUNTRY_CODE),
+        int(arguments.get('phone_national_length', PHONE_NATIONAL_NUMBER_LENGTH)),
+    )
+
+
+def normalize_phone(value: Optional[str], country_code: str, national_length: int) -> Optional[str]:
+    if not value:
+        return None
+    text = value.strip()
+    number = _NOT_DIGIT.sub('', text)
+    if text.startswith('+'):
+        international = number
+    elif number.startswith('00'):
+        international = number[2:]
+    elif len(number) == national_length:
+        international = country_code + number
+    elif len(number) > national_length and number.startswith(country_code):
+        international = number
+    elif len(number) > national_length:
+        international = country_code + number[-national_length:]
+    else:
+        return None
+    if not E164_MIN_DIGITS <= len(international) <= E164_MAX_DIGITS:
+        return None
+    return '+' + international
+
+
+def phone_suffix(e164: Optional[str]) -> Optional[str]:
+    return e164[-PHONE_SUFFIX_LENGTH:] if e164 else None
+
+
+def normalize_email(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    email = value.strip().lower()
+    return email if '@' in email else None
+
+
+def _is_mysql() -> bool:
+    return op.get_context().dialect.name == 'mysql'
+
+
+def _create_index(name: str, columns, unique: bool) -> None:
+    if _is_mysql():
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        op.execute(
+            f"ALTER TABLE leads ADD {kind} {name} ({', '.join(columns)}), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.create_index(name, 'leads', columns, unique=unique)
+
+
+def _backfill() -> None:
+    leads = sa.table(
+        'leads',
+        sa.column('lead_id', sa.Integer),
+        sa.column('mobile_phone', sa.String),
+        sa.column('email', sa.String),
+        sa.column('mobile_phone_e164', sa.String),
+        sa.column('mobile_phone_suffix', sa.String),
+        sa.column('email_normalized', sa.String),
+    )
+    bind = op.get_bind()
+    update = (
+        leads.update()
+        .where(leads.c.lead_id == sa.bindparam('id'))
+        .values(
+            mobile_phone_e164=sa.bindparam('e164'),
+            mobile_phone_suffix=sa.bindparam('suffix'),
+            email_normalized=sa.bindparam('email_key'),
+        )
+    )
+    country_code, national_length = _phone_settings()
+    phones, emails, duplicated = set(), set(), []
+    last = 0
+    while True:
+        rows = bind.execute(
+            sa.select(leads.c.lead_id, leads.c.mobile_phone, leads.c.email)
+            .where(leads.c.lead_id > last)
+            .order_by(leads.c.lead_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        values = []
+        for lead_id, mobile_phone, email in rows:
+            e164 = normalize_phone(mobile_phone, country_code, national_length)
+            email_key = normalize_email(email)
+            if e164 in phones or email_key in emails:
+                duplicated.append(lead_id)
+                e164 = None if e164 in phones else e164
+                email_key = None if email_key in emails else email_key
+            if e164:
+                phones.add(e164)
+            if email_key:
+                emails.add(email_key)
+            values.append({'id': lead_id, 'e164': e164, 'suffix': phone_suffix(e164), 'email_key': email_key})
+        bind.execute(update, values)
+        last = rows[-1][0]
+    if duplicated:
+        logger.warning(
+            "Leads con teléfono o email repetido tras normalizar (sin valor normalizado): %s", duplicated
+        )
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _backfill_sql() -> None:
+    """El mismo relleno en SQL de MySQL 8, para el modo offline."""
+    country_code, national_length = _phone_settings()
+    code = _quote(country_code)
+    number = "REGEXP_REPLACE(mobile_phone, '[^0-9]', '')"
+    international = (
+        f"CASE WHEN LEFT(TRIM(mobile_phone), 1) = '+' THEN {number}"
+        f" WHEN LEFT({number}, 2) = '00' THEN SUBSTRING({number}, 3)"
+        f" WHEN CHAR_LENGTH({number}) = {national_length} THEN CONCAT({code}, {number})"
+        f" WHEN CHAR_LENGTH({number}) > {national_length} AND LEFT({number}, {len(country_code)}) = {code} THEN {number}"
+        f" WHEN CHAR_LENGTH({number}) > {national_length} THEN CONCAT({code}, RIGHT({number}, {national_length}))"
+        " END"
+    )
+    email = "LOWER(TRIM(email))"
+    op.execute(
+        "UPDATE leads SET "
+        f"mobile_phone_e164 = CASE WHEN CHAR_LENGTH({international}) BETWEEN {E164_MIN_DIGITS} AND {E164_MAX_DIGITS}"
+        f" THEN CONCAT('+', {international}) END, "
+        f"email_normalized = CASE WHEN LOCATE('@', {email}) > 0 THEN {email} END"
+    )
+    # Repetidos: solo el lead más antiguo conserva el valor
+    for column in ('mobile_phone_e164', 'email_normalized'):
+        op.execute(
+            f"UPDATE leads JOIN ("
+            f"SELECT {column} AS value, MIN(lead_id) AS kept_id FROM leads "
+            f"WHERE {column} IS NOT NULL GROUP BY {column} HAVING COUNT(*) > 1"
+            f") AS repeated ON leads.{column} = repeated.value AND leads.lead_id <> repeated.kept_id "
+            f"SET leads.{column} = NULL"
+        )
+    op.execute(
+        f"UPDATE leads SET mobile_phone_suffix = RIGHT(mobile_phone_e164, {PHONE_SUFFIX_LENGTH}) "
+        "WHERE mobile_phone_e164 IS NOT NULL"
+    )
+
+
+def upgrade() -> None:
+    op.add_column('leads', sa.Column('mobile_phone_e164', sa.String(length=16), nullable=True))
+    op.add_column('leads', sa.Column('mobile_phone_suffix', sa.String(length=7), nullable=True))
+    op.add_column('leads', sa.Column('email_normalized', sa.String(length=150), nullable=True))
+    if not context.is_offline_mode():
+        _backfill()
+    elif _is_mysql():
+        _backfill_sql()
+    else:
+        raise CommandError(
+            "La revisión 0005 rellena las columnas normalizadas de los leads a partir de los datos y "
+            "en modo offline solo sabe hacerlo en MySQL. Aplíquela en línea (alembic upgrade 0005) "
+            "y genere el SQL del resto con `alembic upgrade 0005:head --sql`."
+        )
+    for name, columns, unique in INDEXES:
+        _create_index(name, columns, unique)
+
+
+def downgrade() -> None:
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='leads')
+    with op.batch_alter_table('leads') as batch:
+        batch.drop_column('email_normalized')
+        batch.drop_column('mobile_phone_suffix')
+        batch.drop_column('mobile_phone_e164')
@@ -0,0 +1,60 @@
+"""invoice search indexes
+
+Índices de la búsqueda de facturas (GET /invoices/search): orden y rangos
+por fecha de emisión (con y sin clínica), rangos por vencimiento y FULLTEXT
+sobre las notas. El número de factura ya tiene índice único, que sirve para
+la búsqueda por prefijo.
+
+El primer índice FULLTEXT de una tabla InnoDB añade la columna oculta
+FTS_DOC_ID y reconstruye la tabla: admite lecturas pero no escrituras
+mientras se crea (LOCK=SHARED). En otros motores se crea un índice normal.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:02:17.448391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_invoices_clinic_id_deleted_at_issue_date', ['clinic_id', 'deleted_at', 'issue_date']),
+    ('ix_invoices_clinic_id_deleted_at_due_date', ['clinic_id', 'deleted_at', 'due_date']),
+    ('ix_invoices_deleted_at_issue_date', ['deleted_at', 'issue_date']),
+]
+
+
+def _is_mysql() -> bool:
+    return op.get_context().dialect.name == 'mysql'
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        if _is_mysql():
+            op.execute(
+                f"ALTER TABLE invoices ADD INDEX {name} ({', '.join(columns)}), "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            )
+        else:
+            op.create_index(name, 'invoices', columns, unique=False)
+    if _is_mysql():
+        op.execute(
+            "ALTER TABLE invoices ADD FULLTEXT INDEX ft_invoices_notes (notes), "
+            "ALGORITHM=INPLACE, LOCK=SHARED"
+        )
+    else:
+        op.create_index('ft_invoices_notes', 'invoices', ['notes'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ft_invoices_notes', table_name='invoices')
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='invoices')
@@ -0,0 +1,42 @@
+"""audit read access index
+
+Índice para consultar los accesos de lectura registrados en la auditoría
+(GET /audit-logs/?action_type=READ&entity_id=<paciente>): los registros READ
+guardan en entity_id el paciente leído, con cualquier entity_type, así que el
+índice por (entity_type, entity_id) no sirve.
+
+En MySQL se crea en línea (ALGORITHM=INPLACE, LOCK=NONE): la tabla de
+auditoría sigue admitiendo escrituras mientras se construye.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:41:05.912734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME = 'ix_auditlogs_action_type_entity_id_created_at'
+COLUMNS = ['action_type', 'entity_id', 'created_at']
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == 'mysql':
+        op.execute(
+            f"ALTER TABLE auditlogs ADD INDEX {NAME} ({', '.join(COLUMNS)}), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.create_index(NAME, 'auditlogs', COLUMNS, unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(NAME, table_name='auditlogs')
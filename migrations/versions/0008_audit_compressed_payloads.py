@@ -0,0 +1,87 @@
+"""audit compressed payloads
+
+old_values, new_values y related_records de auditlogs pasan de JSON a binario
+(LONGBLOB en MySQL) para guardarlos comprimidos (app/core/compressed_json.py).
+Los valores existentes se conservan como texto JSON sin comprimir, que la
+columna sigue leyendo; los meses antiguos se comprimen al archivarse.
+
+Cambiar el tipo reconstruye la tabla: en MySQL se hace con ALGORITHM=COPY,
+LOCK=SHARED (admite lecturas, no escrituras; los registros nuevos esperan en
+la cola de audit_sink o en su archivo de desbordamiento). Conviene archivar
+antes los meses antiguos para que la tabla sea pequeña.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:12:40.275619
+
+"""
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['old_values', 'new_values', 'related_records']
+BATCH_SIZE = 1000
+
+
+def _is_mysql() -> bool:
+    return op.get_context().dialect.name == 'mysql'
+
+
+def upgrade() -> None:
+    if _is_mysql():
+        op.execute(
+            "ALTER TABLE auditlogs "
+            + ", ".join(f"MODIFY {column} LONGBLOB" for column in COLUMNS)
+            + ", ALGORITHM=COPY, LOCK=SHARED"
+        )
+    else:
+        with op.batch_alter_table('auditlogs') as batch:
+            for column in COLUMNS:
+                batch.alter_column(column, type_=sa.LargeBinary(), existing_type=sa.JSON())
+
+
+def _decompress_values() -> None:
+    # Antes de volver a JSON, los valores comprimidos (empiezan por 0x78) pasan a texto
+    table = sa.table('auditlogs', sa.column('id', sa.Integer), *(sa.column(column, sa.LargeBinary) for column in COLUMNS))
+    connection = op.get_bind()
+    last = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table).where(table.c.id > last).order_by(table.c.id).limit(BATCH_SIZE)
+        ).all()
+        for row in rows:
+            values = {
+                column: zlib.decompress(value)
+                for column, value in zip(COLUMNS, row[1:])
+                if isinstance(value, bytes) and value[:1] == b'x'
+            }
+            if values:
+                connection.execute(table.update().where(table.c.id == row.id).values(**values))
+        if len(rows) < BATCH_SIZE:
+            return
+        last = rows[-1].id
+
+
+def downgrade() -> None:
+    _decompress_values()
+    if _is_mysql():
+        # MySQL no convierte binario a JSON directamente: primero a texto utf8mb4
+        for column_type in ('LONGTEXT CHARACTER SET utf8mb4', 'JSON'):
+            op.execute(
+                "ALTER TABLE auditlogs "
+                + ", ".join(f"MODIFY {column} {column_type}" for column in COLUMNS)
+                + ", ALGORITHM=COPY, LOCK=SHARED"
+            )
+    else:
+        with op.batch_alter_table('auditlogs') as batch:
+            for column in COLUMNS:
+                batch.alter_column(column, type_=sa.JSON(), existing_type=sa.LargeBinary())